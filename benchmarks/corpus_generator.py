@@ -0,0 +1,186 @@
+
+"""
+Deterministic generator of synthetic repositories for benchmarking.
+
+Files are a mix of Python, Markdown, reStructuredText and .markdown documents built from a fixed English
+vocabulary, spread over nested directories. Each word is replaced by a typo (one deleted, inserted, replaced
+or transposed letter) with probability typo_density. The same seed always produces the same tree.
+"""
+
+import os
+import random
+import argparse
+
+VOCABULARY = [
+    "about", "account", "action", "address", "after", "again", "against", "already", "always", "another",
+    "answer", "application", "around", "available", "because", "before", "between", "buffer", "build", "cache",
+    "called", "change", "character", "check", "children", "client", "collection", "column", "command", "common",
+    "compare", "complete", "condition", "configuration", "connection", "contains", "content", "context",
+    "control", "convert", "correct", "create", "current", "database", "default", "define", "delete", "depend",
+    "describe", "different", "directory", "display", "document", "during", "each", "element", "empty", "enough",
+    "entry", "error", "every", "example", "exception", "execute", "expected", "field", "file", "filter", "first",
+    "follow", "format", "function", "generate", "given", "group", "handle", "header", "however", "ignore",
+    "implement", "important", "include", "index", "information", "initial", "input", "instance", "interface",
+    "interval", "issue", "items", "later", "length", "library", "limit", "line", "list", "local", "message",
+    "method", "missing", "module", "network", "never", "number", "object", "option", "order", "other", "output",
+    "package", "parameter", "parse", "particular", "position", "possible", "previous", "print", "process",
+    "project", "property", "provide", "query", "queue", "random", "reason", "receive", "record", "reference",
+    "release", "remove", "replace", "request", "require", "resource", "response", "result", "return", "running",
+    "sample", "search", "second", "section", "separate", "server", "service", "should", "similar", "single",
+    "source", "special", "specific", "start", "state", "status", "string", "structure", "support", "system",
+    "table", "target", "temporary", "their", "there", "through", "together", "token", "transaction", "update",
+    "usually", "value", "variable", "version", "which", "while", "window", "without", "would", "write"
+]
+
+EXTENSIONS = [".py", ".py", ".md", ".rst", ".markdown"]  # Python is the most common file type in most trees
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_typo(word, rng):
+
+    """
+    Returns word with one letter deleted, inserted, replaced, or swapped with its neighbour.
+
+    :param word: str
+    :param rng: random.Random
+    :return: str
+    """
+
+    index = rng.randrange(len(word) - 1)
+    edit = rng.randrange(4)
+
+    if edit == 0 or (edit == 3 and word[index] == word[index + 1]):  # swapping equal letters changes nothing
+        return word[:index] + word[index + 1:]
+    elif edit == 1:
+        return word[:index] + rng.choice(LETTERS) + word[index:]
+    elif edit == 2:
+        return word[:index] + rng.choice(LETTERS.replace(word[index], "")) + word[index + 1:]
+    return word[:index] + word[index + 1] + word[index] + word[index + 2:]
+
+
+class CorpusGenerator:
+
+    def __init__(self, seed=0, typo_density=0.01, words_per_line=10):
+
+        """
+        Takes the random seed, the chance that any word is misspelled, and the words of each line of prose.
+
+        :param seed: int
+        :param typo_density: float
+        :param words_per_line: int
+        """
+
+        self.rng = random.Random(seed)
+        self.typo_density = typo_density
+        self.words_per_line = words_per_line
+        self.typo_count = 0
+
+    def word(self):
+        word = self.rng.choice(VOCABULARY)
+        if self.rng.random() < self.typo_density:
+            self.typo_count += 1
+            return make_typo(word, self.rng)
+        return word
+
+    def sentence(self):
+        words = [self.word() for _ in range(self.rng.randint(self.words_per_line // 2, self.words_per_line))]
+        return " ".join(words).capitalize() + "."
+
+    def identifier(self):
+        return "_".join(self.rng.choice(VOCABULARY) for _ in range(self.rng.randint(1, 3)))
+
+    def python_source(self, line_count):
+        lines = ['"""', self.sentence(), '"""', ""]
+
+        while len(lines) < line_count:
+            name = self.identifier()
+            lines.extend(["", "def " + name + "(" + self.identifier() + "):",
+                          "    # " + self.sentence(),
+                          "    " + self.identifier() + " = \"" + self.sentence() + "\"",
+                          "    return " + self.identifier()])
+
+        return "\n".join(lines) + "\n"
+
+    def markdown_source(self, line_count):
+        lines = ["# " + self.sentence(), ""]
+
+        while len(lines) < line_count:
+            lines.extend([self.sentence() + " `" + self.identifier() + "` " + self.sentence(), "",
+                          "```", self.identifier() + "()", "```", ""])
+
+        return "\n".join(lines) + "\n"
+
+    def rst_source(self, line_count):
+        title = self.sentence()
+        lines = [title, "=" * len(title), ""]
+
+        while len(lines) < line_count:
+            lines.extend([self.sentence() + " ``" + self.identifier() + "`` " + self.sentence(), "",
+                          ".. code-block:: python", "", "    " + self.identifier() + "()", ""])
+
+        return "\n".join(lines) + "\n"
+
+    def source(self, extension, line_count):
+        if extension == ".py":
+            return self.python_source(line_count)
+        elif extension == ".rst":
+            return self.rst_source(line_count)
+        return self.markdown_source(line_count)
+
+    def generate(self, root, file_count, lines_per_file=60, files_per_directory=20):
+
+        """
+        Writes file_count files below root, files_per_directory to a directory, nesting directories
+        two levels deep. Returns the paths written.
+
+        :param root: str
+        :param file_count: int
+        :param lines_per_file: int
+        :param files_per_directory: int
+        :return: [str]
+        """
+
+        paths = []
+
+        for file_index in range(file_count):
+            directory_index = file_index // files_per_directory
+            directory = os.path.join(root, "package" + str(directory_index // 10), "module" + str(directory_index))
+
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            extension = self.rng.choice(EXTENSIONS)
+            path = os.path.join(directory, self.identifier() + str(file_index) + extension)
+
+            with open(path, "w") as source_file:
+                source_file.write(self.source(extension, self.rng.randint(lines_per_file // 2, lines_per_file)))
+
+            paths.append(path)
+
+        return paths
+
+
+def main():
+
+    """
+    Generates a corpus from the command line.
+    """
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic repository for benchmarking.")
+    parser.add_argument("output", help="directory to write the files to")
+    parser.add_argument("--files", type=int, default=1000, help="number of files")
+    parser.add_argument("--lines", type=int, default=60, help="most lines per file")
+    parser.add_argument("--typo-density", type=float, default=0.01, help="chance that any word is misspelled")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    generator = CorpusGenerator(arguments.seed, arguments.typo_density)
+    paths = generator.generate(arguments.output, arguments.files, arguments.lines)
+
+    print("Wrote " + str(len(paths)) + " files with " + str(generator.typo_count) + " typos to "
+          + repr(arguments.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+
+"""
+Benchmarks of the scanning pipeline.
+
+Microbenchmarks time the tokenizer, dictionary checks (with a cold and a warm verdict cache), compound word
+splitting and the consolidation of SpellingErrors. End-to-end benchmarks scan a generated corpus with each
+engine, each in a fresh process so that files/sec and peak resident memory aren't skewed by earlier runs.
+Results are written as JSON, to be compared across versions, e.g.
+
+    python -m benchmarks.run_benchmarks --files 2000 --output before.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import argparse
+import subprocess
+import multiprocessing
+
+from contextlib import redirect_stdout
+
+import config.config as config
+
+from benchmarks.corpus_generator import CorpusGenerator
+
+try:
+    import resource
+except ImportError:
+    resource = None  # e.g., Windows
+
+
+def best_time(function, repeat):
+
+    """
+    Returns the shortest of repeat timed calls of function, in seconds.
+
+    :param function: function
+    :param repeat: int
+    :return: float
+    """
+
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return max(min(times), 1e-9)
+
+
+def peak_rss_bytes(who="self"):
+
+    """
+    Returns the peak resident memory of this process ("self") or of its finished children ("children").
+
+    :param who: str
+    :return: int or None
+    """
+
+    if resource is None:
+        return None
+
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    return usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)  # bytes on macOS, kilobytes elsewhere
+
+
+def read_lines(paths):
+    lines = []
+    for path in paths:
+        with io.open(path, "r", encoding="utf-8") as source_file:
+            lines.extend(source_file)
+    return lines
+
+
+def benchmark_tokenizer(lines, repeat):
+    import common.utils as utils
+
+    word_count = sum(1 for line in lines for _ in utils.tokenize_line(line))
+    seconds = best_time(lambda: [word for line in lines for word in utils.tokenize_line(line)], repeat)
+
+    return {"lines": len(lines), "seconds": seconds, "lines_per_second": len(lines) / seconds,
+            "words_per_second": word_count / seconds}
+
+
+def benchmark_dictionary_check(words, repeat):
+    import common.utils as utils
+
+    def check_all():
+        for word in words:
+            utils.is_spelling_error(word)
+
+    def check_all_uncached():
+        utils.verdict_cache.clear()
+        check_all()
+
+    cold_seconds = best_time(check_all_uncached, repeat)
+    warm_seconds = best_time(check_all, repeat)
+
+    return {"words": len(words), "cold_words_per_second": len(words) / cold_seconds,
+            "warm_words_per_second": len(words) / warm_seconds}
+
+
+def benchmark_compound_split(words, repeat):
+    import common.utils as utils
+
+    compounds = [words[i].lower() + words[i + 1].lower() for i in range(0, len(words) - 1, 2)]
+    seconds = best_time(lambda: [utils.is_n_part_word(word) for word in compounds], repeat)
+
+    return {"words": len(compounds), "words_per_second": len(compounds) / seconds}
+
+
+def benchmark_consolidation(words, occurrence_count, repeat):
+    from common.error_aggregation import ErrorAggregator
+    from spelling.spelling_error import SpellingError
+
+    errors = [SpellingError("dir" + str(i % 50) + "/file" + str(i % 1000) + ".py", words[i % len(words)], None,
+                            i % 500 + 1, 0) for i in range(occurrence_count)]
+
+    def consolidate():
+        aggregator = ErrorAggregator()
+        aggregator.add_all(errors)
+        aggregator.groups()
+
+    seconds = best_time(consolidate, repeat)
+
+    return {"occurrences": occurrence_count, "occurrences_per_second": occurrence_count / seconds}
+
+
+def benchmark_scan(root, engine):
+
+    """
+    Scans every file below root with the engine, returning throughput and peak memory.
+
+    :param root: str
+    :param engine: str
+    :return: dict
+    """
+
+    import spellchecker
+    from common.scan_metrics import ScanMetrics
+
+    metrics = ScanMetrics()
+
+    with redirect_stdout(io.StringIO()):
+        groups = spellchecker.discover_spelling_errors(spellchecker.iter_files_in_paths([root]), engine, metrics)
+
+    elapsed_time = metrics.elapsed_time()
+
+    return {"engine": engine, "files": metrics.file_count, "seconds": elapsed_time,
+            "files_per_second": metrics.file_count / elapsed_time,
+            "words_per_second": metrics.counts["words"] / elapsed_time,
+            "suspicious_words": metrics.spelling_error_count, "groups": len(groups),
+            "peak_rss_bytes": peak_rss_bytes("self"), "peak_worker_rss_bytes": peak_rss_bytes("children")}
+
+
+def benchmark_scan_in_subprocess(root, engine, arguments):
+    command = [sys.executable, "-m", "benchmarks.run_benchmarks", "--scan", root, "--engines", engine]
+    for option in ["snapshot", "word_list"]:
+        if getattr(arguments, option):
+            command += ["--" + option.replace("_", "-"), getattr(arguments, option)]
+
+    output = subprocess.check_output(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(output.decode("utf-8"))
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(arguments):
+
+    """
+    Generates the corpus (unless one is given), runs every benchmark and returns the results.
+
+    :param arguments: argparse.Namespace
+    :return: dict
+    """
+
+    root = arguments.corpus or tempfile.mkdtemp(prefix="spellchecker-benchmark-")
+
+    try:
+        if arguments.corpus:
+            paths = [os.path.join(directory, name) for directory, _, names in os.walk(root) for name in names]
+        else:
+            paths = CorpusGenerator(arguments.seed, arguments.typo_density).generate(root, arguments.files,
+                                                                                     arguments.lines)
+
+        import common.utils as utils
+
+        lines = read_lines(paths)
+        words = [word for line in lines[:20000] for word, _ in utils.tokenize_line(line)]
+
+        results = {
+            "tokenizer": benchmark_tokenizer(lines, arguments.repeat),
+            "dictionary_check": benchmark_dictionary_check(words, arguments.repeat),
+            "compound_split": benchmark_compound_split(words[:5000], arguments.repeat),
+            "consolidation": benchmark_consolidation(words, arguments.occurrences, arguments.repeat),
+            "scan": [benchmark_scan_in_subprocess(root, engine, arguments) for engine in arguments.engines.split(",")]
+        }
+    finally:
+        if not arguments.corpus:
+            shutil.rmtree(root)
+
+    return {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "parameters": dict((name, value) for name, value in vars(arguments).items() if name not in ("output", "scan")),
+        "results": results
+    }
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(description="Benchmark the scanning pipeline and write the results as JSON.")
+    parser.add_argument("--corpus", help="directory to scan instead of a generated corpus")
+    parser.add_argument("--files", type=int, default=500, help="number of files to generate")
+    parser.add_argument("--lines", type=int, default=60, help="most lines per generated file")
+    parser.add_argument("--typo-density", type=float, default=0.01, help="chance that a generated word is misspelled")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of each microbenchmark; the best is kept")
+    parser.add_argument("--occurrences", type=int, default=200000, help="SpellingErrors to consolidate")
+    parser.add_argument("--engines", default="thread,process", help="comma-separated engines to scan with")
+    parser.add_argument("--snapshot", help="word list snapshot to check against (see common/wordlist_snapshot.py)")
+    parser.add_argument("--word-list", help="word list used to split compound words")
+    parser.add_argument("--output", help="file to write the JSON results to; defaults to stdout")
+    parser.add_argument("--scan", help=argparse.SUPPRESS)  # internal: scan this directory only, in this process
+    return parser.parse_args(arguments)
+
+
+def main():
+
+    """
+    Runs the benchmarks from the command line.
+    """
+
+    arguments = parse_arguments(sys.argv[1:])
+
+    # before common.utils is first imported, since it loads the dictionary
+    if arguments.snapshot:
+        config.WORDLIST_SNAPSHOT_FILE = arguments.snapshot
+    if arguments.word_list:
+        config.WORD_LIST_FILE = arguments.word_list
+
+    if arguments.scan:
+        results = benchmark_scan(arguments.scan, arguments.engines)
+    else:
+        results = run_benchmarks(arguments)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
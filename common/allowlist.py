@@ -0,0 +1,163 @@
+
+"""
+Per-project allowlist of intentionally spelled words, learned during review and shared through version control.
+
+The file (config.ALLOWLIST_FILE) holds one rule per line:
+
+    kubectl            a word, allowed anywhere (case-insensitively)
+    re:[a-z]+_?id      a regular expression; words it fully matches (case-insensitively) are allowed
+    path:vendor/       a .gitignore-style pattern, relative to the file's directory; matching files are not checked
+    # ...              a comment
+
+Words are loaded into a set and every regular expression is combined into one alternation, so that
+allowing a word costs one hash lookup and at most one regex match.
+"""
+
+import io
+import os
+import re
+
+from common.file_discovery import GitIgnoreRule, is_ignored
+
+PATTERN_PREFIX = "re:"
+PATH_PREFIX = "path:"
+
+
+class Allowlist:
+
+    def __init__(self, path=None):
+
+        """
+        Takes the path of the allowlist file, which is loaded if it exists.
+
+        :param path: str or None
+        """
+
+        self.path = path
+        self.base = os.path.dirname(os.path.abspath(path)) if path else os.getcwd()  # of path rules
+        self.words = set()
+        self.patterns = []
+        self.file_rules = []
+        self.__regex = None
+        self.__rules = []
+
+        if path and os.path.isfile(path):
+            with io.open(path, "r", encoding="utf-8") as allowlist_file:
+                for line in allowlist_file:
+                    self.add_rule(line)
+
+    def add_rule(self, rule):
+
+        """
+        Adds one rule, in the syntax of the allowlist file. Invalid regular expressions are skipped.
+
+        :param rule: str
+        """
+
+        rule = rule.strip()
+
+        if not rule or rule.startswith("#"):
+            return
+
+        if rule.startswith(PATTERN_PREFIX):
+            pattern = rule[len(PATTERN_PREFIX):]
+            try:
+                re.compile(pattern)
+            except re.error as error:
+                print("Skipping allowlist pattern " + repr(pattern) + ": " + str(error))
+                return
+            self.patterns.append(pattern)
+            self.__regex = None  # recompiled on next use
+        elif rule.startswith(PATH_PREFIX):
+            self.file_rules.append(GitIgnoreRule(self.base, rule[len(PATH_PREFIX):]))
+        else:
+            self.words.add(rule.lower())
+
+        self.__rules.append(rule)
+
+    @property
+    def regex(self):
+        if self.__regex is None and self.patterns:
+            self.__regex = re.compile("|".join("(?:" + pattern + ")" for pattern in self.patterns), re.IGNORECASE)
+        return self.__regex
+
+    @property
+    def tag(self):
+
+        """
+        Identifies the rules, so that results stored under other rules can be discarded.
+
+        :return: str
+        """
+
+        import hashlib
+        return hashlib.sha1("\n".join(sorted(self.__rules)).encode("utf-8")).hexdigest()[:12]
+
+    def allows(self, word):
+
+        """
+        Returns true if word is listed, or matches a pattern.
+
+        :param word: str
+        :return: bool
+        """
+
+        if word.lower() in self.words:
+            return True
+
+        regex = self.regex
+        return regex is not None and regex.fullmatch(word) is not None
+
+    def ignores_file(self, path):
+
+        """
+        Returns true if the path, or a directory containing it below the allowlist's directory,
+        matches a path rule.
+
+        :param path: str
+        :return: bool
+        """
+
+        if not self.file_rules:
+            return False
+
+        path = os.path.abspath(path)
+        if is_ignored(path, os.path.basename(path), False, self.file_rules):
+            return True
+
+        directory = os.path.dirname(path)
+        while directory.startswith(self.base + os.sep):
+            if is_ignored(directory, os.path.basename(directory), True, self.file_rules):
+                return True
+            directory = os.path.dirname(directory)
+
+        return False
+
+    def learn(self, words):
+
+        """
+        Allows words which aren't allowed yet, appending them to the allowlist file. Returns the words added.
+
+        :param words: iterable of str
+        :return: [str]
+        """
+
+        new_words = []
+        for word in words:
+            if not self.allows(word) and word.lower() not in new_words:
+                new_words.append(word.lower())
+
+        for word in new_words:
+            self.add_rule(word)
+
+        if new_words and self.path:
+            with io.open(self.path, "a+b") as allowlist_file:
+                separator = b""
+                if allowlist_file.tell() > 0:
+                    allowlist_file.seek(-1, os.SEEK_END)
+                    if allowlist_file.read(1) != b"\n":
+                        separator = b"\n"  # the last rule wasn't terminated, e.g. by an editor
+
+                allowlist_file.write(separator + u"".join(word + u"\n" for word in new_words).encode("utf-8"))
+
+        return new_words
@@ -0,0 +1,101 @@
+
+"""
+Bloom filter over the active vocabulary, used as a prefilter in front of dictionary lookups.
+
+A word the filter rejects is definitely not in the vocabulary, so the dictionary doesn't need to be asked.
+A word it accepts is in the vocabulary with probability 1 - false positive rate. The bits live in an
+anonymous shared memory map, so worker processes forked after the filter is built share them. Lookups
+are counted per thread, so that workers don't contend for a lock on every word.
+"""
+
+import math
+import mmap
+import struct
+import hashlib
+from threading import local
+
+_HASH = struct.Struct("<QQ")
+
+
+class BloomFilter:
+
+    def __init__(self, expected_count, false_positive_rate, max_bytes):
+
+        """
+        Sizes the filter for expected_count words at false_positive_rate, without exceeding max_bytes
+        (in which case the false positive rate is higher than requested).
+
+        :param expected_count: int
+        :param false_positive_rate: float
+        :param max_bytes: int
+        """
+
+        expected_count = max(expected_count, 1)
+        bit_count = int(math.ceil(-expected_count * math.log(false_positive_rate) / math.log(2) ** 2))
+
+        self.__size = max(min((bit_count + 7) // 8, max_bytes), 1)
+        self.__bit_count = self.__size * 8
+        self.__hash_count = max(int(round(float(self.__bit_count) / expected_count * math.log(2))), 1)
+        self.__bits = mmap.mmap(-1, self.__size)
+
+        self.__counts = local()  # per thread, lookups answered "definitely absent" and "probably present"
+
+    @property
+    def size(self):
+        return self.__size
+
+    @property
+    def hash_count(self):
+        return self.__hash_count
+
+    def positions(self, word):
+
+        """
+        Returns the bit positions of word, derived from one 128-bit hash by double hashing.
+
+        :param word: str
+        :return: generator of int
+        """
+
+        first, second = _HASH.unpack(hashlib.md5(word.lower().encode("utf-8")).digest())
+        return ((first + i * second) % self.__bit_count for i in range(self.__hash_count))
+
+    def add(self, word):
+        for position in self.positions(word):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, word):
+
+        """
+        Returns false if word is definitely not in the filter.
+
+        :param word: str
+        :return: bool
+        """
+
+        counts = self.__counts
+
+        for position in self.positions(word):
+            if not self.__bits[position >> 3] & (1 << (position & 7)):
+                counts.negatives = getattr(counts, "negatives", 0) + 1
+                return False
+
+        counts.positives = getattr(counts, "positives", 0) + 1
+        return True
+
+    def take_counts(self):
+
+        """
+        Returns the lookups made by the current thread since the last call, as the number answered
+        "definitely absent" and the number answered "probably present".
+
+        :return: (int, int)
+        """
+
+        counts = self.__counts
+        negatives, positives = getattr(counts, "negatives", 0), getattr(counts, "positives", 0)
+        counts.negatives = counts.positives = 0
+        return negatives, positives
+
+    def __contains__(self, word):
+        return self.might_contain(word)
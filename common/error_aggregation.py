@@ -0,0 +1,188 @@
+
+"""
+Streaming aggregation of SpellingErrors into ranked SpellingErrorGroups.
+
+Occurrences are grouped in a single pass: the WordStatistics of each (case-insensitive) word are updated in
+place, counting its occurrences per file, and its SpellingErrors are appended to one list. Once a word can no
+longer pass the configured limits (e.g., it has been seen config.MAX_WORD_FREQUENCY times), its occurrences
+and per-file counts are released, so memory depends on the number of distinct suspicious words rather than on
+occurrences or on the number of files they are spread over.
+
+Filters are functions of WordStatistics returning true for words worth reviewing. The surviving groups are
+ordered by a scoring function, by default typo_score, so that the likeliest typos are reviewed first.
+"""
+
+import os.path
+
+import config.config as config
+
+from collections import Counter
+from spelling.spelling_error_group import SpellingErrorGroup
+
+
+class WordStatistics:
+
+    __slots__ = ("word", "count", "file_counts", "errors", "released_file_spread", "released_directory_counts")
+
+    def __init__(self, word):
+
+        """
+        Takes the (lowercase) word whose occurrences are counted.
+
+        :param word: str
+        """
+
+        self.word = word
+        self.count = 0
+        self.file_counts = Counter()  # file path -> occurrences, None once released
+        self.errors = []  # None once released
+        self.released_file_spread = 0
+        self.released_directory_counts = None  # kept after release only if a directory filter is set
+
+    def add(self, error):
+        self.count += 1
+        if self.file_counts is not None:
+            self.file_counts[error.file] += 1
+        elif self.released_directory_counts is not None:
+            self.released_directory_counts[os.path.dirname(error.file)] += 1
+        if self.errors is not None:
+            self.errors.append(error)
+
+    def release(self):
+
+        """
+        Drops the occurrences and per-file counts of a word that can no longer pass the filters, keeping
+        only what they still read: the file spread at release, and the directory counts if
+        config.MAX_DIRECTORY_FREQUENCY is set.
+        """
+
+        if config.MAX_DIRECTORY_FREQUENCY is not None:
+            self.released_directory_counts = self.directory_counts()
+        self.released_file_spread = len(self.file_counts)
+        self.file_counts = None
+        self.errors = None
+
+    @property
+    def file_spread(self):
+        return self.released_file_spread if self.file_counts is None else len(self.file_counts)
+
+    def directory_counts(self):
+
+        """
+        Returns the occurrences of the word per directory.
+
+        :return: Counter
+        """
+
+        if self.file_counts is None:
+            return Counter(self.released_directory_counts or ())
+        directory_counts = Counter()
+        for file_path, count in self.file_counts.items():
+            directory_counts[os.path.dirname(file_path)] += count
+        return directory_counts
+
+
+def frequency_filter(statistics):
+    return (statistics.count >= config.MIN_WORD_FREQUENCY and
+            (config.MAX_WORD_FREQUENCY is None or statistics.count < config.MAX_WORD_FREQUENCY))
+
+
+def file_spread_filter(statistics):
+    return config.MAX_FILE_SPREAD is None or statistics.file_spread < config.MAX_FILE_SPREAD
+
+
+def directory_frequency_filter(statistics):
+    return (config.MAX_DIRECTORY_FREQUENCY is None or
+            max(statistics.directory_counts().values()) < config.MAX_DIRECTORY_FREQUENCY)
+
+
+DEFAULT_FILTERS = [frequency_filter, file_spread_filter, directory_frequency_filter]
+
+
+def exceeds_limits(statistics):
+
+    """
+    Returns true once a word can no longer pass the default filters, however often it is seen again.
+
+    :param statistics: WordStatistics
+    :return: bool
+    """
+
+    return (config.MAX_WORD_FREQUENCY is not None and statistics.count >= config.MAX_WORD_FREQUENCY) or \
+        not file_spread_filter(statistics)
+
+
+def typo_score(statistics):
+
+    """
+    Scores how likely a word is to be a typo rather than jargon: one-off slips are seen rarely and in
+    few files, while very short words are more often abbreviations.
+
+    :param statistics: WordStatistics
+    :return: float
+    """
+
+    return min(len(statistics.word), 8) / (8.0 * statistics.count * statistics.file_spread)
+
+
+class ErrorAggregator:
+
+    def __init__(self, filters=None, score=None):
+
+        """
+        Takes the filters that words must pass to be reviewed, and the function by which the remaining
+        groups are ranked (highest first). Defaults to DEFAULT_FILTERS and, if config.RANK_BY_TYPO_SCORE
+        is set, typo_score; otherwise groups keep the order in which their words were first seen.
+
+        :param filters: [function] or None
+        :param score: function or None
+        """
+
+        self.filters = DEFAULT_FILTERS if filters is None else filters
+        self.score = score or (typo_score if config.RANK_BY_TYPO_SCORE else None)
+        self.release = exceeds_limits if filters is None else None  # custom filters may not be monotonic
+        self.error_count = 0
+        self.__statistics = {}
+
+    def add(self, error):
+
+        """
+        Counts one SpellingError.
+
+        :param error: SpellingError
+        """
+
+        self.error_count += 1
+        key = error.word.lower()  # make key case-insensitive
+
+        statistics = self.__statistics.get(key)
+        if statistics is None:
+            statistics = self.__statistics[key] = WordStatistics(key)
+
+        statistics.add(error)
+
+        if statistics.errors is not None and self.release and self.release(statistics):
+            statistics.release()  # will be filtered out, no need to keep occurrences
+
+    def add_all(self, spelling_errors):
+        for error in spelling_errors:
+            self.add(error)
+
+    def statistics(self):
+        return self.__statistics.values()
+
+    def groups(self):
+
+        """
+        Returns a SpellingErrorGroup for each word passing every filter, ranked by score.
+
+        :return: [SpellingErrorGroup]
+        """
+
+        remaining = [statistics for statistics in self.__statistics.values()
+                     if statistics.errors is not None and all(word_filter(statistics) for word_filter in self.filters)]
+
+        if self.score:
+            remaining.sort(key=self.score, reverse=True)
+
+        return [SpellingErrorGroup(statistics.word, statistics.errors) for statistics in remaining]
@@ -0,0 +1,162 @@
+
+"""
+Single-pass discovery of the files to search.
+
+The tree is walked once with os.scandir (rather than once per extension), directories such as .git and
+node_modules are pruned before they are entered, and paths are yielded as soon as they are found.
+"""
+
+import os
+import fnmatch
+
+import config.config as config
+
+from langs.registry import registered_extensions
+
+
+class GitIgnoreRule:
+
+    def __init__(self, base, pattern):
+
+        """
+        Takes the directory containing the .gitignore file and one pattern from it.
+
+        :param base: str
+        :param pattern: str
+        """
+
+        self.base = base
+        self.negated = pattern.startswith("!")
+        pattern = pattern[1:] if self.negated else pattern
+
+        self.directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        # patterns containing a slash are matched against the path relative to base, others against the name
+        self.anchored = "/" in pattern
+        self.pattern = pattern.lstrip("/")
+
+    def matches(self, path, name, is_directory):
+
+        """
+        Returns true if the rule applies to the path.
+
+        :param path: str
+        :param name: str
+        :param is_directory: bool
+        :return: bool
+        """
+
+        if self.directory_only and not is_directory:
+            return False
+
+        if self.anchored:
+            relative_path = os.path.relpath(path, self.base).replace(os.sep, "/")
+            return fnmatch.fnmatchcase(relative_path, self.pattern)
+
+        return fnmatch.fnmatchcase(name, self.pattern)
+
+
+def read_gitignore(directory):
+
+    """
+    Returns the rules in directory's .gitignore file, if there is one.
+
+    :param directory: str
+    :return: [GitIgnoreRule]
+    """
+
+    rules = []
+    gitignore_path = os.path.join(directory, ".gitignore")
+
+    if os.path.isfile(gitignore_path):
+        with open(gitignore_path, "r") as gitignore:
+            for line in gitignore:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    rules.append(GitIgnoreRule(directory, line))
+
+    return rules
+
+
+def is_ignored(path, name, is_directory, rules):
+
+    """
+    Applies gitignore rules in order; the last matching rule wins.
+
+    :param path: str
+    :param name: str
+    :param is_directory: bool
+    :param rules: [GitIgnoreRule]
+    :return: bool
+    """
+
+    ignored = False
+    for rule in rules:
+        if rule.matches(path, name, is_directory):
+            ignored = not rule.negated
+    return ignored
+
+
+def iter_files_in_path(path, extensions=None, respect_gitignore=None):
+
+    """
+    Lazily yields every file below path whose extension is registered in langs.registry.
+
+    :param path: str
+    :param extensions: set of str, defaults to every registered extension
+    :param respect_gitignore: bool, defaults to config.RESPECT_GITIGNORE
+    :return: generator of str
+    """
+
+    extensions = set(extensions or registered_extensions())
+    respect_gitignore = config.RESPECT_GITIGNORE if respect_gitignore is None else respect_gitignore
+
+    stack = [(path, [])]
+
+    while stack:
+        directory, rules = stack.pop()
+
+        if respect_gitignore:
+            rules = rules + read_gitignore(directory)
+
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError:
+            continue  # unreadable directory
+
+        subdirectories = []
+
+        for entry in entries:
+            try:
+                is_directory = entry.is_dir(follow_symlinks=False)
+
+                if is_directory:
+                    if entry.name in config.PRUNED_DIRECTORIES or is_virtualenv(entry.path):
+                        continue
+                elif not entry.is_file() or os.path.splitext(entry.name)[1] not in extensions:
+                    continue
+            except OSError:
+                continue
+
+            if rules and is_ignored(entry.path, entry.name, is_directory, rules):
+                continue
+
+            if is_directory:
+                subdirectories.append((entry.path, rules))
+            else:
+                yield entry.path
+
+        stack.extend(reversed(subdirectories))  # visit subdirectories in name order
+
+
+def is_virtualenv(directory):
+
+    """
+    Returns true if directory looks like a Python virtual environment.
+
+    :param directory: str
+    :return: bool
+    """
+
+    return os.path.isfile(os.path.join(directory, "pyvenv.cfg"))
@@ -0,0 +1,135 @@
+
+"""
+Queue of accepted corrections which are written back to disk in one pass per file.
+
+Each file is read once, every queued correction for it is applied (right to left within a line, so
+earlier columns stay valid), and the result is written to a temporary file which then replaces the
+original, so an interrupted write never leaves a half-written file behind.
+"""
+
+import io
+import os
+import re
+
+import config.config as config
+
+from common.text_reader import forget_lines
+
+
+class FixQueue:
+
+    def __init__(self):
+        self.__corrections = {}
+        self.failures = []  # (file path, error) for each file the last apply couldn't rewrite
+
+    def __len__(self):
+        return sum(len(corrections) for corrections in self.__corrections.values())
+
+    def add(self, error, correct_word):
+
+        """
+        Queues the replacement of the SpellingError's word with correct_word.
+
+        :param error: SpellingError
+        :param correct_word: str
+        """
+
+        self.__corrections.setdefault(error.file, []).append((int(error.line_number), error.column,
+                                                               error.word, correct_word))
+
+    def apply(self):
+
+        """
+        Applies every queued correction and empties the queue. Returns the number of corrections made.
+        Files that can't be rewritten (e.g., moved or read-only) are listed in failures, and their
+        corrections are dropped, so that no correction is ever applied twice.
+
+        :return: int
+        """
+
+        applied_count = 0
+        self.failures = []
+
+        while self.__corrections:
+            file_path, corrections = self.__corrections.popitem()
+            try:
+                applied_count += apply_corrections(file_path, corrections)
+            except (OSError, IOError) as error:
+                self.failures.append((file_path, error))
+
+        return applied_count
+
+
+def apply_corrections(file_path, corrections):
+
+    """
+    Applies corrections, given as (line_number, column, word, correct_word) tuples, to one file.
+    If a column is unknown, the first case-insensitive occurrence of the word in the line is replaced
+    instead. Corrections whose word is no longer found at their column are skipped, rather than
+    replacing another occurrence the user may have meant to keep.
+
+    :param file_path: str
+    :param corrections: [(int, int, str, str)]
+    :return: int
+    """
+
+    with io.open(file_path, "r", encoding=config.TEXT_ENCODING, errors="surrogateescape", newline="") as readable_file:
+        lines = re.split(r"(?<=\n)", readable_file.read())  # numbered by "\n" only, as the scanner does
+
+    applied_count = 0
+
+    # right to left, so that replacements of different lengths don't move the columns still to be used
+    for line_number, column, word, correct_word in sorted(corrections, key=correction_position, reverse=True):
+        line_index = line_number - 1
+        if not 0 <= line_index < len(lines):
+            continue
+
+        line = lines[line_index]
+        if column is None:
+            column = line.lower().find(word.lower())
+            if column < 0:
+                continue
+        elif line[column:column + len(word)].lower() != word.lower():
+            continue  # the line changed since it was checked
+
+        lines[line_index] = line[:column] + correct_word + line[column + len(word):]
+        applied_count += 1
+
+    if applied_count:
+        write_atomically(file_path, "".join(lines))
+
+    return applied_count
+
+
+def correction_position(correction):
+    line_number, column = correction[0], correction[1]
+    return line_number, -1 if column is None else column
+
+
+def write_atomically(file_path, content):
+
+    """
+    Writes content to a temporary file next to file_path and renames it over file_path.
+
+    :param file_path: str
+    :param content: str
+    """
+
+    import shutil
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".spellchecker-")
+
+    try:
+        with io.open(descriptor, "w", encoding=config.TEXT_ENCODING, errors="surrogateescape",
+                     newline="") as writable_file:
+            writable_file.write(content)
+
+        shutil.copymode(file_path, temporary_path)
+        os.replace(temporary_path, file_path)
+    except Exception:
+        os.remove(temporary_path)
+        raise
+
+    forget_lines(file_path)  # lines of other SpellingErrors are read lazily
@@ -0,0 +1,106 @@
+
+"""
+Changed files and lines according to git, for checking only the lines that a change adds or modifies.
+
+The output of `git diff --unified=0` is parsed into the set of changed line numbers (in the new version)
+of each file. Files still have to be read in full, since extractors need context (e.g., whether a line is
+inside a docstring), but only changed lines are tokenized and checked, and their line numbers are kept.
+"""
+
+import os
+import re
+import subprocess
+
+HUNK_REGEX = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def run_git(arguments, cwd=None):
+
+    """
+    Runs git with arguments, returning its output. Raises OSError if git is missing and
+    subprocess.CalledProcessError if it fails (e.g., outside a repository or for an unknown revision).
+
+    :param arguments: [str]
+    :param cwd: str or None
+    :return: str
+    """
+
+    output = subprocess.check_output(["git", "-c", "core.quotePath=false"] + arguments, cwd=cwd)
+    return output.decode("utf-8", "surrogateescape")
+
+
+def parse_diff(diff_text, root=""):
+
+    """
+    Returns the changed line numbers of each file in the output of `git diff --unified=0`. Paths
+    are joined to root (the top-level directory of the repository). Deleted files are omitted,
+    and files whose changes only remove lines have no changed lines.
+
+    :param diff_text: str
+    :param root: str
+    :return: {str: set of int}
+    """
+
+    changed_lines = {}
+    current_lines = None
+    in_header = False
+
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            in_header = True
+            current_lines = None
+        elif in_header and line.startswith("+++ "):
+            path = line[4:]
+            if path != "/dev/null":
+                if path.startswith('"') and path.endswith('"'):
+                    path = path[1:-1]
+                if path.startswith("b/"):
+                    path = path[2:]
+                current_lines = changed_lines.setdefault(os.path.join(root, path), set())
+        elif line.startswith("@@"):
+            in_header = False
+            match = HUNK_REGEX.match(line)
+
+            if match and current_lines is not None:
+                start = int(match.group(1))
+                count = 1 if match.group(2) is None else int(match.group(2))
+                current_lines.update(range(start, start + count))
+
+    return changed_lines
+
+
+def changed_lines_since(base, pathspecs=None, cwd=None):
+
+    """
+    Returns the lines changed in the working tree since the base revision (e.g., "origin/main"), as
+    parse_diff does. Paths are relative to the current directory, like those given on the command line.
+
+    :param base: str
+    :param pathspecs: [str] or None, to limit the diff to
+    :param cwd: str or None, a directory within the repository
+    :return: {str: set of int}
+    """
+
+    root = run_git(["rev-parse", "--show-toplevel"], cwd).strip()
+
+    # the prefixes parse_diff expects, whatever diff.mnemonicPrefix or diff.noprefix say
+    diff_text = run_git(["diff", "--unified=0", "--no-color", "--no-ext-diff", "--diff-filter=d",
+                         "--src-prefix=a/", "--dst-prefix=b/", base, "--"] + list(pathspecs or []), cwd)
+
+    return dict((os.path.relpath(path), lines) for path, lines in parse_diff(diff_text, root).items())
+
+
+def iter_changed_files(changed_lines, extensions=None):
+
+    """
+    Yields the files with changed lines, in order, which still exist and have one of the extensions.
+
+    :param changed_lines: {str: set of int}
+    :param extensions: set of str or None, for any extension
+    :return: generator of str
+    """
+
+    for path in sorted(changed_lines):
+        if changed_lines[path] and (not extensions or os.path.splitext(path)[1] in extensions) and \
+                os.path.isfile(path):
+            yield path
@@ -0,0 +1,123 @@
+
+"""
+Machine-readable output of SpellingErrorGroups, for running spellchecker in CI.
+"""
+
+import io
+import json
+import os.path
+import pathlib
+import urllib.parse
+
+from common.suggestion_index import match_case
+
+
+def iter_occurrences(spelling_error_group_list):
+
+    """
+    Yields one dict per SpellingError, in the order they are grouped. Suggested corrections
+    are included for words that have any.
+
+    :param spelling_error_group_list: [SpellingErrorGroup]
+    :return: generator of dict
+    """
+
+    for group in spelling_error_group_list:
+        for error in group.group:
+            occurrence = {"file": error.file, "line": int(error.line_number), "column": error.column,
+                          "word": error.word}
+            if group.suggestions:
+                occurrence["suggestions"] = [match_case(error.word, suggestion) for suggestion in group.suggestions]
+            yield occurrence
+
+
+def write_json_lines(spelling_error_group_list, stream):
+
+    """
+    Writes one JSON object per suspicious word occurrence, flushing as it goes.
+
+    :param spelling_error_group_list: [SpellingErrorGroup]
+    :param stream: file
+    """
+
+    for occurrence in iter_occurrences(spelling_error_group_list):
+        stream.write(json.dumps(occurrence, sort_keys=True) + "\n")
+        stream.flush()
+
+
+def artifact_uri(path):
+
+    """
+    Returns the SARIF artifact URI of a file: a percent-encoded relative reference with forward slashes,
+    or a file: URI if the path is absolute.
+
+    :param path: str
+    :return: str
+    """
+
+    if os.path.isabs(path):
+        return pathlib.Path(path).as_uri()
+    return urllib.parse.quote(pathlib.PurePath(path).as_posix())
+
+
+def write_sarif(spelling_error_group_list, stream):
+
+    """
+    Writes a SARIF 2.1.0 log with one result per suspicious word occurrence.
+
+    :param spelling_error_group_list: [SpellingErrorGroup]
+    :param stream: file
+    """
+
+    results = []
+
+    for occurrence in iter_occurrences(spelling_error_group_list):
+        region = {"startLine": occurrence["line"]}
+        if occurrence["column"] is not None:
+            region["startColumn"] = occurrence["column"] + 1  # SARIF columns are 1-based
+
+        results.append({
+            "ruleId": "spelling",
+            "level": "warning",
+            "message": {"text": "Suspicious word " + repr(occurrence["word"]) + (
+                "; did you mean " + repr(occurrence["suggestions"][0]) + "?" if "suggestions" in occurrence else "")},
+            "locations": [{"physicalLocation": {"artifactLocation": {"uri": artifact_uri(occurrence["file"])},
+                                                "region": region}}]
+        })
+
+    log = {
+        "version": "2.1.0",
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "runs": [{
+            "tool": {"driver": {"name": "spellchecker", "informationUri": "https://github.com/seales/spellchecker",
+                                "rules": [{"id": "spelling", "shortDescription": {"text": "Suspicious word"}}]}},
+            "results": results
+        }]
+    }
+
+    json.dump(log, stream, indent=2)
+    stream.write("\n")
+
+
+def read_baseline(path):
+
+    """
+    Reads a JSON Lines file written by write_json_lines, returning the known (file, word) pairs.
+    Words are compared case-insensitively.
+
+    :param path: str
+    :return: set of (str, str)
+    """
+
+    known = set()
+
+    with io.open(path, "r", encoding="utf-8") as baseline:
+        for line in baseline:
+            if line.strip():
+                occurrence = json.loads(line)
+                known.add((occurrence["file"], occurrence["word"].lower()))
+
+    return known
+
+
+WRITERS = {"jsonl": write_json_lines, "sarif": write_sarif}
@@ -0,0 +1,209 @@
+
+"""
+Opt-in instrumentation of a scan, enabled through config.PROFILE_STAGES, PROFILE_CPU and PROFILE_MEMORY.
+
+Workers time their own stages (see SpellingWorker.stage_seconds) and hand the timings to the consuming
+thread with each file's counts, like the other per-worker counts, so this works across processes too.
+ScanProfile merges them, times the stages that run in the consuming thread (discovery and consolidation),
+keeps the slowest files, and optionally runs cProfile and tracemalloc. When profiling is disabled, none of
+this code runs: workers only test one attribute per line read, and cProfile, pstats and tracemalloc aren't
+even imported.
+"""
+
+import time
+import heapq
+
+import config.config as config
+
+from io import StringIO
+from collections import Counter
+from contextlib import contextmanager
+
+STAGE_PREFIX = "seconds_"  # per-file counts with this prefix are stage timings
+
+active_profile = None  # the ScanProfile of the scan being profiled, if any
+
+
+def is_enabled():
+    return config.PROFILE_STAGES or config.PROFILE_CPU or config.PROFILE_MEMORY
+
+
+class ScanProfile:
+
+    def __init__(self, slowest_file_count=None):
+
+        """
+        Takes the number of slowest files to report, defaulting to config.PROFILE_SLOWEST_FILES.
+
+        :param slowest_file_count: int
+        """
+
+        self.slowest_file_count = slowest_file_count or config.PROFILE_SLOWEST_FILES
+        self.stage_seconds = Counter()
+        self.slowest_files = []  # min-heap of (seconds, path)
+        self.cpu_profiles = []
+        self.memory_snapshot = None
+
+    def start(self):
+
+        """
+        Starts cProfile (in the calling thread) and tracemalloc, if enabled.
+        """
+
+        global active_profile
+        active_profile = self
+
+        if config.PROFILE_CPU:
+            import cProfile
+            self.cpu_profiles.append(cProfile.Profile())
+            self.cpu_profiles[0].enable()
+        if config.PROFILE_MEMORY:
+            import tracemalloc
+            tracemalloc.start()
+
+    def stop(self):
+
+        """
+        Stops cProfile and tracemalloc, keeping their results for the report.
+        """
+
+        global active_profile
+        active_profile = None
+
+        if self.cpu_profiles:
+            self.cpu_profiles[0].disable()
+        if config.PROFILE_MEMORY:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                self.memory_snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+
+    def add_thread_profile(self, cpu_profile):
+        self.cpu_profiles.append(cpu_profile)  # list.append is atomic
+
+    @contextmanager
+    def stage(self, name):
+
+        """
+        Times the enclosed block as the named stage.
+
+        :param name: str
+        """
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] += time.perf_counter() - start_time
+
+    def timed_iter(self, iterable, name):
+
+        """
+        Passes items through, timing how long the iterable takes to produce them as the named stage.
+
+        :param iterable: iterable
+        :param name: str
+        :return: generator
+        """
+
+        iterator = iter(iterable)
+
+        while True:
+            start_time = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.stage_seconds[name] += time.perf_counter() - start_time
+            yield item
+
+    def add_file(self, file_path, counts):
+
+        """
+        Merges the stage timings of one checked file (see SpellingWorker.take_counts).
+
+        :param file_path: str
+        :param counts: dict
+        """
+
+        for name, value in counts.items():
+            if name.startswith(STAGE_PREFIX):
+                self.stage_seconds[name[len(STAGE_PREFIX):]] += value
+
+        file_seconds = counts.get(STAGE_PREFIX + "file")
+        if file_seconds is not None:
+            if len(self.slowest_files) < self.slowest_file_count:
+                heapq.heappush(self.slowest_files, (file_seconds, file_path))
+            elif file_seconds > self.slowest_files[0][0]:
+                heapq.heapreplace(self.slowest_files, (file_seconds, file_path))
+
+    def report(self, counts=None):
+
+        """
+        Constructs and returns the profiling report.
+
+        :param counts: Counter or None, e.g. ScanMetrics.counts
+        :return: str
+        """
+
+        lines = ["", "Stage timings (summed over workers):"]
+        stage_seconds = Counter(self.stage_seconds)
+
+        if "file" in stage_seconds:
+            # what checking a file took beyond tokenizing and checking its words: reading and extracting text
+            stage_seconds["read and extract"] = stage_seconds.pop("file") - stage_seconds["tokenize"] - \
+                stage_seconds["check"]
+
+        for name, seconds in stage_seconds.most_common():
+            lines.append("    " + name.ljust(20) + str("%.3f" % seconds) + " s")
+
+        if counts is not None:
+            lines.append("Words checked: " + str(counts["words"]) + " --- Cache hits: " + str(counts["cache_hits"])
+                         + " --- Compound splits attempted: " + str(counts["compound_splits"]))
+
+        if self.slowest_files:
+            lines.append("Slowest files:")
+            for seconds, file_path in sorted(self.slowest_files, reverse=True):
+                lines.append("    " + str("%.3f" % seconds) + " s  " + file_path)
+
+        if self.cpu_profiles:
+            import pstats
+            stream = StringIO()
+            stats = pstats.Stats(*self.cpu_profiles, stream=stream)
+            if config.PROFILE_OUTPUT_FILE:
+                stats.dump_stats(config.PROFILE_OUTPUT_FILE)
+            stats.sort_stats("cumulative").print_stats(config.PROFILE_TOP_FUNCTIONS)
+            lines.append(stream.getvalue().rstrip())
+
+        if self.memory_snapshot is not None:
+            lines.append("Top allocation sites:")
+            for statistic in self.memory_snapshot.statistics("lineno")[:config.PROFILE_TOP_FUNCTIONS]:
+                lines.append("    " + str(statistic))
+
+        return "\n".join(lines)
+
+
+@contextmanager
+def profiled_thread():
+
+    """
+    Runs cProfile in the calling worker thread for the duration of the block, if config.PROFILE_CPU
+    is set and a scan is being profiled; cProfile only ever sees the thread that enabled it.
+    """
+
+    scan_profile = active_profile
+
+    if scan_profile is None or not config.PROFILE_CPU:
+        yield
+        return
+
+    import cProfile
+    cpu_profile = cProfile.Profile()
+    cpu_profile.enable()
+
+    try:
+        yield
+    finally:
+        cpu_profile.disable()
+        scan_profile.add_thread_profile(cpu_profile)
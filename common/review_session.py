@@ -0,0 +1,201 @@
+
+"""
+State of an interactive review of SpellingErrorGroups: the page being shown, the groups investigated
+so far, and lookups by word, so that even very long lists of suspicious words can be paged through and
+searched without scanning the list on every keystroke.
+
+Positions can be saved to and restored from a JSON file (see config.REVIEW_POSITION_FILE), keyed by the
+reviewed directory. Positions are stored by word rather than by index, so they stay meaningful when a
+later scan finds a different list.
+"""
+
+import io
+import os
+import json
+import bisect
+
+
+class ReviewSession:
+
+    def __init__(self, spelling_error_group_list, page_size):
+
+        """
+        Takes the groups to review, in the order they are shown, and the number of groups per page.
+
+        :param spelling_error_group_list: [SpellingErrorGroup]
+        :param page_size: int
+        """
+
+        self.groups = spelling_error_group_list
+        self.page_size = max(page_size, 1)
+        self.page = 0
+        self.investigated = set()  # indices into groups
+
+        self.__indices = {}  # lowercase word -> index of its group
+        for index, group in enumerate(spelling_error_group_list):
+            self.__indices.setdefault(group.word.lower(), index)
+        self.__sorted_words = sorted(self.__indices)  # for prefix searches
+
+    def __len__(self):
+        return len(self.groups)
+
+    @property
+    def page_count(self):
+        return max((len(self.groups) + self.page_size - 1) // self.page_size, 1)
+
+    @property
+    def page_start(self):
+        return self.page * self.page_size
+
+    @property
+    def page_end(self):
+        return min(self.page_start + self.page_size, len(self.groups))
+
+    def page_groups(self):
+
+        """
+        Returns the groups on the current page.
+
+        :return: [SpellingErrorGroup]
+        """
+
+        return self.groups[self.page_start:self.page_end]
+
+    def go_to_page(self, page):
+        self.page = min(max(page, 0), self.page_count - 1)
+
+    def next_page(self):
+
+        """
+        Moves to the next page. Returns false if the current page is the last one.
+
+        :return: bool
+        """
+
+        if self.page + 1 >= self.page_count:
+            return False
+
+        self.page += 1
+        return True
+
+    def previous_page(self):
+        self.go_to_page(self.page - 1)
+
+    def find(self, text):
+
+        """
+        Returns the index of the group of the word text, or else of the first word (alphabetically)
+        starting with text, ignoring case. Returns None if there is no such word.
+
+        :param text: str
+        :return: int or None
+        """
+
+        text = text.lower()
+
+        if text in self.__indices:
+            return self.__indices[text]
+
+        position = bisect.bisect_left(self.__sorted_words, text)
+        if position < len(self.__sorted_words) and self.__sorted_words[position].startswith(text):
+            return self.__indices[self.__sorted_words[position]]
+        return None
+
+    def jump_to(self, index):
+        self.go_to_page(index // self.page_size)
+
+    def mark_investigated(self, index):
+        self.investigated.add(index)
+
+    def is_investigated(self, index):
+        return index in self.investigated
+
+    def position(self):
+
+        """
+        Describes the current page and the investigated groups by their words.
+
+        :return: dict
+        """
+
+        return {
+            "word": self.groups[self.page_start].word if self.groups else None,
+            "investigated": sorted(self.groups[index].word for index in self.investigated)
+        }
+
+    def restore(self, position):
+
+        """
+        Returns to the page of a position's word, and marks the words it lists as investigated if
+        they are still found. Returns false if the word isn't found anymore.
+
+        :param position: dict, as returned by position()
+        :return: bool
+        """
+
+        for word in position.get("investigated", []):
+            index = self.__indices.get(word.lower())
+            if index is not None:
+                self.investigated.add(index)
+
+        index = self.__indices.get((position.get("word") or "").lower())
+        if index is None:
+            return False
+
+        self.jump_to(index)
+        return True
+
+
+def read_positions(path):
+
+    """
+    Returns the saved positions in path, by reviewed directory. Missing or unreadable files have none.
+
+    :param path: str
+    :return: dict
+    """
+
+    try:
+        with io.open(path, "r", encoding="utf-8") as position_file:
+            positions = json.load(position_file)
+    except (OSError, IOError, ValueError):
+        return {}
+
+    return positions if isinstance(positions, dict) else {}
+
+
+def load_position(path, directory):
+
+    """
+    Returns the position saved for a directory, or None.
+
+    :param path: str
+    :param directory: str
+    :return: dict or None
+    """
+
+    return read_positions(path).get(os.path.abspath(directory))
+
+
+def save_position(path, directory, position):
+
+    """
+    Saves the position reached in a directory, or forgets it if position is None.
+
+    :param path: str
+    :param directory: str
+    :param position: dict or None
+    """
+
+    positions = read_positions(path)
+    key = os.path.abspath(directory)
+
+    if position is None:
+        if key not in positions:
+            return
+        del positions[key]
+    else:
+        positions[key] = position
+
+    with io.open(path, "w", encoding="utf-8") as position_file:
+        position_file.write(json.dumps(positions, indent=1, sort_keys=True))
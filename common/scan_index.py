@@ -0,0 +1,178 @@
+
+"""
+Persistent index of previous scan results, so that unchanged files don't have to be re-read.
+
+Each scanned file is stored with its modification time, size and a content digest, along with the
+suspicious words that were found in it. A file is considered unchanged if its modification time and
+size match, or if only its modification time changed but its content digest did not (e.g., after a
+checkout that rewrote the file).
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+
+from spelling.spelling_error import SpellingError
+
+
+SCHEMA_VERSION = "3"  # part of the stored signature, so indexes with an older layout are rebuilt
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, digest TEXT);
+CREATE TABLE IF NOT EXISTS errors (path TEXT, word TEXT, line_number INTEGER, line_column INTEGER);
+CREATE INDEX IF NOT EXISTS errors_by_path ON errors (path);
+"""
+
+
+def file_digest(path):
+
+    """
+    Returns a hex digest of the file's content.
+
+    :param path: str
+    :return: str
+    """
+
+    digest = hashlib.sha1()
+    with open(path, "rb") as readable_file:
+        for block in iter(lambda: readable_file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_stat(path):
+
+    """
+    Returns (mtime in nanoseconds, size) of the file.
+
+    :param path: str
+    :return: (int, int)
+    """
+
+    stat = os.stat(path)
+    return getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1e9)), stat.st_size
+
+
+class ScanIndex:
+
+    def __init__(self, path, signature):
+
+        """
+        Opens (or creates) the index stored at path. The signature describes the settings that affect
+        which words are flagged; if it differs from the one the index was built with, the index is emptied.
+
+        :param path: str
+        :param signature: str
+        """
+
+        self.__path = path
+        self.__reused_file_count = 0
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.executescript(SCHEMA)
+
+        signature = SCHEMA_VERSION + "|" + signature
+        row = self.__connection.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+
+        if row is None or row[0] != signature:
+            self.__connection.executescript("DROP TABLE files; DROP TABLE errors;" + SCHEMA)
+            with self.__connection:
+                self.__connection.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (signature,))
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def reused_file_count(self):
+        return self.__reused_file_count
+
+    def lookup(self, file_path):
+
+        """
+        Returns the SpellingErrors stored for file_path if the file is unchanged since it was
+        stored, otherwise None.
+
+        :param file_path: str
+        :return: [SpellingError] or None
+        """
+
+        with self.__lock:
+            row = self.__connection.execute("SELECT mtime_ns, size, digest FROM files WHERE path = ?",
+                                            (file_path,)).fetchone()
+            if row is None:
+                return None
+
+            try:
+                mtime_ns, size = file_stat(file_path)
+
+                if size != row[1]:
+                    return None
+
+                if mtime_ns != row[0]:
+                    if file_digest(file_path) != row[2]:
+                        return None
+
+                    with self.__connection:
+                        self.__connection.execute("UPDATE files SET mtime_ns = ? WHERE path = ?",
+                                                  (mtime_ns, file_path))
+            except OSError:
+                return None
+
+            rows = self.__connection.execute("SELECT word, line_number, line_column FROM errors WHERE path = ?",
+                                             (file_path,))
+            return [SpellingError(file_path, word, None, line_number, column) for word, line_number, column in rows]
+
+    def iter_changed_files(self, files, reused_errors):
+
+        """
+        Yields the files which need to be scanned. SpellingErrors of unchanged files are
+        appended to reused_errors instead.
+
+        :param files: iterable of str
+        :param reused_errors: collections.deque
+        :return: generator of str
+        """
+
+        for file_path in files:
+            errors = self.lookup(file_path)
+
+            if errors is None:
+                yield file_path
+            else:
+                self.__reused_file_count += 1
+                reused_errors.extend(errors)
+
+    def store(self, file_path, spelling_errors, fingerprint):
+
+        """
+        Stores the result of scanning a file, with the fingerprint the worker took of the bytes it
+        scanned (see MappedTextFile.fingerprint), so that a file changed while or after it was
+        scanned is never mistaken for unchanged. Files without SpellingErrors are stored too,
+        so that they can be skipped next time. Changes are committed on close.
+
+        :param file_path: str
+        :param spelling_errors: [SpellingError]
+        :param fingerprint: (int, int, str), modification time in ns, size and SHA-1 digest
+        """
+
+        mtime_ns, size, digest = fingerprint
+
+        with self.__lock:
+            self.__connection.execute("DELETE FROM errors WHERE path = ?", (file_path,))
+            self.__connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                      (file_path, mtime_ns, size, digest))
+            self.__connection.executemany("INSERT INTO errors VALUES (?, ?, ?, ?)",
+                                          [(file_path, error.word, error.line_number, error.column)
+                                           for error in spelling_errors])
+
+    def commit(self):
+        with self.__lock:
+            self.__connection.commit()
+
+    def close(self):
+        with self.__lock:
+            self.__connection.commit()
+            self.__connection.close()
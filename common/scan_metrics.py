@@ -0,0 +1,112 @@
+
+"""
+Progress and throughput statistics for a scan.
+
+Workers never touch shared counters: each worker counts into its own SpellingWorker attributes and hands
+the counts for every file it finishes to the consuming thread along with the file's results, where they
+are merged into a single ScanMetrics. This also works across processes, where shared globals cannot.
+"""
+
+import time
+
+import config.config as config
+
+from collections import Counter
+
+
+class ScanMetrics:
+
+    def __init__(self, start_time=None):
+
+        """
+        Takes the start time of the scan (in epoch seconds), defaulting to now.
+
+        :param start_time: float
+        """
+
+        self.start_time = start_time or time.time()
+        self.discovered_file_count = 0  # only written by the thread doing discovery
+        self.file_count = 0
+        self.reused_file_count = 0
+        self.spelling_error_count = 0
+        self.counts = Counter()  # e.g., lines, words, cache_hits, cache_misses, bloom_negatives, bloom_positives
+        self.__last_status_time = 0
+
+    def add_file(self, spelling_error_count, counts):
+
+        """
+        Merges the counts of one checked file.
+
+        :param spelling_error_count: int
+        :param counts: dict, as returned by SpellingWorker.take_counts
+        """
+
+        self.file_count += 1
+        self.spelling_error_count += spelling_error_count
+        self.counts.update(counts)
+
+    def add_reused_errors(self, spelling_error_count):
+        self.spelling_error_count += spelling_error_count
+
+    def elapsed_time(self):
+        return max(time.time() - self.start_time, 1e-9)
+
+    def should_print_status(self):
+
+        """
+        Returns true at most once every config.STATUS_PRINT_SECONDS.
+
+        :return: bool
+        """
+
+        now = time.time()
+        if now - self.__last_status_time >= config.STATUS_PRINT_SECONDS:
+            self.__last_status_time = now
+            return True
+        return False
+
+    def status(self):
+
+        """
+        Constructs and returns a status update.
+
+        :return: str
+        """
+
+        spelling_errs = "Suspicious Words: " + str(self.spelling_error_count)
+        file_progress = "Files Read: " + str(self.file_count) + " out of " + str(self.discovered_file_count)
+        time_progress = "In " + str("%.2f" % self.elapsed_time()) + " seconds"
+
+        return spelling_errs + " --- " + file_progress + " --- " + time_progress
+
+    def cache_hit_rate(self):
+        lookups = self.counts["cache_hits"] + self.counts["cache_misses"]
+        return float(self.counts["cache_hits"]) / lookups if lookups else 0.0
+
+    def summary(self):
+
+        """
+        Constructs and returns the end-of-scan summary.
+
+        :return: str
+        """
+
+        elapsed_time = self.elapsed_time()
+
+        lines = [
+            "Checked " + str(self.file_count) + " files (" + str(self.reused_file_count)
+            + " unchanged files reused) in " + str("%.2f" % elapsed_time) + " seconds",
+            "Files/sec: " + str("%.1f" % (self.file_count / elapsed_time))
+            + " --- Lines/sec: " + str("%.1f" % (self.counts["lines"] / elapsed_time))
+            + " --- Words/sec: " + str("%.1f" % (self.counts["words"] / elapsed_time)),
+            "Verdict cache hit rate: " + str("%.1f" % (100 * self.cache_hit_rate())) + "%"
+        ]
+
+        if self.counts["skipped_files"]:
+            lines.append("Skipped " + str(self.counts["skipped_files"]) + " binary or oversized files")
+
+        if self.counts["bloom_negatives"] or self.counts["bloom_positives"]:
+            lines.append("Bloom filter: " + str(self.counts["bloom_negatives"]) + " definite misses --- "
+                         + str(self.counts["bloom_positives"]) + " probable hits")
+
+        return "\n".join(lines)
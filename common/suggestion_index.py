@@ -0,0 +1,308 @@
+
+"""
+Symmetric delete (SymSpell-style) index for suggesting corrections of suspicious words.
+
+Every vocabulary word is stored under each string obtained by deleting up to max_distance characters from
+its first prefix_length characters. A lookup generates the same deletes of the misspelled word, collects
+the words stored under them, and keeps those within max_distance edits (insertions, deletions,
+substitutions and transpositions of adjacent characters). No dictionary is consulted at lookup time.
+
+Building the index for a large vocabulary takes a while and a lot of memory, so for a word list snapshot it
+is written to a file once (see build_suggestion_file) and memory-mapped by later runs, like the snapshot:
+a sorted array of deletes, each followed by the snapshot indices of the words stored under it.
+"""
+
+import os
+import mmap
+import struct
+
+MAGIC = b"SPSUGG01"
+HEADER = struct.Struct("<8sIIII")  # magic, delete count, max distance, prefix length, offset of the delete data
+OFFSET = struct.Struct("<I")
+
+
+def iter_deletes(word, max_distance):
+
+    """
+    Yields word and every distinct string obtained by deleting up to max_distance of its characters.
+
+    :param word: str
+    :param max_distance: int
+    :return: generator of str
+    """
+
+    seen = set([word])
+    frontier = [word]
+    yield word
+
+    for _ in range(max_distance):
+        next_frontier = []
+        for item in frontier:
+            for index in range(len(item)):
+                delete = item[:index] + item[index + 1:]
+                if delete not in seen:
+                    seen.add(delete)
+                    next_frontier.append(delete)
+                    yield delete
+        frontier = next_frontier
+
+
+def edit_distance(source, target, max_distance):
+
+    """
+    Returns the optimal string alignment distance between source and target,
+    or max_distance + 1 as soon as it is known to exceed max_distance.
+
+    :param source: str
+    :param target: str
+    :param max_distance: int
+    :return: int
+    """
+
+    if abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+
+    before_previous = None
+    previous = list(range(len(target) + 1))
+
+    for i in range(1, len(source) + 1):
+        current = [i] + [0] * len(target)
+
+        for j in range(1, len(target) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (source[i - 1] != target[j - 1]))
+
+            if i > 1 and j > 1 and source[i - 1] == target[j - 2] and source[i - 2] == target[j - 1]:
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+
+        if min(current) > max_distance:
+            return max_distance + 1
+
+        before_previous, previous = previous, current
+
+    return previous[-1]
+
+
+def match_case(word, suggestion):
+
+    """
+    Returns suggestion in the case of word (e.g., "Teh" -> "The", "TEH" -> "THE").
+
+    :param word: str
+    :param suggestion: str
+    :return: str
+    """
+
+    if word.isupper() and len(word) > 1:
+        return suggestion.upper()
+    if word[:1].isupper():
+        return suggestion[:1].upper() + suggestion[1:]
+    return suggestion
+
+
+class SuggestionIndex:
+
+    def __init__(self, words, max_distance=1, prefix_length=7):
+
+        """
+        Indexes the vocabulary.
+
+        :param words: iterable of str
+        :param max_distance: int, the most edits between a word and its suggestions
+        :param prefix_length: int, how much of each word is indexed; longer is faster to look up but larger
+        """
+
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.__deletes = {}  # delete -> word, or list of words if several share it
+
+        for word in words:
+            word = word.lower()
+            if len(word) > 1:
+                self.add(word)
+
+    def add(self, word):
+        for delete in iter_deletes(word[:self.prefix_length], self.max_distance):
+            entry = self.__deletes.get(delete)
+
+            if entry is None:
+                self.__deletes[delete] = word
+            elif isinstance(entry, list):
+                if entry[-1] != word:
+                    entry.append(word)
+            elif entry != word:
+                self.__deletes[delete] = [entry, word]
+
+    def words_under(self, delete):
+
+        """
+        Returns the words stored under a delete.
+
+        :param delete: str
+        :return: [str]
+        """
+
+        entry = self.__deletes.get(delete)
+
+        if entry is None:
+            return []
+        return entry if isinstance(entry, list) else [entry]
+
+    def lookup(self, word, max_suggestions=None):
+
+        """
+        Returns the vocabulary words within max_distance edits of word, in the case of word, closest
+        first. Among equally close words, those made of the same letters (i.e., transpositions) come
+        first, then those sharing the first letter and length of word.
+
+        :param word: str
+        :param max_suggestions: int or None
+        :return: [str]
+        """
+
+        lower_word = word.lower()
+        distances = {}
+
+        for delete in iter_deletes(lower_word[:self.prefix_length], self.max_distance):
+            for candidate in self.words_under(delete):
+                if candidate not in distances:
+                    distances[candidate] = edit_distance(lower_word, candidate, self.max_distance)
+
+        letters = sorted(lower_word)
+        ranked = sorted((distance, sorted(candidate) != letters, candidate[:1] != lower_word[:1],
+                         abs(len(candidate) - len(lower_word)), candidate)
+                        for candidate, distance in distances.items()
+                        if 0 < distance <= self.max_distance)
+
+        return [match_case(word, ranking[-1]) for ranking in ranked[:max_suggestions]]
+
+
+def build_suggestion_file(output_path, snapshot, max_distance=1, prefix_length=7):
+
+    """
+    Writes the suggestion index of a word list snapshot, for SuggestionFile to map.
+
+    :param output_path: str
+    :param snapshot: WordlistSnapshot
+    :param max_distance: int
+    :param prefix_length: int
+    """
+
+    postings = {}  # encoded delete -> snapshot indices of its words
+
+    for word_index, word in enumerate(snapshot):
+        if len(word) > 1:
+            for delete in iter_deletes(word[:prefix_length], max_distance):
+                postings.setdefault(delete.encode("utf-8"), []).append(word_index)
+
+    deletes = sorted(postings)
+
+    # each delete is stored as its length, the delete, the number of its words and their indices
+    offsets = []
+    chunks = []
+    position = 0
+    for delete in deletes:
+        word_indices = postings[delete]
+        chunk = struct.pack("<I", len(delete)) + delete + struct.pack("<" + str(len(word_indices) + 1) + "I",
+                                                                        len(word_indices), *word_indices)
+        offsets.append(position)
+        chunks.append(chunk)
+        position += len(chunk)
+
+    data_offset = HEADER.size + OFFSET.size * len(offsets)
+
+    temporary_path = output_path + "." + str(os.getpid()) + ".tmp"
+    with open(temporary_path, "wb") as index_file:
+        index_file.write(HEADER.pack(MAGIC, len(deletes), max_distance, prefix_length, data_offset))
+        index_file.write(struct.pack("<" + str(len(offsets)) + "I", *offsets))
+        for chunk in chunks:
+            index_file.write(chunk)
+    os.replace(temporary_path, output_path)
+
+
+def load_suggestion_file(snapshot, cache_directory, max_distance=1, prefix_length=7):
+
+    """
+    Returns the suggestion index of a word list snapshot, building it into cache_directory the first
+    time it is needed. Raises OSError if the index can't be written.
+
+    :param snapshot: WordlistSnapshot
+    :param cache_directory: str
+    :param max_distance: int
+    :param prefix_length: int
+    :return: SuggestionFile
+    """
+
+    path = os.path.join(cache_directory, "suggestions-" + snapshot.tag + "-" + str(max_distance) + "-"
+                        + str(prefix_length) + ".index")
+
+    if not os.path.isfile(path):
+        os.makedirs(cache_directory, mode=0o700, exist_ok=True)
+        build_suggestion_file(path, snapshot, max_distance, prefix_length)
+
+    return SuggestionFile(path, snapshot)
+
+
+class SuggestionFile(SuggestionIndex):
+
+    def __init__(self, path, snapshot):
+
+        """
+        Memory-maps the suggestion index written by build_suggestion_file for snapshot.
+
+        :param path: str
+        :param snapshot: WordlistSnapshot
+        """
+
+        with open(path, "rb") as index_file:
+            self.__data = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.__count, self.max_distance, self.prefix_length, self.__data_offset = \
+            HEADER.unpack_from(self.__data, 0)
+
+        if magic != MAGIC:
+            raise ValueError(repr(path) + " is not a suggestion index")
+
+        self.__snapshot = snapshot
+
+    def add(self, word):
+        raise TypeError("suggestion files are read-only")
+
+    def delete_at(self, index):
+
+        """
+        Returns the position of the delete at index in sorted order, and the delete.
+
+        :param index: int
+        :return: (int, bytes)
+        """
+
+        position = self.__data_offset + OFFSET.unpack_from(self.__data, HEADER.size + OFFSET.size * index)[0]
+        length = OFFSET.unpack_from(self.__data, position)[0]
+        return position + OFFSET.size, self.__data[position + OFFSET.size:position + OFFSET.size + length]
+
+    def words_under(self, delete):
+        key = delete.encode("utf-8")
+        lo, hi = 0, self.__count
+
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self.delete_at(middle)[1] < key:
+                lo = middle + 1
+            else:
+                hi = middle
+
+        if lo >= self.__count:
+            return []
+
+        position, found = self.delete_at(lo)
+        if found != key:
+            return []
+
+        position += len(found)
+        word_count = OFFSET.unpack_from(self.__data, position)[0]
+        word_indices = struct.unpack_from("<" + str(word_count) + "I", self.__data, position + OFFSET.size)
+        return [self.__snapshot.word_at(word_index).decode("utf-8") for word_index in word_indices]
+
+    def close(self):
+        self.__data.close()
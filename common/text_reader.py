@@ -0,0 +1,224 @@
+
+"""
+Robust reading of the files to check.
+
+Files are memory-mapped rather than opened in text mode with the platform's default encoding. Lines are
+found with find(b"\n") on the map and decoded one at a time by an incremental decoder, using
+config.TEXT_ENCODING and config.DECODE_ERRORS, so a stray byte no longer aborts the file and a huge file
+is never held as one str. Files larger than config.MAX_FILE_BYTES, or with a NUL byte within their first
+config.BINARY_SNIFF_BYTES (i.e., binary files), are skipped.
+
+get_line reads single lines the same way, for showing the lines of suspicious words during review.
+"""
+
+import os
+import mmap
+import codecs
+import threading
+
+import config.config as config
+
+from collections import OrderedDict
+
+LINE_CACHE_SIZE = 32  # files whose lines are kept by get_line
+
+line_cache = OrderedDict()  # path -> ((mtime in ns, size), [str]), least recently used first
+line_cache_lock = threading.Lock()
+
+
+class MappedTextFile:
+
+    def __init__(self, buffer, encoding=None, errors=None, stamp=None):
+
+        """
+        Takes the bytes of a file (typically an mmap) and how to decode them. Supports the parts of
+        the file interface that extractors use: iteration over lines, readline and read.
+
+        :param buffer: mmap or bytes
+        :param encoding: str, defaults to config.TEXT_ENCODING
+        :param errors: str, defaults to config.DECODE_ERRORS
+        :param stamp: (int, int) or None, modification time in ns and size of the file, taken before it was mapped
+        """
+
+        self.stamp = stamp
+        self.__buffer = buffer
+        self.__position = 0
+        self.__decoder = codecs.getincrementaldecoder(encoding or config.TEXT_ENCODING)(
+            errors or config.DECODE_ERRORS)
+
+    def readline(self):
+
+        """
+        Returns the next line, including its line ending, or "" at the end of the file.
+
+        :return: str
+        """
+
+        size = len(self.__buffer)
+        line = ""
+
+        while not line and self.__position < size:
+            start = self.__position
+            end = self.__buffer.find(b"\n", start)
+            self.__position = size if end < 0 else end + 1
+            line = self.__decoder.decode(self.__buffer[start:self.__position], self.__position == size)
+
+        return line
+
+    def read(self):
+
+        """
+        Returns the rest of the file.
+
+        :return: str
+        """
+
+        start = self.__position
+        self.__position = len(self.__buffer)
+        return self.__decoder.decode(self.__buffer[start:], True)
+
+    def __iter__(self):
+        return iter(self.readline, "")
+
+    def fingerprint(self):
+
+        """
+        Returns the file's stamp and a SHA-1 digest of its bytes, for ScanIndex.store. Taken before the
+        file is read, the fingerprint describes exactly the bytes read, and any later change of the file
+        changes its modification time.
+
+        :return: (int, int, str) or None if there is no stamp
+        """
+
+        import hashlib  # only imported when a scan index is used
+
+        if self.stamp is None:
+            return None
+        return self.stamp + (hashlib.sha1(self.__buffer).hexdigest(),)
+
+    def close(self):
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def is_binary(buffer):
+
+    """
+    Returns true if there is a NUL byte within the first config.BINARY_SNIFF_BYTES of buffer.
+
+    :param buffer: mmap or bytes
+    :return: bool
+    """
+
+    return buffer.find(b"\0", 0, config.BINARY_SNIFF_BYTES) >= 0
+
+
+def open_text_file(path):
+
+    """
+    Memory-maps the file at path for reading as text. Returns None if the file is
+    larger than config.MAX_FILE_BYTES or is binary.
+
+    :param path: str
+    :return: MappedTextFile or None
+    """
+
+    stat = os.stat(path)
+    size = stat.st_size
+
+    if config.MAX_FILE_BYTES is not None and size > config.MAX_FILE_BYTES:
+        return None
+
+    with open(path, "rb") as binary_file:
+        if size == 0:
+            buffer = b""  # empty files can't be mapped
+        else:
+            try:
+                buffer = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                buffer = binary_file.read()  # e.g., special files that can't be mapped
+
+    text_file = MappedTextFile(buffer, stamp=(stat.st_mtime_ns, size))  # the map stays valid after the file is closed
+
+    if is_binary(buffer):
+        text_file.close()
+        return None
+
+    return text_file
+
+
+def read_text(path):
+
+    """
+    Returns the decoded contents of the file at path, or None if it is skipped (see open_text_file).
+
+    :param path: str
+    :return: str or None
+    """
+
+    text_file = open_text_file(path)
+
+    if text_file is None:
+        return None
+
+    with text_file:
+        return text_file.read()
+
+
+def get_line(path, line_number):
+
+    """
+    Returns a line of the file at path, decoded like the files that are checked, or "" if there is no
+    such line or the file is skipped. The lines of recently used files are cached until they change.
+
+    :param path: str
+    :param line_number: int, starting at 1
+    :return: str
+    """
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ""
+
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with line_cache_lock:
+        cached = line_cache.get(path)
+        if cached is not None and cached[0] == version:
+            line_cache.move_to_end(path)
+            lines = cached[1]
+        else:
+            lines = None
+
+    if lines is None:
+        try:
+            text_file = open_text_file(path)
+        except (OSError, IOError):
+            return ""
+
+        lines = []
+        if text_file is not None:
+            with text_file:
+                try:
+                    lines = list(text_file)
+                except UnicodeDecodeError:
+                    return ""  # with config.DECODE_ERRORS = "strict"
+
+        with line_cache_lock:
+            line_cache[path] = (version, lines)
+            while len(line_cache) > LINE_CACHE_SIZE:
+                line_cache.popitem(last=False)
+
+    return lines[line_number - 1] if 0 < line_number <= len(lines) else ""
+
+
+def forget_lines(path):
+    with line_cache_lock:
+        line_cache.pop(path, None)
@@ -1,30 +1,84 @@
 
 import re
-import traceback
 import os
-import enchant
-import keyword
+import threading
 
 import config.config as config
 
-from spelling.spelling_error_group import SpellingErrorGroup
-from glob import glob
+from common.file_discovery import iter_files_in_path
+from common.fix_queue import apply_corrections
+from common.verdict_cache import VerdictCache
+from common.word_trie import WordTrie, DictionaryWordSource, is_compound_word
+from common.allowlist import Allowlist
+from common.error_aggregation import ErrorAggregator
+from common.suggestion_index import SuggestionIndex, load_suggestion_file
+from common.wordlist_snapshot import WordlistSnapshot, load_word_file, read_word_file
 
 
 STRIP_REGEX = re.compile('[^a-zA-Z]')
 
-d = enchant.Dict("en_US")
+# words are runs of letters; camelCase humps, digits and any other character separate them, and
+# apostrophes are kept only inside a word (e.g., "don't")
+TOKEN_REGEX = re.compile("[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+(?:'[a-z]+)*|[A-Z]+(?:'[A-Z]+)*")
+
+CAMEL_CASE_WORD_REGEX = re.compile('(.)([A-Z][a-z]+)')
+CAMEL_CASE_BOUNDARY_REGEX = re.compile('([a-z0-9])([A-Z])')
+UNDECODABLE_REGEX = re.compile(u'[\udc80-\udcff\ufffd]')
+
+
+def load_dictionary():
+
+    """
+    Returns the dictionary words are checked against: the word list snapshot named by
+    config.WORDLIST_SNAPSHOT_FILE if there is one, otherwise an enchant dictionary.
+
+    :return: WordlistSnapshot or enchant.Dict
+    """
+
+    if config.WORDLIST_SNAPSHOT_FILE:
+        return WordlistSnapshot(config.WORDLIST_SNAPSHOT_FILE)
+
+    import enchant
+    return enchant.Dict(config.DICTIONARY_LANGUAGE)
+
+
+dictionary = None  # loaded on first use by get_dictionary, so that importing this module stays cheap
+dictionary_lock = threading.Lock()
+
+allowlist = Allowlist(config.ALLOWLIST_FILE)
+
+verdict_cache = VerdictCache(config.VERDICT_CACHE_SIZE)
+
+word_list = None  # config.WORD_LIST_FILE as a snapshot, loaded on first use by get_word_list; False if unavailable
+word_list_lock = threading.Lock()
+
+word_source = None  # built on first use by get_word_source
+word_source_lock = threading.Lock()
+
+bloom_filter = None  # built on first use by get_bloom_filter, if config.BLOOM_FILTER_ENABLED; False if not useful
+bloom_filter_lock = threading.Lock()
+
+compound_splits = threading.local()  # per thread, calls of is_n_part_word; only counted if config.PROFILE_STAGES
+
+suggestion_index = None  # built on first use by get_suggestion_index, if config.SUGGESTIONS_ENABLED
+suggestion_index_lock = threading.Lock()
 
 
 def recursively_get_all_files_in_path(path):
-    python_files = [y for x in os.walk(path) for y in glob(os.path.join(x[0], '*.py'))]
-    md_files = [y for x in os.walk(path) for y in glob(os.path.join(x[0], '*.md'))]
-    markdown_files = [y for x in os.walk(path) for y in glob(os.path.join(x[0], '*.markdown'))]
-    rst_files = [y for x in os.walk(path) for y in glob(os.path.join(x[0], '*.rst'))]
-    return python_files + rst_files + md_files + markdown_files
+
+    """
+    Returns every file below path with a registered extension. Use
+    file_discovery.iter_files_in_path directly to receive paths as they are found.
+
+    :param path: str
+    :return: [str]
+    """
+
+    return list(iter_files_in_path(path))
 
 
 def get_all_files_in_directory(path):
+    from glob import glob
     return glob(path + "/*" if path[-1] != "/" else path + "*.txt")
 
 
@@ -34,6 +88,7 @@ def print_error():
     Method to-be-invoked when exception occurs.
     """
 
+    import traceback
     traceback.print_exc()
     print("\n\nSomething unexpected just happened. Please create an issue - https://github.com/seales/spellchecker")
 
@@ -50,72 +105,52 @@ def strip_string(string):
     return STRIP_REGEX.sub(" ", string)
 
 
-def consolidate_spelling_errors(spelling_errors):
+def consolidate_spelling_errors(spelling_errors, filters=None, score=None):
 
     """
-    Groups input SpellingError list into SpellingErrorGroups, using the misspelled word as a hash key.
+    Groups input SpellingErrors into SpellingErrorGroups, using the misspelled word as a hash key, and
+    ranks the groups that pass the filters (see common/error_aggregation.py).
+
+    The input may be a generator; occurrences of words which can no longer pass the filters are
+    released, so memory use depends on the number of distinct suspicious words.
 
-    :param spelling_errors: [SpellingError]
+    :param spelling_errors: iterable of SpellingError
+    :param filters: [function] or None, defaults to the limits in config
+    :param score: function or None, by which groups are ranked
     :return: [SpellingErrorGroup]
     """
 
-    spelling_error_hash = {}
-
-    print("\nFound " + str(config.spelling_error_counter) + " suspicious words. Trying to filter...")
+    aggregator = ErrorAggregator(filters, score)
+    aggregator.add_all(spelling_errors)
 
-    for error in spelling_errors:
+    print("\nFound " + str(aggregator.error_count) + " suspicious words. Trying to filter...")
 
-        lower_error_word = error.word.lower()  # make key case-insensitive
+    spelling_error_group_list = aggregator.groups()
 
-        if lower_error_word not in spelling_error_hash:
-            spelling_error_hash[lower_error_word] = {"count": 1, "error_list": [error]}
-        else:
-            spelling_error_hash[lower_error_word]["count"] += 1
-            spelling_error_hash[lower_error_word]["error_list"] += [error]
+    index = get_suggestion_index()
+    if index is not None:
+        for group in spelling_error_group_list:
+            group.suggestions = index.lookup(group.word, config.MAX_SUGGESTIONS)
 
     print("\nDone filtering...")
-    total_remaining_count = 0
-    for key in sorted(spelling_error_hash.keys()):
-        if spelling_error_hash[key]["count"] < 5:
-            total_remaining_count += 1
-        else:
-            del spelling_error_hash[key]
 
-
-    if total_remaining_count == 0:
+    if not spelling_error_group_list:
         print("\nNo suspicious words remain.")
     else:
-        print("\nOnly " + str(total_remaining_count) + " suspicious words remain. Help me investigate.")
+        print("\nOnly " + str(len(spelling_error_group_list)) + " suspicious words remain. Help me investigate.")
 
-    return spelling_group_list_from_hash(spelling_error_hash)
+    return spelling_error_group_list
 
 
-def spelling_group_list_from_hash(spelling_error_hash):
-
-    """
-    Converts SpellingErrors, within a dictionary that has each misspelled word
-    as a key, into SpellingErrorGroups.
-
-    :param spelling_error_hash: dict
-    :return: [SpellingErrorGroup]
-    """
-
-    spelling_error_list = []
-
-    for key in spelling_error_hash.keys():
-        group = SpellingErrorGroup(key, spelling_error_hash[key]["error_list"])
-        spelling_error_list.append(group)
-
-    return spelling_error_list
-
-
-def print_spelling_error_group_list(spelling_error_group_list, investigated_indices):
+def print_spelling_error_group_list(spelling_error_group_list, investigated_indices, first_index=0):
 
     """
     Print the suspicious word associated with each SpellingErrorGroup in the input. If a word
     has been investigated, we mark it.
 
     :param spelling_error_group_list: [SpellingErrorGroup]
+    :param investigated_indices: set of int, indices of investigated groups in the whole list
+    :param first_index: int, index of the first group of the input in the whole list
     """
 
     print("")
@@ -123,7 +158,10 @@ def print_spelling_error_group_list(spelling_error_group_list, investigated_indi
     for group in spelling_error_group_list:
         output_str = str(index) + " -- " + group.word
 
-        if index in investigated_indices:
+        if group.suggestions:
+            output_str += " (" + group.suggestions[0] + "?)"
+
+        if first_index + index in investigated_indices:
             output_str += " <-- [investigated]"
 
         print(output_str)
@@ -156,19 +194,29 @@ def print_bound_message(bound):
     print("\nYour input must be an integer between 0 and " + bound + ". Try again.")
 
 
-def split_line(line):
+def tokenize_line(line):
 
-    # TODO - split each line in the file more intelligently
+    """
+    Yields each word in input along with the column at which it starts, in a single scan.
+
+    :param line: str
+    :return: generator of (str, int)
+    """
+
+    for match in TOKEN_REGEX.finditer(line):
+        yield match.group(), match.start()
+
+
+def split_line(line):
 
     """
     Attempt to split input into individual words.
 
     :param line: str
-    :return: str
+    :return: [str]
     """
 
-    return strip_string(convert_camel_case_to_underscore(line))\
-        .replace("-", " ").replace("_", " ").replace("=", " ").split(" ")
+    return TOKEN_REGEX.findall(line)
 
 
 def convert_camel_case_to_underscore(name):
@@ -180,32 +228,22 @@ def convert_camel_case_to_underscore(name):
     :return: str
     """
 
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
+    s1 = CAMEL_CASE_WORD_REGEX.sub(r'\1_\2', name)
+    return CAMEL_CASE_BOUNDARY_REGEX.sub(r'\1_\2', s1)
 
 
 def update_file(error, correct_word):
 
     """
     Uses input SpellingError to update occurrence in file with correct_word param.
+    To apply many corrections, queue them on a FixQueue so that each file is only rewritten once.
 
     :param error: SpellingError
     :param correct_word: str
     """
 
     try:
-        with open(error.file, 'r') as file:
-            data = file.readlines()
-
-        line_index = int(error.line_number) - 1
-        start_index = data[line_index].lower().index(error.word.lower())
-        end_index = start_index + len(error.word)
-
-        data[line_index] = data[line_index][0:start_index] + correct_word + data[line_index][end_index:]
-
-        with open(error.file, 'w') as file:
-            file.writelines(data)
-
+        apply_corrections(error.file, [(int(error.line_number), error.column, error.word, correct_word)])
     except Exception:
         print_error()
 
@@ -213,18 +251,255 @@ def update_file(error, correct_word):
 def remove_non_utf8(line):
 
     """
-    Strips all non-utf8 from input.
+    Strips the characters that stand in for undecodable bytes (surrogate escapes and U+FFFD,
+    see config.DECODE_ERRORS) from input.
 
     :param line: str
     :return: str
     """
 
-    # TODO - handle for both python2/3
+    return UNDECODABLE_REGEX.sub("", line)
 
-    try:
-        return line  # line.encode('utf-8').decode('utf-8', 'ignore').encode("utf-8")
-    except Exception:
-        return ""
+
+def get_dictionary():
+
+    """
+    Returns the dictionary words are checked against, loading it on first use.
+
+    :return: WordlistSnapshot or enchant.Dict
+    """
+
+    global dictionary
+
+    if dictionary is None:
+        with dictionary_lock:
+            if dictionary is None:
+                dictionary = load_dictionary()
+
+    return dictionary
+
+
+def get_cache_directory():
+
+    """
+    Returns the directory compiled word lists and suggestion indexes are kept in.
+
+    :return: str
+    """
+
+    if config.CACHE_DIRECTORY:
+        return config.CACHE_DIRECTORY
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "spellchecker")
+
+
+def get_word_list():
+
+    """
+    Returns config.WORD_LIST_FILE as a WordlistSnapshot, compiled into the cache directory on first use,
+    so later runs map it instead of parsing it. Returns None if there is no word list, or if it can't
+    be compiled (e.g., the cache directory isn't writable).
+
+    :return: WordlistSnapshot or None
+    """
+
+    global word_list
+
+    if word_list is None:
+        with word_list_lock:
+            if word_list is None:
+                word_list = False
+
+                if config.WORD_LIST_FILE and os.path.isfile(config.WORD_LIST_FILE):
+                    try:
+                        word_list = load_word_file(config.WORD_LIST_FILE, get_cache_directory())
+                    except (OSError, IOError, ValueError):
+                        pass  # the word list is read as it is instead
+
+    return word_list or None
+
+
+def get_word_source():
+
+    """
+    Returns the word source used to split compound words. A word list snapshot is used directly, and
+    so is config.WORD_LIST_FILE once compiled (see get_word_list). If it can't be compiled, a WordTrie
+    is built from it, and if there is no word list at all, we fall back to probing the dictionary.
+
+    :return: WordlistSnapshot, WordTrie or DictionaryWordSource
+    """
+
+    global word_source
+
+    if word_source is None:
+        with word_source_lock:
+            if word_source is None:
+                words = get_dictionary()
+                if isinstance(words, WordlistSnapshot):
+                    word_source = words
+                elif get_word_list() is not None:
+                    word_source = get_word_list()
+                elif config.WORD_LIST_FILE and os.path.isfile(config.WORD_LIST_FILE):
+                    word_source = WordTrie.from_file(config.WORD_LIST_FILE)
+                else:
+                    word_source = DictionaryWordSource(words)
+
+    return word_source
+
+
+def get_vocabulary_words():
+
+    """
+    Returns the words of the active vocabulary: the word list snapshot, or else config.WORD_LIST_FILE.
+    Returns None if neither is available (an enchant dictionary can't be enumerated).
+
+    :return: WordlistSnapshot, [str] or None
+    """
+
+    words = get_dictionary()
+
+    if isinstance(words, WordlistSnapshot):
+        return words
+    elif get_word_list() is not None:
+        return get_word_list()
+    elif config.WORD_LIST_FILE and os.path.isfile(config.WORD_LIST_FILE):
+        return list(read_word_file(config.WORD_LIST_FILE))
+    return None
+
+
+def get_bloom_filter():
+
+    """
+    Returns a BloomFilter over the active vocabulary (the word list snapshot, or else
+    config.WORD_LIST_FILE), building it on first use. Returns None if the filter is disabled
+    or there is no word list to build it from. It is also refused, with a warning, if it couldn't
+    spare a single lookup: when checking with enchant rather than a snapshot, its rejections aren't
+    definitive, so unless config.BLOOM_FILTER_TRUST_POSITIVES is set, every word is looked up anyway.
+
+    :return: BloomFilter or None
+    """
+
+    global bloom_filter
+
+    if bloom_filter is None and config.BLOOM_FILTER_ENABLED:
+        with bloom_filter_lock:
+            if bloom_filter is None:
+                if not config.BLOOM_FILTER_TRUST_POSITIVES and not isinstance(get_dictionary(), WordlistSnapshot):
+                    print("Not using the Bloom filter: without a word list snapshot (WORDLIST_SNAPSHOT_FILE) or "
+                          "BLOOM_FILTER_TRUST_POSITIVES, every word would still be looked up in the dictionary.")
+                    bloom_filter = False
+                    return None
+
+                words = get_vocabulary_words()
+                if words is None:
+                    return None
+
+                from common.bloom_filter import BloomFilter  # hashlib and mmap are only needed with a filter
+                new_filter = BloomFilter(len(words), config.BLOOM_FILTER_FALSE_POSITIVE_RATE,
+                                         config.BLOOM_FILTER_MAX_BYTES)
+                for word in words:
+                    new_filter.add(word)
+                bloom_filter = new_filter
+
+    return bloom_filter or None
+
+
+def get_suggestion_index():
+
+    """
+    Returns a SuggestionIndex over the active vocabulary, building it on first use. Returns None if
+    suggestions are disabled or there is no word list to build it from. The index of a snapshot (or of the
+    compiled WORD_LIST_FILE) is only built once, into the cache directory, and mapped by later runs.
+
+    :return: SuggestionIndex or None
+    """
+
+    global suggestion_index
+
+    if suggestion_index is None and config.SUGGESTIONS_ENABLED:
+        with suggestion_index_lock:
+            if suggestion_index is None:
+                words = get_vocabulary_words()
+                if words is None:
+                    return None
+
+                if isinstance(words, WordlistSnapshot):
+                    try:
+                        suggestion_index = load_suggestion_file(words, get_cache_directory(),
+                                                                config.SUGGESTION_MAX_DISTANCE)
+                    except (OSError, IOError, ValueError):
+                        pass  # built in memory instead
+
+                if suggestion_index is None:
+                    suggestion_index = SuggestionIndex(words, config.SUGGESTION_MAX_DISTANCE)
+
+    return suggestion_index
+
+
+def prepare_checker():
+
+    """
+    Builds lazily-initialized lookup structures now, e.g. before forking worker processes,
+    so that they are built once and shared rather than rebuilt by every process.
+    """
+
+    get_dictionary()
+    get_word_source()
+    get_bloom_filter()
+
+
+def is_dictionary_word(word):
+
+    """
+    Returns true if the dictionary contains word. When the Bloom filter is enabled, words it
+    rejects skip the dictionary lookup if the filter was built from the dictionary itself (a
+    snapshot), and words it accepts skip it if config.BLOOM_FILTER_TRUST_POSITIVES is set.
+
+    :param word: str
+    :return: bool
+    """
+
+    words = get_dictionary()
+    prefilter = get_bloom_filter()
+
+    if prefilter is not None:
+        if prefilter.might_contain(word):
+            if config.BLOOM_FILTER_TRUST_POSITIVES:
+                return True
+        elif isinstance(words, WordlistSnapshot):
+            return False  # definitely not a dictionary word
+
+    return words.check(word)
+
+
+def checker_counts():
+
+    """
+    Returns this process's counters of verdict cache use.
+
+    :return: dict
+    """
+
+    return {
+        "cache_hits": verdict_cache.hits,
+        "cache_misses": verdict_cache.misses
+    }
+
+
+def checker_signature(word_allowlist=None):
+
+    """
+    Describes the settings that determine which words are flagged, so that stored
+    results can be discarded when any of them change.
+
+    :param word_allowlist: Allowlist or None, defaults to the project's allowlist
+    :return: str
+    """
+
+    word_allowlist = allowlist if word_allowlist is None else word_allowlist
+    return "|".join([get_dictionary().tag, str(config.MAX_COMPOUND_PARTS), str(config.WORD_LIST_FILE),
+                     str(config.BLOOM_FILTER_ENABLED and config.BLOOM_FILTER_TRUST_POSITIVES), word_allowlist.tag])
 
 
 def is_two_part_word(word):
@@ -236,31 +511,63 @@ def is_two_part_word(word):
     :return: bool
     """
 
-    # TODO - make more complex (N-part word, rather than 2-part word)
+    return is_compound_word(word, get_word_source(), 2)
+
+
+def is_n_part_word(word):
+
+    """
+    Returns true if input is composed of between two and config.MAX_COMPOUND_PARTS words.
+
+    :param word: str
+    :return: bool
+    """
 
-    for i in range(1, len(word)-1):
+    if config.PROFILE_STAGES:
+        compound_splits.count = getattr(compound_splits, "count", 0) + 1
 
-        left = word[0:i]
-        right = word[i:]
-        if d.check(left) and d.check(right):
-            # FIXME - hack implemented because Enchant views "l" as a valid word
-            if (len(left) == 1 and left != 'a') or (len(right) == 1 and right != 'a'):
-                continue
-            return True
-    return False
+    return is_compound_word(word, get_word_source(), config.MAX_COMPOUND_PARTS)
 
 
-def is_spelling_error(word):
+def take_compound_split_count():
+
+    """
+    Returns the number of is_n_part_word calls made by the current thread since the last call,
+    if config.PROFILE_STAGES is set. Each worker thread (or process) thus counts its own, without a lock.
+
+    :return: int
+    """
+
+    count = getattr(compound_splits, "count", 0)
+    compound_splits.count = 0
+    return count
+
+
+def is_spelling_error(word, word_allowlist=None):
 
     """
     Returns true if the word seems to be misspelled; this is determined
-    by the user-specified languages.
+    by the user-specified languages. Words the allowlist allows are never misspelled, and
+    are accepted before the dictionary is asked; the verdict cache only holds the dictionary's
+    verdicts, so that it can be shared by projects with different allowlists.
 
     :param word: str
+    :param word_allowlist: Allowlist or None, defaults to the project's allowlist
     :return: bool
     """
 
     # TODO - use users language selection when assessing spelling correctness
 
-    return word and not d.check(word.upper()) and not keyword.iskeyword(word) and not is_two_part_word(word)
+    if not word or (allowlist if word_allowlist is None else word_allowlist).allows(word):
+        return False
+
+    # keyed on the token itself, since keyword.iskeyword and the compound check are case-sensitive
+    verdict = verdict_cache.get(word)
+
+    if verdict is None:
+        from keyword import iskeyword  # only looked up on cache misses, which query the dictionary anyway
+        verdict = not is_dictionary_word(word.upper()) and not iskeyword(word) and not is_n_part_word(word)
+        verdict_cache.put(word, verdict)
+
+    return verdict
 
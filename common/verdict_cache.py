@@ -0,0 +1,91 @@
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class VerdictCache:
+
+    def __init__(self, max_size):
+
+        """
+        Takes the maximum number of verdicts to remember. Least recently used verdicts are evicted first.
+
+        :param max_size: int
+        """
+
+        self.__max_size = max_size
+        self.__verdicts = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = Lock()
+
+    @property
+    def max_size(self):
+        return self.__max_size
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__verdicts)
+
+    def get(self, word):
+
+        """
+        Returns the cached verdict for word, or None if it has not been seen (or was evicted).
+
+        :param word: str
+        :return: bool or None
+        """
+
+        with self.__lock:
+            verdict = self.__verdicts.pop(word, None)
+
+            if verdict is None:
+                self.__misses += 1
+                return None
+
+            self.__verdicts[word] = verdict  # re-insert as most recently used
+            self.__hits += 1
+            return verdict
+
+    def put(self, word, verdict):
+
+        """
+        Remembers verdict for word, evicting the least recently used entry when full.
+
+        :param word: str
+        :param verdict: bool
+        """
+
+        if self.__max_size <= 0:
+            return
+
+        with self.__lock:
+            self.__verdicts.pop(word, None)
+            self.__verdicts[word] = verdict
+
+            if len(self.__verdicts) > self.__max_size:
+                self.__verdicts.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__verdicts.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def hit_rate(self):
+
+        """
+        Fraction of lookups answered from the cache.
+
+        :return: float
+        """
+
+        lookups = self.__hits + self.__misses
+        return float(self.__hits) / lookups if lookups else 0.0
@@ -0,0 +1,187 @@
+
+"""
+Prefix tree over a word list, used to split identifiers such as "filereader" into dictionary words
+without probing the spelling dictionary once per split point.
+"""
+
+import io
+
+_END = ""  # key marking that the path leading to a node spells a complete word
+
+
+class WordTrie:
+
+    def __init__(self, words=()):
+
+        """
+        Takes an iterable of words; every word is stored lower-cased.
+
+        :param words: iterable of str
+        """
+
+        self.__root = {}
+        self.__size = 0
+
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return self.__size
+
+    def __contains__(self, word):
+        node = self.__root
+        for char in word.lower():
+            node = node.get(char)
+            if node is None:
+                return False
+        return _END in node
+
+    @classmethod
+    def from_file(cls, path):
+
+        """
+        Builds a trie from a file containing one word per line. Entries with non-alphabetic
+        characters (e.g., possessives) are skipped.
+
+        :param path: str
+        :return: WordTrie
+        """
+
+        with io.open(path, "r", encoding="utf-8", errors="ignore") as word_file:
+            return cls(line.strip() for line in word_file if line.strip().isalpha())
+
+    def add(self, word):
+
+        """
+        Adds word to the trie.
+
+        :param word: str
+        """
+
+        node = self.__root
+        for char in word.lower():
+            node = node.setdefault(char, {})
+
+        if _END not in node:
+            node[_END] = True
+            self.__size += 1
+
+    def word_ends(self, word, start):
+
+        """
+        Yields every end index such that word[start:end] is a known word, walking the trie once.
+
+        :param word: str, expected to be lower-cased
+        :param start: int
+        :return: generator of int
+        """
+
+        node = self.__root
+        for end in range(start, len(word)):
+            node = node.get(word[end])
+            if node is None:
+                return
+            if _END in node:
+                yield end + 1
+
+
+class DictionaryWordSource:
+
+    def __init__(self, dictionary):
+
+        """
+        Adapts a spelling dictionary (anything with a check method) to the word_ends interface of WordTrie.
+        Used when no word list is available to build a trie from.
+
+        :param dictionary: enchant.Dict
+        """
+
+        self.dictionary = dictionary
+
+    def word_ends(self, word, start):
+        for end in range(start + 1, len(word) + 1):
+            if self.dictionary.check(word[start:end]):
+                yield end
+
+    def is_compound_word(self, word, max_parts):
+
+        """
+        As is_compound_word, but probing the dictionary as little as possible, since each probe is a
+        dictionary lookup rather than a step down a trie. The positions where the last part can start
+        are found first, and only parts leading to one of them are probed: a word that has none costs
+        len(word) - 1 probes, and a split into two parts at most one more probe per such position.
+
+        :param word: str, expected to be lower-cased
+        :param max_parts: int
+        :return: bool
+        """
+
+        length = len(word)
+        probes = {}
+        splits = {}
+
+        def is_part(start, end):
+            if end - start == 1 and word[start] != "a":
+                return False  # FIXME - hack implemented because Enchant views "l" as a valid word
+            if (start, end) not in probes:
+                probes[(start, end)] = self.dictionary.check(word[start:end])
+            return probes[(start, end)]
+
+        last_starts = [start for start in range(1, length) if is_part(start, length)]
+        if not last_starts:
+            return False
+        last_start_set = set(last_starts)
+
+        def part_ends(start, parts_left):
+            if parts_left == 1:
+                return [end for end in last_starts if end > start]  # the next part must be the last one
+            return range(start + 1, last_starts[-1] + 1)
+
+        def can_finish(start, parts_left):
+            if (start, parts_left) not in splits:
+                splits[(start, parts_left)] = start in last_start_set or parts_left > 1 and any(
+                    is_part(start, end) and can_finish(end, parts_left - 1) for end in part_ends(start, parts_left - 1))
+            return splits[(start, parts_left)]
+
+        return any(is_part(0, end) and can_finish(end, max_parts - 1) for end in part_ends(0, max_parts - 1))
+
+
+def is_compound_word(word, word_source, max_parts):
+
+    """
+    Returns true if word can be split into between 2 and max_parts known words. Single-letter parts
+    are only accepted if they are "a", since dictionaries treat most single letters as valid words.
+
+    Positions are visited left to right, and for each one we remember (as a bitmask) how many parts
+    it takes to reach it, so every suffix is only walked once no matter how many ways lead to it.
+
+    :param word: str
+    :param word_source: WordTrie or DictionaryWordSource
+    :param max_parts: int
+    :return: bool
+    """
+
+    word = word.lower()
+    length = len(word)
+
+    if max_parts < 2 or length < 2:
+        return False
+
+    if isinstance(word_source, DictionaryWordSource):
+        return word_source.is_compound_word(word, max_parts)
+
+    all_counts = (1 << (max_parts + 1)) - 1
+    reachable = [0] * (length + 1)
+    reachable[0] = 1  # bit k set means the position can be reached with exactly k parts
+
+    for start in range(length):
+        part_counts = reachable[start] & (all_counts >> 1)  # drop counts that cannot take another part
+        if not part_counts:
+            continue
+
+        for end in word_source.word_ends(word, start):
+            if end - start == 1 and word[start] != "a":
+                continue  # FIXME - hack implemented because Enchant views "l" as a valid word
+            reachable[end] |= (part_counts << 1) & all_counts
+
+    return reachable[length] >> 2 != 0  # at least two parts
@@ -0,0 +1,257 @@
+
+"""
+Precompiled word list snapshot: a single read-only file holding the union of several vocabularies
+(dictionary word lists, programming language keywords and builtins, project allowlists).
+
+The file is a sorted array of lower-cased UTF-8 words behind a table of offsets, so it is memory-mapped
+rather than parsed: loading takes milliseconds, lookups are binary searches, and worker processes share
+the same pages. A snapshot can replace the enchant dictionary entirely (see config.WORDLIST_SNAPSHOT_FILE).
+
+Build one with, e.g.,
+
+    python -m common.wordlist_snapshot words.snapshot --words /usr/share/dict/words --language python
+"""
+
+import io
+import os
+import mmap
+import struct
+import argparse
+import binascii
+
+from common.allowlist import Allowlist
+from langs.registry import LANGUAGE_EXTENSIONS, get_vocabulary
+
+MAGIC = b"SPWLIST1"
+HEADER = struct.Struct("<8sII20s")  # magic, word count, offset of the word data, SHA-1 of the word data
+OFFSET = struct.Struct("<I")
+
+
+def read_word_file(path):
+
+    """
+    Yields the words in a file with one word per line. Hunspell .dic files are supported too:
+    their count line is skipped and affix flags (after "/") are dropped, so only stems are included.
+
+    :param path: str
+    :return: generator of str
+    """
+
+    with io.open(path, "r", encoding="utf-8", errors="ignore") as word_file:
+        for line in word_file:
+            word = line.split("/", 1)[0].strip()
+            if word and not word.isdigit() and not word.startswith("#"):
+                yield word
+
+
+def build_snapshot(output_path, words):
+
+    """
+    Writes a snapshot containing every word given.
+
+    :param output_path: str
+    :param words: iterable of str
+    :return: int, the number of distinct words written
+    """
+
+    encoded_words = sorted(set(word.lower().encode("utf-8") for word in words))
+
+    offsets = []
+    position = 0
+    for word in encoded_words:
+        offsets.append(position)
+        position += len(word)
+    offsets.append(position)
+
+    data_offset = HEADER.size + OFFSET.size * len(offsets)
+    data = b"".join(encoded_words)
+
+    import hashlib  # only needed when compiling, not when reading a snapshot
+    temporary_path = output_path + "." + str(os.getpid()) + ".tmp"  # concurrent runs may compile the same file
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, len(encoded_words), data_offset, hashlib.sha1(data).digest()))
+        snapshot_file.write(struct.pack("<" + str(len(offsets)) + "I", *offsets))
+        snapshot_file.write(data)
+    os.replace(temporary_path, output_path)
+
+    return len(encoded_words)
+
+
+def load_word_file(word_path, cache_directory):
+
+    """
+    Returns a word file (see read_word_file) as a snapshot, compiling it into cache_directory the first
+    time it is used, and again whenever the word file changes. Raises OSError if the snapshot can't be written.
+
+    :param word_path: str
+    :param cache_directory: str
+    :return: WordlistSnapshot
+    """
+
+    import hashlib
+
+    stat = os.stat(word_path)
+    version = "|".join([os.path.abspath(word_path), str(stat.st_mtime_ns), str(stat.st_size)])
+    snapshot_path = os.path.join(cache_directory,
+                                 "words-" + hashlib.sha1(version.encode("utf-8")).hexdigest()[:16] + ".snapshot")
+
+    if not os.path.isfile(snapshot_path):
+        os.makedirs(cache_directory, mode=0o700, exist_ok=True)
+        build_snapshot(snapshot_path, read_word_file(word_path))
+
+    return WordlistSnapshot(snapshot_path)
+
+
+class WordlistSnapshot:
+
+    def __init__(self, path):
+
+        """
+        Memory-maps the snapshot at path.
+
+        :param path: str
+        """
+
+        with open(path, "rb") as snapshot_file:
+            self.__data = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.__count, self.__data_offset, digest = HEADER.unpack_from(self.__data, 0)
+
+        if magic != MAGIC:
+            raise ValueError(repr(path) + " is not a word list snapshot")
+
+        self.__tag = "snapshot-" + binascii.hexlify(digest).decode("ascii")[:12]
+
+    @property
+    def tag(self):
+        return self.__tag  # identifies the vocabulary, like enchant.Dict.tag
+
+    def __len__(self):
+        return self.__count
+
+    def word_at(self, index):
+
+        """
+        Returns the encoded word at index in sorted order.
+
+        :param index: int
+        :return: bytes
+        """
+
+        start, end = struct.unpack_from("<2I", self.__data, HEADER.size + OFFSET.size * index)
+        return self.__data[self.__data_offset + start:self.__data_offset + end]
+
+    def lower_bound(self, key, lo=0, hi=None):
+
+        """
+        Returns the first index in [lo, hi) whose word is not less than key.
+
+        :param key: bytes
+        :param lo: int
+        :param hi: int
+        :return: int
+        """
+
+        hi = self.__count if hi is None else hi
+
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self.word_at(middle) < key:
+                lo = middle + 1
+            else:
+                hi = middle
+
+        return lo
+
+    def check(self, word):
+
+        """
+        Returns true if the snapshot contains word, ignoring case.
+
+        :param word: str
+        :return: bool
+        """
+
+        key = word.lower().encode("utf-8")
+        index = self.lower_bound(key)
+        return index < self.__count and self.word_at(index) == key
+
+    def __contains__(self, word):
+        return self.check(word)
+
+    def __iter__(self):
+        for index in range(self.__count):
+            yield self.word_at(index).decode("utf-8")
+
+    def word_ends(self, word, start):
+
+        """
+        Yields every end index such that word[start:end] is in the snapshot, narrowing the range of
+        words sharing the growing prefix instead of searching the whole array for each end.
+
+        :param word: str, expected to be lower-cased
+        :param start: int
+        :return: generator of int
+        """
+
+        lo, hi = 0, self.__count
+
+        for end in range(start + 1, len(word) + 1):
+            prefix = word[start:end].encode("utf-8")
+
+            lo = self.lower_bound(prefix, lo, hi)
+            if lo >= hi or not self.word_at(lo).startswith(prefix):
+                return
+
+            if self.word_at(lo) == prefix:
+                yield end
+
+    def close(self):
+        self.__data.close()
+
+
+def read_allowlist_words(path):
+
+    """
+    Returns the plain words of a project allowlist. Its patterns and path rules cannot be stored in a
+    snapshot, so they are skipped (the allowlist keeps applying them when it is loaded).
+
+    :param path: str
+    :return: set of str
+    """
+
+    allowlist = Allowlist(path)
+    if allowlist.patterns or allowlist.file_rules:
+        print("Skipping " + str(len(allowlist.patterns) + len(allowlist.file_rules)) + " pattern and path rules of " +
+              repr(path))
+    return allowlist.words
+
+
+def main():
+
+    """
+    Builds a snapshot from the command line.
+    """
+
+    parser = argparse.ArgumentParser(description="Compile word lists into a word list snapshot.")
+    parser.add_argument("output", help="path of the snapshot to write")
+    parser.add_argument("--words", action="append", default=[], help="word list or hunspell .dic file (repeatable)")
+    parser.add_argument("--language", action="append", default=[], choices=sorted(LANGUAGE_EXTENSIONS),
+                        help="include the keywords and builtins of this language (repeatable)")
+    parser.add_argument("--allowlist", action="append", default=[], help="project allowlist, of which only the plain "
+                                                                        "words are included (repeatable)")
+    arguments = parser.parse_args()
+
+    words = []
+    for path in arguments.words:
+        words.extend(read_word_file(path))
+    for path in arguments.allowlist:
+        words.extend(read_allowlist_words(path))
+    for language in arguments.language:
+        words.extend(get_vocabulary(language))
+
+    print("Wrote " + str(build_snapshot(arguments.output, words)) + " words to " + repr(arguments.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,48 @@
-global file_counter
-global total_file_count
-global spelling_error_counter
-
-file_counter = 0
-total_file_count = 0
-spelling_error_counter = 0
-
-UPPER_BOUND_PER_THREAD = 400  # chosen somewhat arbitrarily
 REVIEW_GROUP_SIZE = 15  # chosen to be the most errors that can easily be viewed at once
-STATUS_PRINT_INTERVAL = 10  # print status when the number of files read is divisible by this number
+REVIEW_POSITION_FILE = ".spellchecker_review.json"  # where interactive reviews save their position; None disables
+STATUS_PRINT_SECONDS = 1.0  # most frequent interval at which scan status is printed
 
+ENGINE = "thread"  # "thread", "process" or "async"; the process engine uses every core for CPU-bound checking,
+                   # and the async engine also overlaps slow (e.g., network file system) reads with checking
+WORKER_COUNT = None  # number of worker threads or processes; None uses one per CPU
+PROCESS_CHUNK_SIZE = 25  # files handed to a worker process at a time
+READ_CONCURRENCY = 32  # most files the async engine reads (and holds open) at once
+VERDICT_CACHE_SIZE = 100000  # most distinct words whose spelling verdict is remembered; 0 disables the cache
+WORD_LIST_FILE = "/usr/share/dict/words"  # one word per line; used to split compound words without calling enchant
+CACHE_DIRECTORY = None  # where WORD_LIST_FILE and suggestion indexes are compiled; None uses ~/.cache/spellchecker
+MAX_COMPOUND_PARTS = 3  # most dictionary words an identifier may be split into (e.g., "readfilename")
+SCAN_INDEX_FILE = None  # e.g. ".spellchecker_index.sqlite"; when set, results for unchanged files are reused
+PRUNED_DIRECTORIES = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".tox", ".nox", ".venv", "venv",
+                      ".mypy_cache", ".pytest_cache", "site-packages"}  # never searched
+RESPECT_GITIGNORE = False  # skip files matched by .gitignore files
+TEXT_ENCODING = "utf-8"  # encoding of the files searched
+DECODE_ERRORS = "surrogateescape"  # codecs error handler for undecodable bytes, e.g. "replace" or "strict" (skips the
+                                   # rest of the file, counted as a skipped file); "surrogateescape" keeps the bytes
+                                   # intact when fixes are written
+MAX_FILE_BYTES = 16 * 1024 * 1024  # larger files (e.g., generated or vendored) are skipped; None checks every file
+BINARY_SNIFF_BYTES = 4096  # files with a NUL byte among their first bytes are binary, and skipped
+PIPELINE_QUEUE_SIZE = 256  # most paths (or per-file results) waiting between pipeline stages
+MIN_WORD_FREQUENCY = 1  # words seen fewer times are not reviewed
+MAX_WORD_FREQUENCY = 5  # words seen this many times or more are assumed to be spelled intentionally; None disables
+MAX_DIRECTORY_FREQUENCY = None  # e.g. 3; words seen this often within one directory are assumed to be local jargon
+MAX_FILE_SPREAD = None  # e.g. 3; words found in this many files or more are assumed to be spelled intentionally
+SUGGESTIONS_ENABLED = True  # suggest corrections from the snapshot or WORD_LIST_FILE vocabulary during review
+SUGGESTION_MAX_DISTANCE = 1  # most edits between a word and its suggestions; 2 finds more, but uses far more memory
+MAX_SUGGESTIONS = 3  # suggestions kept per suspicious word
+RANK_BY_TYPO_SCORE = True  # review the likeliest typos (rare, in few files, not too short) first
+DICTIONARY_LANGUAGE = "en_US"  # enchant dictionary used when there is no word list snapshot
+ALLOWLIST_FILE = ".spellchecker_allowlist"  # per-project words, patterns and paths to accept (see common/allowlist.py)
+LEARN_SKIPPED_WORDS = False  # also add the words on a review page to the allowlist when it is skipped with 'n'
+WORDLIST_SNAPSHOT_FILE = None  # built with common/wordlist_snapshot.py; replaces the enchant dictionary when set
+BLOOM_FILTER_ENABLED = False  # prefilter dictionary lookups with a Bloom filter over the snapshot or WORD_LIST_FILE
+BLOOM_FILTER_FALSE_POSITIVE_RATE = 0.01  # chance that a word outside the vocabulary passes the filter
+BLOOM_FILTER_MAX_BYTES = 8 * 1024 * 1024  # memory budget; a smaller filter has a higher false positive rate
+BLOOM_FILTER_TRUST_POSITIVES = False  # accept words passing the filter without asking the dictionary
+PROFILE_STAGES = False  # time each stage of a scan and list the slowest files
+PROFILE_CPU = False  # also run cProfile in the consuming and worker threads (not in worker processes)
+PROFILE_MEMORY = False  # also trace allocations with tracemalloc, reporting the top allocation sites
+PROFILE_SLOWEST_FILES = 10  # slowest files listed in the profiling report
+PROFILE_TOP_FUNCTIONS = 20  # functions (or allocation sites) listed in the profiling report
+PROFILE_OUTPUT_FILE = None  # e.g. "scan.prof"; where cProfile stats are written, for pstats or snakeviz
+DAEMON_SOCKET_FILE = None  # Unix socket of spelling/spelling_daemon.py; None uses $XDG_RUNTIME_DIR/spellchecker.sock,
+                           # or else spellchecker.sock in a private spellchecker-<uid> directory of the temp dir
@@ -0,0 +1,37 @@
+
+"""
+Extracts prose from Markdown, skipping fenced code blocks and inline code spans.
+"""
+
+import re
+
+from langs.masking import URL_REGEX, mask
+
+FENCE_REGEX = re.compile(r"^\s*(```|~~~)")
+INLINE_CODE_REGEX = re.compile(r"`+[^`]*`+")
+
+
+def extract_text(readable_file):
+
+    """
+    Yields (line_number, column, text) for every line of prose. Code is replaced by spaces,
+    so columns refer to the original line.
+
+    :param readable_file: file
+    :return: generator of (int, int, str)
+    """
+
+    fence = None
+
+    for line_number, line in enumerate(readable_file, 1):
+        match = FENCE_REGEX.match(line)
+
+        if fence:
+            if match and match.group(1) == fence:
+                fence = None
+            continue
+        elif match:
+            fence = match.group(1)
+            continue
+
+        yield line_number, 0, URL_REGEX.sub(mask, INLINE_CODE_REGEX.sub(mask, line))
@@ -0,0 +1,21 @@
+
+"""
+Helpers shared by language modules for blanking out parts of a line that aren't prose (code, URLs,
+interpolations) while keeping the columns of the remaining text.
+"""
+
+import re
+
+URL_REGEX = re.compile(r"[(<]?https?://\S+")  # including the parenthesis or angle bracket of a link around it
+
+
+def mask(match):
+
+    """
+    Returns as many spaces as the match is long, for use with re.sub.
+
+    :param match: re.Match
+    :return: str
+    """
+
+    return " " * len(match.group())
@@ -0,0 +1,51 @@
+
+"""
+Extracts comments, docstrings and string literals from Python source using the tokenize module.
+
+VOCABULARY lists Python's keywords and builtins.
+"""
+
+import keyword
+import tokenize
+
+try:
+    import builtins
+except ImportError:
+    import __builtin__ as builtins
+
+VOCABULARY = sorted(set(keyword.kwlist) | set(name for name in dir(builtins) if not name.startswith("_")))
+
+# Python 3.12+ tokenizes f-strings into parts; only their literal text is worth checking
+TEXT_TOKEN_TYPES = set([tokenize.COMMENT, tokenize.STRING, getattr(tokenize, "FSTRING_MIDDLE", tokenize.STRING)])
+
+
+def extract_text(readable_file):
+
+    """
+    Yields (line_number, column, text) for every comment and string literal. Strings spanning
+    several lines are yielded one line at a time, so columns always refer to the original line.
+    If the file cannot be tokenized, the rest of it is yielded line by line.
+
+    :param readable_file: file
+    :return: generator of (int, int, str)
+    """
+
+    lines_read = []
+
+    def readline():
+        line = readable_file.readline()
+        lines_read.append(line)
+        return line
+
+    try:
+        for token_type, text, (row, column), _, _ in tokenize.generate_tokens(readline):
+            if token_type in TEXT_TOKEN_TYPES:
+                for offset, part in enumerate(text.split("\n")):
+                    if part:
+                        yield row + offset, column if offset == 0 else 0, part
+    except (tokenize.TokenError, SyntaxError):
+        # e.g., Python 2 code or a syntax error; fall back to checking the remaining lines
+        line_number = len(lines_read)
+        for line in readable_file:
+            line_number += 1
+            yield line_number, 0, line
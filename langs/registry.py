@@ -0,0 +1,118 @@
+
+"""
+Registry of the languages whose files are searched, the file extensions that belong to each, and the
+module which extracts the text worth checking (comments, docstrings, string literals, prose) from them.
+
+Each language module provides extract_text(readable_file), yielding (line_number, column, text) tuples,
+and optionally VOCABULARY, the words of the language (keywords, builtins) to include in word list
+snapshots. Modules are only imported once they are needed. Other modules can be added with register_language.
+"""
+
+import os.path
+import importlib
+
+LANGUAGE_EXTENSIONS = {}
+LANGUAGE_MODULES = {}
+
+EXTRACTORS = {}  # language -> extract_text function, filled in as languages are first used
+
+
+def register_language(language, extensions, module_name=None):
+
+    """
+    Associates file extensions (including the leading dot) with a language, and optionally
+    names the module which extracts its text. Without one, every line is checked.
+
+    :param language: str
+    :param extensions: [str]
+    :param module_name: str, e.g. "langs.python_lang"
+    """
+
+    LANGUAGE_EXTENSIONS.setdefault(language, [])
+
+    for extension in extensions:
+        if extension not in LANGUAGE_EXTENSIONS[language]:
+            LANGUAGE_EXTENSIONS[language].append(extension)
+
+    if module_name:
+        LANGUAGE_MODULES[language] = module_name
+        EXTRACTORS.pop(language, None)
+
+
+def registered_extensions():
+
+    """
+    Returns every registered file extension.
+
+    :return: set of str
+    """
+
+    return set(extension for extensions in LANGUAGE_EXTENSIONS.values() for extension in extensions)
+
+
+def language_for_path(path):
+
+    """
+    Returns the language registered for the path's extension, or None.
+
+    :param path: str
+    :return: str or None
+    """
+
+    extension = os.path.splitext(path)[1]
+
+    for language, extensions in LANGUAGE_EXTENSIONS.items():
+        if extension in extensions:
+            return language
+    return None
+
+
+def extract_all_text(readable_file):
+
+    """
+    Yields every line, for files without a language-specific extractor.
+
+    :param readable_file: file
+    :return: generator of (int, int, str)
+    """
+
+    for line_number, line in enumerate(readable_file, 1):
+        yield line_number, 0, line
+
+
+def get_vocabulary(language):
+
+    """
+    Returns the words (keywords, builtins, ...) that the language module lists as valid, if any.
+
+    :param language: str
+    :return: [str]
+    """
+
+    module_name = LANGUAGE_MODULES.get(language)
+    return list(getattr(importlib.import_module(module_name), "VOCABULARY", [])) if module_name else []
+
+
+def get_extractor(language):
+
+    """
+    Returns the extract_text function of the language, importing its module on first use.
+
+    :param language: str or None
+    :return: function
+    """
+
+    extractor = EXTRACTORS.get(language)
+
+    if extractor is None:
+        module_name = LANGUAGE_MODULES.get(language)
+        extractor = importlib.import_module(module_name).extract_text if module_name else extract_all_text
+        EXTRACTORS[language] = extractor
+
+    return extractor
+
+
+register_language("python", [".py"], "langs.python_lang")
+register_language("rst", [".rst"], "langs.rst_lang")
+register_language("markdown", [".md", ".markdown"], "langs.markdown_lang")
+register_language("ruby", [".rb"], "langs.ruby_lang")
@@ -0,0 +1,46 @@
+
+"""
+Extracts prose from reStructuredText, skipping literal blocks, code directives and inline literals.
+"""
+
+import re
+
+from langs.masking import URL_REGEX, mask
+
+CODE_DIRECTIVE_REGEX = re.compile(r"^\s*\.\. (code|code-block|sourcecode|literalinclude|math|testcode|doctest)::")
+INLINE_LITERAL_REGEX = re.compile(r"``[^`]+``|:\w+:`[^`]*`")
+
+
+def indentation(line):
+    return len(line) - len(line.lstrip())
+
+
+def extract_text(readable_file):
+
+    """
+    Yields (line_number, column, text) for every line of prose. A block is skipped when it follows
+    a line ending in "::" or a code directive, and lasts while lines are indented more deeply.
+
+    :param readable_file: file
+    :return: generator of (int, int, str)
+    """
+
+    block_indentation = None  # indentation of the line introducing the literal block being skipped
+
+    for line_number, line in enumerate(readable_file, 1):
+        if not line.strip():
+            continue
+
+        if block_indentation is not None:
+            if indentation(line) > block_indentation:
+                continue
+            block_indentation = None
+
+        if CODE_DIRECTIVE_REGEX.match(line):
+            block_indentation = indentation(line)
+            continue
+
+        if line.rstrip().endswith("::"):
+            block_indentation = indentation(line)
+
+        yield line_number, 0, URL_REGEX.sub(mask, INLINE_LITERAL_REGEX.sub(mask, line))
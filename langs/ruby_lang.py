@@ -1,11 +1,79 @@
 
 """
--- TODO --
+Extracts comments and string literals from Ruby source.
 
-The idea is to support multiple languages.
+VOCABULARY lists Ruby's keywords and common builtin methods. Users can compile the union of English,
+Ruby, Python, ... into a word list snapshot (see common/wordlist_snapshot.py), which is then used to
+assess spelling of each file that is read.
+"""
+
+import re
+
+from langs.masking import mask
+
+VOCABULARY = [
+    "alias", "and", "begin", "break", "case", "class", "def", "defined", "do", "else", "elsif", "end", "ensure",
+    "false", "for", "if", "in", "module", "next", "nil", "not", "or", "redo", "rescue", "retry", "return", "self",
+    "super", "then", "true", "undef", "unless", "until", "when", "while", "yield", "attr", "accessor", "reader",
+    "writer", "puts", "gsub", "chomp", "chop", "lstrip", "rstrip", "downcase", "upcase", "capitalize", "inspect",
+    "succ", "nokogiri", "rspec", "rakefile", "gemfile", "gemspec", "rubygems", "irb", "erb", "lambda", "proc",
+    "initialize", "require", "eql", "hash", "freeze", "dup", "sym", "argv", "stdin", "stdout", "stderr"
+]
+
+INTERPOLATION_REGEX = re.compile(r"#\{[^}]*\}")
+
+
+def extract_line_text(line):
+
+    """
+    Yields (column, text) for the comment and the single-line string literals in a line of code.
+
+    :param line: str
+    :return: generator of (int, str)
+    """
+
+    quote = None
+    start = 0
+    index = 0
+
+    while index < len(line):
+        char = line[index]
+
+        if quote:
+            if char == "\\":
+                index += 1  # skip the escaped character
+            elif char == quote:
+                yield start, INTERPOLATION_REGEX.sub(mask, line[start:index]) if quote == '"' else line[start:index]
+                quote = None
+        elif char in "\"'":
+            quote = char
+            start = index + 1
+        elif char == "#":
+            yield index + 1, line[index + 1:]
+            return
+
+        index += 1
+
+
+def extract_text(readable_file):
+
+    """
+    Yields (line_number, column, text) for every comment, =begin/=end block and string literal.
+
+    :param readable_file: file
+    :return: generator of (int, int, str)
+    """
 
-Users can specify which languages they would like to add to the "valid word list".
+    within_block_comment = False
 
-For example, if a user specifies Ruby, Python, and English - then the set union of
-these languages will be used to assess spelling of each file that is read.
-"""
\ No newline at end of file
+    for line_number, line in enumerate(readable_file, 1):
+        if within_block_comment:
+            if line.startswith("=end"):
+                within_block_comment = False
+            else:
+                yield line_number, 0, line
+        elif line.startswith("=begin"):
+            within_block_comment = True
+        else:
+            for column, text in extract_line_text(line):
+                yield line_number, column, text
@@ -2,72 +2,219 @@
 """
 Command-line spellchecker.
 
-NOTE: Program assumes that entirety of search can fit into memory; this assumption may not cover your use-case.
+Run without arguments for an interactive review session, or pass paths (see --help) for a headless
+run that writes JSON Lines or SARIF and exits non-zero when new suspicious words are found. With
+--diff, only the lines changed since a git revision are checked.
+
+Files are discovered, checked and grouped as a stream; only the occurrences of suspicious words which
+survive filtering are kept in memory.
 """
 
+import sys
 import time
-import copy
 import os.path
+import argparse
+
+from collections import deque
+from contextlib import redirect_stdout
 
 import config.config as config
+import common.profiling as profiling
 import common.utils as utils
 
-from spelling.spelling_worker import SpellingWorker
+from common.fix_queue import FixQueue
+from common.output_formats import WRITERS, read_baseline
+from common.profiling import ScanProfile
+from common.review_session import ReviewSession, load_position, save_position
+from common.scan_metrics import ScanMetrics
+from common.suggestion_index import match_case
+from common.file_discovery import iter_files_in_path
+from langs.registry import LANGUAGE_EXTENSIONS, registered_extensions
+from spelling.spelling_pipeline import iter_file_results_in_threads
 
 
 # TODO - make python 2/3 friendly
 
 
-def discover_spelling_errors(files):
+pending_fixes = FixQueue()  # corrections accepted during review
 
-    """
-    Creates SpellingWorker(s) to assess the spelling of the all files in the user-specified path.
+# what to do after reviewing a page (see review_spelling_error_group_list)
+REVIEW_NEXT = "next"
+REVIEW_BACK = "back"
+REVIEW_JUMP = "jump"
+REVIEW_QUIT = "quit"
+
+
+def discover_spelling_errors(files, engine=None, metrics=None, line_filters=None):
 
-    :param files: [str]
+    """
+    Assesses the spelling of the all files in the user-specified path, either with
+    SpellingWorker threads or with a pool of worker processes (optionally fed by
+    asynchronous reads). If config.SCAN_INDEX_FILE
+    is set, files which haven't changed since the last scan are not read again. If profiling
+    is enabled (see common/profiling.py), a report is printed after the summary.
+
+    :param files: iterable of str
+    :param engine: str, "thread", "process" or "async"; defaults to config.ENGINE
+    :param metrics: ScanMetrics, to collect statistics in; a new one is used by default
+    :param line_filters: dict or None, the lines to check per file (see SpellingWorker.line_filters)
     :return: [SpellingErrorGroup]
     """
 
-    config.file_counter = 1
-    config.spelling_error_counter = 0
-    config.total_file_count = len(files)
+    index = None
+
+    if config.SCAN_INDEX_FILE:
+        from common.scan_index import ScanIndex  # sqlite3 is only imported when an index is used
+        index = ScanIndex(config.SCAN_INDEX_FILE, utils.checker_signature())
+
+    metrics = metrics or ScanMetrics()
+    profile = ScanProfile() if profiling.is_enabled() else None
+
+    # threads share the parent's verdict cache; worker processes report their own use per file
+    checker_counts = utils.checker_counts()
+
+    if profile:
+        profile.start()
+
+    try:
+        start_time = time.perf_counter()
+        spelling_error_group_list = utils.consolidate_spelling_errors(
+            iter_spelling_errors(files, engine or config.ENGINE, metrics, index, profile, line_filters))
+
+        if profile:
+            # the rest of the time the consuming thread spent was waiting for the workers' results
+            profile.stage_seconds["consolidation"] += time.perf_counter() - start_time - \
+                profile.stage_seconds["waiting for results"]
+    finally:
+        if index:
+            metrics.reused_file_count = index.reused_file_count
+            index.close()
+        if profile:
+            profile.stop()
+
+    for name, value in utils.checker_counts().items():
+        metrics.counts[name] += value - checker_counts[name]
+
+    print("\n" + metrics.summary())
+
+    if profile:
+        print(profile.report(metrics.counts))
+
+    return spelling_error_group_list
+
+
+def iter_spelling_errors(files, engine, metrics, index=None, profile=None, line_filters=None):
+
+    """
+    Streams the SpellingErrors found in files, printing status updates along the way.
+
+    :param files: iterable of str
+    :param engine: str, "thread", "process" or "async"
+    :param metrics: ScanMetrics
+    :param index: ScanIndex or None
+    :param profile: ScanProfile or None
+    :param line_filters: dict or None, see SpellingWorker.line_filters
+    :return: generator of SpellingError
+    """
+
+    reused_errors = deque()
+
+    if profile:
+        files = profile.timed_iter(files, "discovery")
+
+    if index:
+        files = index.iter_changed_files(files, reused_errors)
+
+    if utils.allowlist.file_rules:
+        files = (file for file in files if not utils.allowlist.ignores_file(file))
 
-    start_time_epoch_seconds = time.time()
-    workers = []
-    spelling_errors = []
+    files = count_files(files, metrics)
 
-    for i in range(0, len(files), config.UPPER_BOUND_PER_THREAD):
+    # the other engines import multiprocessing and asyncio, so they are only imported when chosen
+    if engine == "process":
+        from spelling.spelling_process_pool import iter_file_results_in_processes
+        file_results = iter_file_results_in_processes(files, fingerprint_files=index is not None,
+                                                      line_filters=line_filters)
+    elif engine == "async":
+        from spelling.spelling_async_reader import iter_file_results_with_async_reads
+        file_results = iter_file_results_with_async_reads(files, fingerprint_files=index is not None,
+                                                          line_filters=line_filters)
+    else:
+        file_results = iter_file_results_in_threads(files, fingerprint_files=index is not None,
+                                                    line_filters=line_filters)
 
-        # give each thread a set number of files
-        worker = SpellingWorker(files[i:i+config.UPPER_BOUND_PER_THREAD], start_time_epoch_seconds)
+    if profile:
+        file_results = profile.timed_iter(file_results, "waiting for results")
 
-        workers.append(worker)
-        worker.start()
+    for file_path, spelling_errors, counts, fingerprint in file_results:
 
-    for worker in workers:
-        worker.join()
-        spelling_errors += copy.deepcopy(worker.spelling_errors)
+        if index and fingerprint:
+            index.store(file_path, spelling_errors, fingerprint)
 
-    for worker in workers:
-        del worker
+        metrics.add_file(len(spelling_errors), counts)
 
-    return utils.consolidate_spelling_errors(spelling_errors)
+        if profile:
+            profile.add_file(file_path, counts)
 
+        if metrics.should_print_status():
+            print(metrics.status())
 
-def review_spelling_error(spelling_error):
+        for spelling_error in spelling_errors:
+            yield spelling_error
+
+        while reused_errors:
+            metrics.add_reused_errors(1)
+            yield reused_errors.popleft()
+
+    while reused_errors:
+        metrics.add_reused_errors(1)
+        yield reused_errors.popleft()
+
+    print(metrics.status())
+
+
+def count_files(files, metrics):
+
+    """
+    Passes files through, counting them in metrics as they are discovered.
+
+    :param files: iterable of str
+    :param metrics: ScanMetrics
+    :return: generator of str
+    """
+
+    for file in files:
+        metrics.discovered_file_count += 1
+        yield file
+
+
+def review_spelling_error(spelling_error, suggestions=None):
 
     """
     Allows the user to review a single SpellingError. The, potentially-updated,
     SpellingError is returned so that the caller can be aware of the change.
 
     :param spelling_error: SpellingError
+    :param suggestions: [str] or None, corrections the user can pick by number
     :return SpellingError
     """
 
+    suggestions = [match_case(spelling_error.word, suggestion) for suggestion in suggestions or []]
+
     while True:
         print("\nThe suspect word, " + repr(spelling_error.word)
               + ", appears in \n\t" + repr(spelling_error.line.strip(" ")))
 
-        correction = ask_for_input("\nTell me how to fix, or enter 'n' to continue. >> ")
+        if suggestions:
+            print("\nSuggestions: " + ", ".join(str(index) + " -- " + suggestion
+                                                for index, suggestion in enumerate(suggestions)))
+            correction = ask_for_input("\nTell me how to fix, enter a suggestion's number, "
+                                       "or enter 'n' to continue. >> ")
+        else:
+            correction = ask_for_input("\nTell me how to fix, or enter 'n' to continue. >> ")
+
+        if correction.isdigit() and int(correction) < len(suggestions):
+            correction = suggestions[int(correction)]
 
         if correction.upper() == "N":
             return spelling_error
@@ -77,12 +224,7 @@ def review_spelling_error(spelling_error):
                                      + " with " + repr(correction) + ". Enter 'y' or 'n'. >> ")
 
             if verification.upper() == "Y":
-                utils.update_file(spelling_error, correction)
-
-                # update so as to not confuse user
-                spelling_error.line = spelling_error.line.replace(spelling_error.word, correction)
-                spelling_error.word = correction
-
+                correct_spelling_error(spelling_error, correction)
                 return spelling_error
             elif verification.upper() == "N":
                 print("\nOkay, I'll ask you again.\n")
@@ -90,6 +232,79 @@ def review_spelling_error(spelling_error):
                 print("\nI didn't understand your input. Please try again.\n---\n")
 
 
+def correct_spelling_error(spelling_error, correction):
+
+    """
+    Queues the correction of a SpellingError, which is written once the current page is reviewed.
+
+    :param spelling_error: SpellingError
+    :param correction: str
+    """
+
+    pending_fixes.add(spelling_error, correction)
+
+    # update so as to not confuse user
+    spelling_error.line = spelling_error.line.replace(spelling_error.word, correction)
+    spelling_error.word = correction
+
+
+def accept_top_suggestions(session):
+
+    """
+    Offers to replace every occurrence of each word on the page that hasn't been investigated with the
+    word's top suggestion. Accepted words are marked as investigated.
+
+    :param session: ReviewSession
+    """
+
+    replacements = [(index, group) for index, group in enumerate(session.page_groups())
+                    if not session.is_investigated(session.page_start + index) and group.suggestions]
+
+    if not replacements:
+        print("\nThere are no suggestions to accept.")
+        return
+
+    print("")
+    for index, group in replacements:
+        print(str(index) + " -- " + group.word + " -> " + group.suggestions[0])
+
+    verification = ask_for_input("\nReplace these words everywhere they appear? Enter 'y' or 'n'. >> ")
+
+    if verification.upper() == "Y":
+        for index, group in replacements:
+            for spelling_error in group.group:
+                correct_spelling_error(spelling_error, match_case(spelling_error.word, group.suggestions[0]))
+            session.mark_investigated(session.page_start + index)
+
+
+def learn_skipped_words(session, confirm=True):
+
+    """
+    Adds the words on the page that weren't investigated to the project's allowlist, so that
+    they aren't flagged again. Returns false if the user declines.
+
+    :param session: ReviewSession
+    :param confirm: bool, whether to list the words and ask first
+    :return: bool
+    """
+
+    words = [group.word for index, group in enumerate(session.page_groups())
+             if not session.is_investigated(session.page_start + index)]
+
+    if confirm:
+        verification = ask_for_input("\nAdd " + ", ".join(repr(word) for word in words) + " to "
+                                     + repr(config.ALLOWLIST_FILE) + ", so they are never flagged again? "
+                                     "Enter 'y' or 'n'. >> ")
+        if verification.upper() != "Y":
+            return False
+
+    learned_words = utils.allowlist.learn(words)
+
+    if learned_words:
+        print("\nAdded " + str(len(learned_words)) + " words to " + repr(config.ALLOWLIST_FILE) + ".")
+    return True
+
+
 def review_spelling_error_group(spelling_error_group):
 
     """
@@ -101,7 +316,8 @@ def review_spelling_error_group(spelling_error_group):
     """
 
     if len(spelling_error_group.group) == 1:
-        spelling_error_group.group = [review_spelling_error(spelling_error_group.group[0])]
+        spelling_error_group.group = [review_spelling_error(spelling_error_group.group[0],
+                                                            spelling_error_group.suggestions)]
         return spelling_error_group
 
     print("\n---\n\nYou chose to investigate " + repr(spelling_error_group.word) + ". Here are appearances of it...")
@@ -137,7 +353,8 @@ def review_spelling_error_group(spelling_error_group):
 
                             # update so as to not confuse user
                             spelling_error_group.group[selected_index] = \
-                                review_spelling_error(spelling_error_group.group[selected_index])
+                                review_spelling_error(spelling_error_group.group[selected_index],
+                                                      spelling_error_group.suggestions)
                         else:
                             utils.print_bound_message(str(len(spelling_error_group.group)-1))
 
@@ -145,94 +362,156 @@ def review_spelling_error_group(spelling_error_group):
                         utils.print_bound_message(str(len(spelling_error_group.group)-1))
 
 
-def review_spelling_error_group_list(words_seen, total_words, spelling_error_group_list):
+def review_spelling_error_group_list(session):
 
     """
-    Allows the user to review a SpellingErrorGroup list. The purpose is to segment
-    all SpellingErrorGroup(s) and review each segment through calls to this method.
-
-    Returns boolean regarding whether the program should backup.
+    Allows the user to review the current page of a ReviewSession, and returns what to do
+    next: REVIEW_NEXT, REVIEW_BACK, REVIEW_QUIT, or REVIEW_JUMP if the user moved to another page.
 
-    :param words_seen: int
-    :param total_words: int
-    :param spelling_error_group_list: [SpellingErrorGroup]
-    :return bool
+    :param session: ReviewSession
+    :return str
     """
 
-    investigated_indices = []
+    spelling_error_group_list = session.page_groups()
 
     while True:
 
         print("\n---")
-        utils.print_spelling_error_group_list(spelling_error_group_list, investigated_indices)
+        utils.print_spelling_error_group_list(spelling_error_group_list, session.investigated, session.page_start)
 
-        user_selection = ask_for_input("\nSeen " + str(words_seen)
-                                   + " words out of " + str(total_words)
-                                   + ". Enter number to investigate, 'b' to backup, or 'n' to skip. >> ")
+        user_selection = ask_for_input("\nSeen " + str(session.page_end) + " words out of " + str(len(session))
+                                       + " (page " + str(session.page + 1) + " of " + str(session.page_count)
+                                       + "). Enter number to investigate, 'a' to accept suggestions, '/' and a word "
+                                         "or prefix to find it, 'i' to always ignore the words not investigated, "
+                                         "'b' to backup, 'q' to stop for now, or 'n' to skip. >> ")
 
         if user_selection.upper() == "N":
-            return False  # user has completed review
+            if config.LEARN_SKIPPED_WORDS:
+                learn_skipped_words(session, confirm=False)
+            return REVIEW_NEXT  # user has completed review
+        elif user_selection.upper() == "I":
+            if learn_skipped_words(session):
+                return REVIEW_NEXT
         elif user_selection.upper() == "B":
-            return True
+            return REVIEW_BACK
+        elif user_selection.upper() == "Q":
+            return REVIEW_QUIT
+        elif user_selection.upper() == "A":
+            accept_top_suggestions(session)
+        elif user_selection.startswith("/"):
+            found_index = session.find(user_selection[1:].strip())
+
+            if found_index is None:
+                print("\nNo suspicious word starts with " + repr(user_selection[1:].strip()) + ".")
+            else:
+                session.jump_to(found_index)
+                return REVIEW_JUMP
         else:
             if user_selection.isdigit():
 
                 selected_index = int(user_selection)
 
-                if 0 <= selected_index <= len(spelling_error_group_list):
+                if 0 <= selected_index < len(spelling_error_group_list):
 
                     # update so as to not confuse user
                     spelling_error_group_list[selected_index] = \
                         review_spelling_error_group(spelling_error_group_list[selected_index])
 
-                    investigated_indices.append(selected_index)
+                    session.mark_investigated(session.page_start + selected_index)
                 else:
                     utils.print_bound_message(str(len(spelling_error_group_list)-1))
             else:
                 utils.print_bound_message(str(len(spelling_error_group_list)-1))
 
 
-def review_spelling_errors(spelling_error_group_list):
+def review_spelling_errors(spelling_error_group_list, directory=None):
 
     """
     Allows the user to review a SpellingErrorGroup list. Effectively, all
-    spelling errors found in user-specified path.
+    spelling errors found in user-specified path. If the directory is given
+    and config.REVIEW_POSITION_FILE is set, the user can resume a review they
+    stopped, and the position is saved as they go.
 
     :param spelling_error_group_list: [SpellingErrorGroup]
+    :param directory: str or None
     """
 
-    spelling_error_index = 0
-    segmented_spelling_error_group = []
+    if not spelling_error_group_list:
+        return
 
-    while spelling_error_index < len(spelling_error_group_list):
-        segmented_spelling_error_group.append(spelling_error_group_list[spelling_error_index])
-        spelling_error_index += 1
+    session = ReviewSession(spelling_error_group_list, config.REVIEW_GROUP_SIZE)
+    resume_review(session, directory)
 
-        if len(segmented_spelling_error_group) >= config.REVIEW_GROUP_SIZE:
-            backup = review_spelling_error_group_list(spelling_error_index,
-                                                      len(spelling_error_group_list), segmented_spelling_error_group)
+    while True:
+        action = review_spelling_error_group_list(session)
+        apply_pending_fixes()
 
-            if backup:
-                spelling_error_index -= (2*config.REVIEW_GROUP_SIZE)
-                if spelling_error_index < 0:
-                    spelling_error_index = 0  # we should never have a negative indices
+        if action == REVIEW_BACK:
+            session.previous_page()
+        elif action == REVIEW_QUIT:
+            save_review_position(directory, session.position())
+            return
+        elif action == REVIEW_NEXT and not session.next_page():
+            save_review_position(directory, None)  # the review is complete
+            return
 
-            segmented_spelling_error_group = []
-        elif (len(spelling_error_group_list) - spelling_error_index) + len(segmented_spelling_error_group)\
-                < config.REVIEW_GROUP_SIZE:
-            backup = review_spelling_error_group_list(len(spelling_error_group_list),
-                                                      len(spelling_error_group_list),
-                                                      spelling_error_group_list[spelling_error_index-1:])
-            spelling_error_index = len(spelling_error_group_list)
+        save_review_position(directory, session.position())
 
-            if backup:
-                spelling_error_index -= (2*config.REVIEW_GROUP_SIZE)
-                if spelling_error_index < 0:
-                    spelling_error_index = 0  # we should never have a negative indices
-            else:
-                break
-            segmented_spelling_error_group = []
 
+def resume_review(session, directory):
+
+    """
+    Offers to continue from the position saved for the directory, if any.
+
+    :param session: ReviewSession
+    :param directory: str or None
+    """
+
+    if not (directory and config.REVIEW_POSITION_FILE):
+        return
+
+    position = load_position(config.REVIEW_POSITION_FILE, directory)
+
+    if not position or not position.get("word"):
+        return
+
+    verification = ask_for_input("\nResume the previous review of this directory at " + repr(position["word"])
+                                 + "? Enter 'y' or 'n'. >> ")
+
+    if verification.upper() == "Y" and not session.restore(position):
+        print("\n" + repr(position["word"]) + " isn't suspicious anymore. Starting from the beginning.")
+
+
+def save_review_position(directory, position):
+
+    """
+    Saves (or forgets, if position is None) how far the review of the directory got.
+
+    :param directory: str or None
+    :param position: dict or None
+    """
+
+    if directory and config.REVIEW_POSITION_FILE:
+        try:
+            save_position(config.REVIEW_POSITION_FILE, directory, position)
+        except (OSError, IOError) as error:
+            print("\nCouldn't save the review position: " + str(error))
+
+
+def apply_pending_fixes():
+
+    """
+    Writes all corrections accepted so far, rewriting each affected file once.
+    """
+
+    if len(pending_fixes):
+        try:
+            print("\nApplied " + str(pending_fixes.apply()) + " corrections.")
+        except Exception:
+            utils.print_error()
+
+        for file_path, error in pending_fixes.failures:
+            print("Couldn't correct " + repr(file_path) + ": " + str(error))
 
 
 def ask_for_input(output_to_user):
@@ -248,6 +527,7 @@ def ask_for_input(output_to_user):
     except NameError:
         return input(output_to_user)
 
+
 def main():
 
     """
@@ -263,9 +543,13 @@ def main():
                 break
             elif os.path.isdir(directory_input):
                 print("\nYou entered: " + repr(directory_input) + "\n")
-                files = utils.recursively_get_all_files_in_path(directory_input)
+                files = iter_files_in_path(directory_input)
                 spelling_error_group_list = discover_spelling_errors(files)
-                review_spelling_errors(spelling_error_group_list)
+
+                try:
+                    review_spelling_errors(spelling_error_group_list, directory_input)
+                finally:
+                    apply_pending_fixes()
             else:
                 print("\nI couldn't find the directory: " + repr(directory_input) + ". Try again.")
 
@@ -274,5 +558,124 @@ def main():
         print("\nExiting now...\n")
 
 
+def parse_arguments(arguments):
+
+    """
+    Parses command-line arguments for headless (non-interactive) runs.
+
+    :param arguments: [str]
+    :return: argparse.Namespace
+    """
+
+    parser = argparse.ArgumentParser(description="Search files for spelling errors without prompting. Exits with "
+                                                 "status 1 if suspicious words not in the baseline are found.")
+    parser.add_argument("paths", nargs="*", help="files or directories to search; with --diff, limits the diff")
+    parser.add_argument("--language", action="append", choices=sorted(LANGUAGE_EXTENSIONS),
+                        help="only search files of this language (repeatable)")
+    parser.add_argument("--extension", action="append", help="only search files with this extension, e.g. .md "
+                                                             "(repeatable)")
+    parser.add_argument("--engine", choices=["thread", "process", "async"], default=config.ENGINE)
+    parser.add_argument("--workers", type=int, default=config.WORKER_COUNT, help="number of worker threads or "
+                                                                                 "processes")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl", help="output format")
+    parser.add_argument("--index", default=config.SCAN_INDEX_FILE, help="scan index file used to skip "
+                                                                        "unchanged files")
+    parser.add_argument("--baseline", help="JSON Lines output of an earlier run; words listed there are not new")
+    parser.add_argument("--diff", metavar="REVISION", help="only check lines changed since this git revision, "
+                                                           "e.g. origin/main")
+    parser.add_argument("--profile", action="append", choices=["stages", "cpu", "memory"],
+                        help="report stage timings and the slowest files, plus cProfile or tracemalloc results "
+                             "(repeatable)")
+    parser.add_argument("--profile-output", default=config.PROFILE_OUTPUT_FILE, help="file to write cProfile "
+                                                                                     "stats to")
+
+    parsed_arguments = parser.parse_args(arguments)
+
+    if not parsed_arguments.paths and not parsed_arguments.diff:
+        parser.error("give at least one path, or --diff")
+
+    missing_paths = [path for path in parsed_arguments.paths if not os.path.exists(path)]
+    if missing_paths and not parsed_arguments.diff:  # with --diff, paths may name files deleted since
+        parser.error("no such file or directory: " + ", ".join(missing_paths))
+
+    return parsed_arguments
+
+
+def iter_files_in_paths(paths, extensions=None):
+
+    """
+    Yields the files to search within each path. Paths to files are searched regardless of their extension.
+
+    :param paths: [str]
+    :param extensions: set of str or None
+    :return: generator of str
+    """
+
+    for path in paths:
+        if os.path.isdir(path):
+            for file in iter_files_in_path(path, extensions):
+                yield file
+        elif os.path.isfile(path):
+            yield path
+        else:
+            sys.stderr.write("Skipping " + repr(path) + ", which doesn't exist.\n")
+
+
+def run_headless(arguments):
+
+    """
+    Searches the paths given on the command line and writes results in a machine-readable
+    format to stdout. Progress messages go to stderr. Returns the exit status.
+
+    :param arguments: argparse.Namespace
+    :return: int
+    """
+
+    extensions = set(arguments.extension or [])
+    for language in arguments.language or []:
+        extensions.update(LANGUAGE_EXTENSIONS[language])
+
+    config.WORKER_COUNT = arguments.workers
+    config.SCAN_INDEX_FILE = arguments.index
+
+    if arguments.diff:
+        import subprocess
+        from common.git_diff import changed_lines_since, iter_changed_files
+
+        try:
+            changed_lines = changed_lines_since(arguments.diff, arguments.paths)
+        except (OSError, subprocess.CalledProcessError) as error:
+            sys.stderr.write("Could not compute the diff since " + repr(arguments.diff) + ": " + str(error) + "\n")
+            return 2
+
+        config.SCAN_INDEX_FILE = None  # the index holds results for whole files
+        files = iter_changed_files(changed_lines, extensions or registered_extensions())
+    else:
+        changed_lines = None
+        files = iter_files_in_paths(arguments.paths, extensions or None)
+
+    if arguments.profile:
+        config.PROFILE_STAGES = True
+        config.PROFILE_CPU = "cpu" in arguments.profile
+        config.PROFILE_MEMORY = "memory" in arguments.profile
+        config.PROFILE_OUTPUT_FILE = arguments.profile_output
+
+    with redirect_stdout(sys.stderr):
+        spelling_error_group_list = discover_spelling_errors(files, arguments.engine, line_filters=changed_lines)
+
+    if arguments.baseline:
+        known = read_baseline(arguments.baseline)
+        for group in spelling_error_group_list:
+            group.group = [error for error in group.group if (error.file, error.word.lower()) not in known]
+        spelling_error_group_list = [group for group in spelling_error_group_list if group.group]
+
+    WRITERS[arguments.format](spelling_error_group_list, sys.stdout)
+
+    return 1 if spelling_error_group_list else 0
+
+
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 1:
+        sys.exit(run_headless(parse_arguments(sys.argv[1:])))
+    else:
+        main()
@@ -0,0 +1,136 @@
+
+"""
+Asynchronous reading stage, for file systems where latency rather than CPU dominates (e.g., NFS or SSHFS mounts).
+
+An asyncio event loop in a background thread keeps up to config.READ_CONCURRENCY reads in flight. Each read
+opens, reads and closes one file on a thread of the loop's executor and puts its contents on a bounded queue,
+from which a pool of worker processes checks them. Reading the next files thus overlaps with checking the
+previous ones, while no more than READ_CONCURRENCY file handles (or unqueued contents) are held at once.
+"""
+
+import asyncio
+import os.path
+
+import common.utils as utils
+import config.config as config
+
+from common.text_reader import open_text_file
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Thread
+from spelling.spelling_process_pool import check_contents_chunk, iter_file_results_in_processes
+
+
+_DONE = None  # placed on the queue once every file has been read
+
+
+def read_file_contents(file, fingerprint_files=False):
+
+    """
+    Returns the contents of file, or None if it is not a readable file or is skipped (see open_text_file),
+    and its fingerprint if fingerprint_files (see MappedTextFile.fingerprint).
+
+    :param file: str
+    :param fingerprint_files: bool
+    :return: (str or None, tuple or None)
+    """
+
+    if not (file and os.path.isfile(file)):
+        return None, None
+
+    try:
+        text_file = open_text_file(file)
+        if text_file is None:
+            return None, None
+
+        with text_file:
+            fingerprint = text_file.fingerprint() if fingerprint_files else None
+            return text_file.read(), fingerprint
+    except UnicodeDecodeError:
+        return None, None  # skipped, with config.DECODE_ERRORS = "strict"
+    except (IOError, OSError):
+        utils.print_error()
+        return None, None
+
+
+def read_into_queue(file, contents_queue, fingerprint_files=False):
+    contents, fingerprint = read_file_contents(file, fingerprint_files)
+    contents_queue.put((file, contents, fingerprint))  # blocks while the queue is full, holding back reads
+
+
+async def read_files(files, contents_queue, concurrency, fingerprint_files=False):
+
+    """
+    Reads every file with at most concurrency reads in flight, putting (file, contents, fingerprint)
+    on contents_queue.
+
+    :param files: iterable of str
+    :param contents_queue: Queue
+    :param concurrency: int
+    :param fingerprint_files: bool
+    """
+
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    reads = set()
+
+    def finish_read(read):
+        reads.discard(read)
+        slots.release()
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        for file in files:
+            await slots.acquire()
+            read = loop.run_in_executor(executor, read_into_queue, file, contents_queue, fingerprint_files)
+            reads.add(read)
+            read.add_done_callback(finish_read)
+
+        if reads:
+            await asyncio.wait(reads)
+
+
+def run_reader(files, contents_queue, concurrency, fingerprint_files=False):
+
+    """
+    Runs read_files on a new event loop, then signals that no more contents will follow.
+
+    :param files: iterable of str
+    :param contents_queue: Queue
+    :param concurrency: int
+    :param fingerprint_files: bool
+    """
+
+    try:
+        asyncio.run(read_files(files, contents_queue, concurrency, fingerprint_files))
+    except Exception:
+        utils.print_error()
+    finally:
+        contents_queue.put(_DONE)
+
+
+def iter_file_results_with_async_reads(files, worker_count=None, concurrency=None, fingerprint_files=False,
+                                       line_filters=None):
+
+    """
+    Reads files asynchronously and checks their contents using a pool of worker processes, yielding
+    each file with the SpellingErrors found in it, the counts described by SpellingBatchWorker.take_counts
+    and, if fingerprint_files, the fingerprint of the file read (see MappedTextFile.fingerprint).
+
+    :param files: iterable of str
+    :param worker_count: int, defaults to config.WORKER_COUNT (or the number of CPUs)
+    :param concurrency: int, defaults to config.READ_CONCURRENCY
+    :param fingerprint_files: bool
+    :param line_filters: dict or None, see SpellingWorker.line_filters
+    :return: generator of (str, [SpellingError], dict, tuple or None)
+    """
+
+    contents_queue = Queue(config.PIPELINE_QUEUE_SIZE)
+
+    reader = Thread(target=run_reader, args=(files, contents_queue, concurrency or config.READ_CONCURRENCY,
+                                             fingerprint_files))
+    reader.daemon = True
+    reader.start()
+
+    for result in iter_file_results_in_processes(iter(contents_queue.get, _DONE), worker_count,
+                                                 check_chunk=check_contents_chunk, line_filters=line_filters):
+        yield result
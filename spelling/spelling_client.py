@@ -0,0 +1,178 @@
+
+"""
+Thin client of the spellcheck daemon (see spelling/spelling_daemon.py).
+
+Only the standard library is imported, so that editor hooks and pre-commit runs start quickly:
+
+    python -m spelling.spelling_client check-files src/app.py README.md
+    echo "Some txet" | python -m spelling.spelling_client check-text --path notes.md
+"""
+
+import os
+import sys
+import json
+import socket
+import argparse
+import tempfile
+
+import config.config as config
+
+
+class DaemonError(Exception):
+    pass  # the daemon answered with a JSON-RPC error
+
+
+SOCKET_NAME = "spellchecker.sock"
+
+
+def default_socket_path():
+
+    """
+    Returns config.DAEMON_SOCKET_FILE, or else a socket in $XDG_RUNTIME_DIR, or else in a directory
+    of the temporary directory that only the current user may use (see private_socket_directory).
+
+    :return: str
+    """
+
+    if config.DAEMON_SOCKET_FILE:
+        return config.DAEMON_SOCKET_FILE
+
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], SOCKET_NAME)
+
+    user_id = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), "spellchecker-" + str(user_id), SOCKET_NAME)
+
+
+def private_socket_directory(socket_path):
+
+    """
+    Creates the directory of socket_path, only accessible to the current user, if it doesn't exist.
+    Raises OSError if it exists but belongs to another user, or other users may access it.
+
+    :param socket_path: str
+    """
+
+    directory = os.path.dirname(os.path.abspath(socket_path))
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory, 0o700)
+
+    if directory == os.environ.get("XDG_RUNTIME_DIR") or not hasattr(os, "getuid"):
+        return  # created by the session manager for this user
+
+    status = os.stat(directory)
+    if status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise OSError("Not using " + directory + " for the daemon's socket: it must belong to this user "
+                      "and be inaccessible to others (chmod 700)")
+
+
+def check_socket_owner(socket_path):
+
+    """
+    Raises OSError unless the socket belongs to the current user, so that requests (and the
+    contents of files sent with them) never reach another user's server.
+
+    :param socket_path: str
+    """
+
+    if hasattr(os, "getuid") and os.stat(socket_path).st_uid != os.getuid():
+        raise OSError("Not connecting to " + socket_path + ": it belongs to another user")
+
+
+def call(method, params=None, socket_path=None, timeout=60.0):
+
+    """
+    Calls a method of the daemon and returns its result. Raises OSError (e.g., ConnectionRefusedError)
+    if no daemon is listening, or the socket belongs to another user, and DaemonError if the call fails.
+
+    :param method: str
+    :param params: dict or None
+    :param socket_path: str or None, defaults to default_socket_path()
+    :param timeout: float
+    :return: object
+    """
+
+    socket_path = socket_path or default_socket_path()
+    check_socket_owner(socket_path)
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+
+    try:
+        connection.connect(socket_path)
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+        connection.sendall((json.dumps(request) + "\n").encode("utf-8"))
+
+        with connection.makefile("rb") as responses:
+            response = json.loads(responses.readline().decode("utf-8"))
+    finally:
+        connection.close()
+
+    if "error" in response:
+        raise DaemonError(response["error"]["message"])
+    return response["result"]
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(description="Check spelling through the spellcheck daemon. Exits with status 1 "
+                                                 "if suspicious words are found, and 2 if the daemon can't be reached.")
+    parser.add_argument("--socket", help="socket of the daemon")
+    subparsers = parser.add_subparsers(dest="method")
+    subparsers.required = True
+
+    check_text = subparsers.add_parser("check-text", help="check text read from stdin")
+    check_text.add_argument("--path", help="file name whose extension selects what to check, e.g. notes.md")
+
+    check_files = subparsers.add_parser("check-files", help="check files or directories")
+    check_files.add_argument("paths", nargs="+")
+
+    apply_fix = subparsers.add_parser("apply-fix", help="replace a word at a line and column of a file")
+    apply_fix.add_argument("path")
+    apply_fix.add_argument("line", type=int)
+    apply_fix.add_argument("column", type=int)
+    apply_fix.add_argument("word")
+    apply_fix.add_argument("correction")
+
+    subparsers.add_parser("stats", help="show the daemon's statistics")
+    subparsers.add_parser("shutdown", help="stop the daemon")
+
+    return parser.parse_args(arguments)
+
+
+def main():
+
+    """
+    Runs one call from the command line, writing its result as JSON Lines (one occurrence per line for checks).
+    """
+
+    arguments = parse_arguments(sys.argv[1:])
+    params = dict((name, value) for name, value in vars(arguments).items()
+                  if name not in ("socket", "method") and value is not None)
+
+    if arguments.method == "check-text":
+        params["text"] = sys.stdin.read()
+
+    # the daemon runs in another directory, and finds each file's project (and allowlist) from its absolute path
+    if "paths" in params:
+        params["paths"] = [os.path.abspath(path) for path in params["paths"]]
+    if "path" in params:
+        params["path"] = os.path.abspath(params["path"])
+
+    try:
+        result = call(arguments.method, params, arguments.socket)
+    except (OSError, DaemonError) as error:
+        sys.stderr.write("spellcheck daemon: " + str(error) + "\n")
+        return 2
+
+    if arguments.method.startswith("check-"):
+        for occurrence in result:
+            sys.stdout.write(json.dumps(occurrence, sort_keys=True) + "\n")
+        return 1 if result else 0
+
+    sys.stdout.write(json.dumps(result, sort_keys=True) + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,527 @@
+
+"""
+Long-running local spellcheck server, so that editors and pre-commit hooks don't pay for loading
+dictionaries, building the Bloom filter and suggestion index, and opening the scan index on every run.
+
+    python -m spelling.spelling_daemon [--socket PATH]
+
+Clients connect to a Unix socket (see spelling/spelling_client.py) and send JSON-RPC 2.0 requests,
+one JSON object per line; each request with an id is answered with one line. Methods:
+
+    check-text   {"text": str, "path": str (optional, its extension selects what to check)} -> [occurrence]
+    check-files  {"paths": [str]} -> [occurrence]
+    apply-fix    {"path": str, "line": int, "column": int, "word": str, "correction": str} -> {"applied": int}
+    stats        {} -> dict
+    shutdown     {} -> null
+
+Occurrences have the keys written by --format json (file, line, column, word and suggestions).
+Files are checked by the same SpellingWorker code as a scan, and share its verdict cache.
+
+One daemon serves every project of its user. Each file is checked against the allowlist (and scan
+index) of its project: the nearest directory above it holding config.ALLOWLIST_FILE or a .git
+directory. Allowlists are reloaded when their file changes.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import socket
+import argparse
+import threading
+import socketserver
+import contextlib
+
+import common.utils as utils
+import config.config as config
+
+from common.allowlist import Allowlist
+from common.fix_queue import apply_corrections
+from common.file_discovery import iter_files_in_path
+from common.scan_index import ScanIndex, file_stat
+from common.suggestion_index import match_case
+from spelling.spelling_client import default_socket_path, private_socket_directory
+from spelling.spelling_error import SpellingError
+from spelling.spelling_worker import SpellingWorker
+
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+TEXT_PATH = "<text>"  # file name reported for check-text without a path
+
+
+class DaemonWorker(SpellingWorker):
+
+    def __init__(self, project):
+        SpellingWorker.__init__(self, [], 0)
+        self.allowlist = project.allowlist
+        self.batch = []
+
+    def record_error(self, file_path, word, line, line_num, column=None):
+        self.batch.append(SpellingError(file_path, word, None, line_num, column))  # line is read lazily
+
+
+class RequestError(Exception):
+
+    def __init__(self, code, message):
+        Exception.__init__(self, message)
+        self.code = code
+
+
+class Project:
+
+    def __init__(self, root):
+
+        """
+        Takes the project's root directory. Its allowlist and scan index are loaded by refresh.
+
+        :param root: str
+        """
+
+        self.root = root
+        self.allowlist_path = os.path.join(root, config.ALLOWLIST_FILE) if config.ALLOWLIST_FILE else None
+        self.allowlist = Allowlist(None)
+        self.index = None
+        self.lock = threading.Lock()  # held while checking files, so that the index isn't swapped meanwhile
+        self.__allowlist_stamp = False  # not loaded yet; None while there is no allowlist file
+
+    def refresh(self):
+
+        """
+        Reloads the allowlist if its file was created, changed or removed since it was loaded, and
+        reopens the scan index, whose results depend on it. Called with lock held.
+        """
+
+        stamp = file_stamp(self.allowlist_path)
+        if stamp == self.__allowlist_stamp:
+            return
+
+        self.allowlist = Allowlist(self.allowlist_path)
+        self.__allowlist_stamp = stamp
+
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+        if config.SCAN_INDEX_FILE:
+            self.index = ScanIndex(project_index_path(self.root), utils.checker_signature(self.allowlist))
+
+    def close(self):
+        with self.lock:
+            if self.index is not None:
+                self.index.close()
+                self.index = None
+
+
+class SpellcheckDaemon:
+
+    def __init__(self):
+
+        """
+        Builds the checker's lookup structures up front. Projects are loaded when their files are first checked.
+        """
+
+        utils.prepare_checker()
+        utils.get_suggestion_index()
+
+        self.projects = {}  # root directory -> Project
+        self.start_time = time.time()
+        self.request_count = 0
+        self.file_count = 0
+        self.__lock = threading.Lock()
+        self.shutdown_requested = threading.Event()
+
+        self.methods = {
+            "check-text": self.check_text,
+            "check-files": self.check_files,
+            "apply-fix": self.apply_fix,
+            "stats": self.stats,
+            "shutdown": self.shutdown,
+        }
+
+    def close(self):
+        for project in list(self.projects.values()):
+            project.close()
+
+    @contextlib.contextmanager
+    def open_project(self, path):
+
+        """
+        Returns a context holding the project of a file or directory, with its allowlist up to date, and its lock.
+
+        :param path: str
+        :return: context manager of Project
+        """
+
+        root = project_root(path)
+
+        with self.__lock:
+            project = self.projects.get(root)
+            if project is None:
+                project = self.projects[root] = Project(root)
+
+        with project.lock:
+            project.refresh()
+            yield project
+
+    def handle_request(self, request):
+
+        """
+        Runs one JSON-RPC request and returns its response, or None for notifications (requests without an id).
+
+        :param request: str or bytes, one line
+        :return: dict or None
+        """
+
+        try:
+            request = json.loads(request.decode("utf-8") if isinstance(request, bytes) else request)
+        except ValueError as error:
+            return error_response(None, PARSE_ERROR, "Parse error: " + str(error))
+
+        if not isinstance(request, dict):
+            return error_response(None, PARSE_ERROR, "Parse error: expected an object")
+
+        request_id = request.get("id")
+        method = self.methods.get(request.get("method"))
+        params = request.get("params") or {}
+
+        with self.__lock:
+            self.request_count += 1
+
+        try:
+            if method is None:
+                raise RequestError(METHOD_NOT_FOUND, "Method not found: " + str(request.get("method")))
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "Invalid params: expected an object")
+
+            try:
+                result = method(**params)
+            except TypeError as error:
+                raise RequestError(INVALID_PARAMS, "Invalid params: " + str(error))
+        except RequestError as error:
+            return error_response(request_id, error.code, str(error))
+        except Exception as error:
+            utils.print_error()
+            return error_response(request_id, SERVER_ERROR, str(error))
+
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def check_text(self, text, path=None):
+
+        """
+        Checks text as if it were the contents of a file at path.
+
+        :param text: str
+        :param path: str or None
+        :return: [dict]
+        """
+
+        with self.open_project(path or os.getcwd()) as project:
+            worker = DaemonWorker(project)
+
+        worker.check_contents(path or TEXT_PATH, text)
+        return occurrences(worker.batch)
+
+    def check_files(self, paths):
+
+        """
+        Checks files, and every file below directories, reusing their project's scan index for unchanged files.
+
+        :param paths: [str]
+        :return: [dict]
+        """
+
+        files_by_directory = {}
+        for file in iter_files(paths):
+            files_by_directory.setdefault(os.path.dirname(os.path.abspath(file)), []).append(file)
+
+        files_by_root = {}
+        for directory, files in files_by_directory.items():
+            files_by_root.setdefault(project_root(directory), []).extend(files)
+
+        spelling_errors = []
+        for root, files in files_by_root.items():
+            with self.open_project(root) as project:
+                spelling_errors.extend(self.check_project_files(project, files))
+
+        return occurrences(spelling_errors)
+
+    def check_project_files(self, project, files):
+
+        """
+        Checks files of one project, whose lock is held.
+
+        :param project: Project
+        :param files: [str]
+        :return: [SpellingError]
+        """
+
+        worker = DaemonWorker(project)
+        worker.fingerprint_files = project.index is not None
+        spelling_errors = []
+
+        for file in files:
+            if project.allowlist.ignores_file(file):
+                continue
+
+            file_errors = project.index.lookup(file) if project.index is not None else None
+
+            if file_errors is None:
+                worker.batch = []
+                worker.check_file(file)
+                file_errors = worker.batch
+
+                if project.index is not None and worker.fingerprint:
+                    project.index.store(file, file_errors, worker.fingerprint)
+
+            spelling_errors.extend(file_errors)
+
+            with self.__lock:
+                self.file_count += 1
+
+        if project.index is not None:
+            project.index.commit()
+
+        return spelling_errors
+
+    def apply_fix(self, path, line, column, word, correction):
+
+        """
+        Replaces word at a line and column of a file (see common/fix_queue.py).
+
+        :param path: str
+        :param line: int
+        :param column: int or None
+        :param word: str
+        :param correction: str
+        :return: dict
+        """
+
+        if not os.path.isfile(path):
+            raise RequestError(INVALID_PARAMS, "Invalid params: no such file " + repr(path))
+
+        return {"applied": apply_corrections(path, [(line, column, word, correction)])}
+
+    def stats(self):
+        with self.__lock:
+            stats = {"pid": os.getpid(), "uptime": time.time() - self.start_time, "requests": self.request_count,
+                     "files": self.file_count, "projects": len(self.projects)}
+        stats.update(utils.checker_counts())
+        return stats
+
+    def shutdown(self):
+        self.shutdown_requested.set()  # the server stops once the response is sent
+
+
+def error_response(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def project_root(path):
+
+    """
+    Returns the nearest directory at or above path holding config.ALLOWLIST_FILE (unless it is
+    an absolute path) or a .git directory. Paths outside any project are their own project.
+
+    :param path: str
+    :return: str
+    """
+
+    path = os.path.abspath(path)
+    start = path if os.path.isdir(path) else os.path.dirname(path)
+    markers = [".git"] + ([config.ALLOWLIST_FILE] if config.ALLOWLIST_FILE and not os.path.isabs(config.ALLOWLIST_FILE)
+                          else [])
+
+    directory = start
+    while True:
+        if any(os.path.exists(os.path.join(directory, marker)) for marker in markers):
+            return directory
+
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return start
+        directory = parent
+
+
+def project_index_path(root):
+
+    """
+    Returns where a project's scan index is kept: a relative config.SCAN_INDEX_FILE is relative to the
+    project's root, and an absolute one is suffixed per project, since each index holds one allowlist's results.
+
+    :param root: str
+    :return: str
+    """
+
+    if not os.path.isabs(config.SCAN_INDEX_FILE):
+        return os.path.join(root, config.SCAN_INDEX_FILE)
+
+    base, extension = os.path.splitext(config.SCAN_INDEX_FILE)
+    return base + "-" + hashlib.sha1(root.encode("utf-8", "surrogateescape")).hexdigest()[:12] + extension
+
+
+def file_stamp(path):
+
+    """
+    Returns (mtime in nanoseconds, size) of a file, or None if path is None or there is no such file.
+
+    :param path: str or None
+    :return: (int, int) or None
+    """
+
+    try:
+        return file_stat(path) if path else None
+    except OSError:
+        return None
+
+
+def iter_files(paths):
+
+    """
+    Yields the given files, and the files of registered languages below the given directories.
+
+    :param paths: [str]
+    :return: generator of str
+    """
+
+    if isinstance(paths, str):
+        raise RequestError(INVALID_PARAMS, "Invalid params: paths must be a list")
+
+    for path in paths:
+        if os.path.isdir(path):
+            for file in iter_files_in_path(path):
+                yield file
+        elif os.path.isfile(path):
+            yield path
+
+
+def occurrences(spelling_errors):
+
+    """
+    Converts SpellingErrors into the dicts written by --format json, with case-matched suggestions.
+
+    :param spelling_errors: [SpellingError]
+    :return: [dict]
+    """
+
+    suggestion_index = utils.get_suggestion_index()
+    suggestions = {}
+    result = []
+
+    for error in spelling_errors:
+        occurrence = {"file": error.file, "line": int(error.line_number), "column": error.column, "word": error.word}
+
+        if suggestion_index is not None:
+            key = error.word.lower()
+            if key not in suggestions:
+                suggestions[key] = suggestion_index.lookup(error.word, config.MAX_SUGGESTIONS)
+            if suggestions[key]:
+                occurrence["suggestions"] = [match_case(error.word, suggestion) for suggestion in suggestions[key]]
+
+        result.append(occurrence)
+
+    return result
+
+
+class SpellcheckRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+
+        """
+        Answers requests, one per line, until the client disconnects.
+        """
+
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            spellcheck_daemon = self.server.spellcheck_daemon
+            response = spellcheck_daemon.handle_request(line)
+
+            if response is not None:
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+            if spellcheck_daemon.shutdown_requested.is_set():
+                threading.Thread(target=self.server.shutdown).start()  # shutdown() waits for serve_forever
+                return
+
+
+class SpellcheckServer(socketserver.ThreadingUnixStreamServer):
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, spellcheck_daemon):
+
+        """
+        Listens on socket_path, which is only accessible to the current user, as is the directory it is
+        created in (see private_socket_directory). A stale socket left by a daemon that is no longer running
+        is replaced.
+
+        :param socket_path: str
+        :param spellcheck_daemon: SpellcheckDaemon
+        """
+
+        private_socket_directory(socket_path)
+
+        if os.path.exists(socket_path):
+            if is_listening(socket_path):
+                raise OSError("A spellcheck daemon is already listening on " + socket_path)
+            os.remove(socket_path)
+
+        previous_umask = os.umask(0o177)
+        try:
+            socketserver.ThreadingUnixStreamServer.__init__(self, socket_path, SpellcheckRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+        self.socket_path = socket_path
+        self.spellcheck_daemon = spellcheck_daemon
+
+    def server_close(self):
+        socketserver.ThreadingUnixStreamServer.server_close(self)
+        self.spellcheck_daemon.close()
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def is_listening(socket_path):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve spellchecking over a Unix socket.")
+    parser.add_argument("--socket", default=default_socket_path(), help="socket to listen on")
+    parser.add_argument("--index", default=config.SCAN_INDEX_FILE, help="scan index file used to skip "
+                        "unchanged files by check-files; a relative path is kept in each project's root")
+    arguments = parser.parse_args()
+
+    config.SCAN_INDEX_FILE = arguments.index
+
+    server = SpellcheckServer(arguments.socket, SpellcheckDaemon())
+    sys.stderr.write("Listening on " + arguments.socket + "\n")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,21 +1,41 @@
 
+import sys
+
+from common.text_reader import get_line
+
+try:
+    intern = sys.intern
+except AttributeError:
+    pass  # Python 2, where intern is a builtin
+
+
 class SpellingError:
 
-    def __init__(self, file, word, line, line_number):
+    # file paths and words are interned, so the occurrences in a file share one copy of its path; interned
+    # strings are freed once no SpellingError refers to them, so long-running processes don't accumulate paths
+    __slots__ = ("__file", "__word", "__line", "__line_number", "__column")
+
+    def __init__(self, file, word, line, line_number, column=None):
 
         """
-        Takes file_path, misspelled word, line where misspelling occurs, and line number of misspelling.
+        Takes file_path, misspelled word, line where misspelling occurs, line number of misspelling
+        and, optionally, the column at which the word starts.
+
+        The line may be None, in which case it is read from the file the first time it is needed
+        (e.g., when it is shown for review); this keeps each occurrence small.
 
         :param file: str
         :param word: str
-        :param line: str
+        :param line: str or None
         :param line_number: int
+        :param column: int or None
         """
 
-        self.__file = file
-        self.__word = word
+        self.__file = intern(file)
+        self.__word = intern(word)
         self.__line = line
         self.__line_number = line_number
+        self.__column = column
 
     @property
     def file(self):
@@ -23,7 +43,7 @@ class SpellingError:
 
     @file.setter
     def file(self, file):
-        self.__file = file
+        self.__file = intern(file)
 
     @property
     def word(self):
@@ -31,10 +51,12 @@ class SpellingError:
 
     @word.setter
     def word(self, word):
-        self.__word = word
+        self.__word = intern(word)
 
     @property
     def line(self):
+        if self.__line is None:
+            return get_line(self.__file, int(self.__line_number))
         return self.__line
 
     @line.setter
@@ -49,3 +71,10 @@ class SpellingError:
     def line_number(self, line_number):
         self.__line_number = line_number
 
+    @property
+    def column(self):
+        return self.__column
+
+    @column.setter
+    def column(self, column):
+        self.__column = column
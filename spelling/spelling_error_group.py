@@ -1,17 +1,21 @@
 
 class SpellingErrorGroup:
 
-    def __init__(self, word, group):
+    __slots__ = ("__word", "__group", "__suggestions")
+
+    def __init__(self, word, group, suggestions=None):
 
         """
-        Takes misspelled word and a list of relevant SpellingErrors.
+        Takes misspelled word, a list of relevant SpellingErrors and, optionally, suggested corrections.
 
         :param word: str
         :param group: [SpellingError]
+        :param suggestions: [str] or None, best first
         """
 
         self.__word = word
         self.__group = group
+        self.__suggestions = suggestions or []
 
     @property
     def word(self):
@@ -28,3 +32,11 @@ class SpellingErrorGroup:
     @group.setter
     def group(self, group):
         self.__group = group
+
+    @property
+    def suggestions(self):
+        return self.__suggestions
+
+    @suggestions.setter
+    def suggestions(self, suggestions):
+        self.__suggestions = suggestions
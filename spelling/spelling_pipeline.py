@@ -0,0 +1,129 @@
+
+"""
+Threaded engine for discovering spelling errors.
+
+Discovery, checking and grouping run concurrently: a feeder thread pulls paths from the (lazy) file
+iterator into a bounded queue, SpellingStreamWorkers read, tokenize and check each file, and the results
+of each file are passed back through a second bounded queue as soon as the file is done. Neither the
+list of files nor the list of SpellingErrors has to be held in memory at once.
+"""
+
+import os
+
+import common.utils as utils
+import config.config as config
+
+from common.profiling import profiled_thread
+from threading import Thread
+from spelling.spelling_error import SpellingError
+from spelling.spelling_worker import SpellingWorker
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
+_DONE = None  # placed on a queue to signal that no more items will follow
+
+
+class SpellingStreamWorker(SpellingWorker):
+
+    def __init__(self, file_queue, result_queue):
+
+        """
+        Takes the queue to read file paths from and the queue to put (file, [SpellingError], counts, fingerprint)
+        results on.
+
+        :param file_queue: Queue
+        :param result_queue: Queue
+        """
+
+        SpellingWorker.__init__(self, [], 0)
+        self.daemon = True
+        self.file_queue = file_queue
+        self.result_queue = result_queue
+        self.batch = []
+
+    def record_error(self, file_path, word, line, line_num, column=None):
+        self.batch.append(SpellingError(file_path, word, None, line_num, column))  # line is read lazily
+
+    def run(self):
+
+        """
+        Checks files until the feeder signals that discovery is complete.
+        """
+
+        try:
+            with profiled_thread():
+                for file in iter(self.file_queue.get, _DONE):
+                    self.batch = []
+
+                    try:
+                        self.check_file(file)
+                    except Exception:
+                        utils.print_error()
+                        self.fingerprint = None  # the file wasn't checked entirely
+
+                    self.result_queue.put((file, self.batch, self.take_counts(), self.fingerprint))
+        finally:
+            self.result_queue.put(_DONE)
+
+
+def feed_files(files, file_queue, worker_count):
+
+    """
+    Moves paths from the file iterator onto the bounded file queue, then signals each worker to stop.
+
+    :param files: iterable of str
+    :param file_queue: Queue
+    :param worker_count: int
+    """
+
+    try:
+        for file in files:
+            file_queue.put(file)
+    except Exception:
+        utils.print_error()
+    finally:
+        for _ in range(worker_count):
+            file_queue.put(_DONE)
+
+
+def iter_file_results_in_threads(files, worker_count=None, fingerprint_files=False, line_filters=None):
+
+    """
+    Checks all files using SpellingStreamWorker threads, yielding each file with the SpellingErrors found in it,
+    the counts described by SpellingWorker.take_counts and, if fingerprint_files, the fingerprint of the file read
+    (see MappedTextFile.fingerprint).
+
+    :param files: iterable of str
+    :param worker_count: int, defaults to config.WORKER_COUNT (or the number of CPUs)
+    :param fingerprint_files: bool
+    :param line_filters: dict or None, see SpellingWorker.line_filters
+    :return: generator of (str, [SpellingError], dict, tuple or None)
+    """
+
+    worker_count = worker_count or config.WORKER_COUNT or os.cpu_count() or 1
+
+    file_queue = Queue(config.PIPELINE_QUEUE_SIZE)
+    result_queue = Queue(config.PIPELINE_QUEUE_SIZE)
+
+    feeder = Thread(target=feed_files, args=(files, file_queue, worker_count))
+    feeder.daemon = True
+    feeder.start()
+
+    for _ in range(worker_count):
+        worker = SpellingStreamWorker(file_queue, result_queue)
+        worker.fingerprint_files = fingerprint_files
+        worker.line_filters = line_filters
+        worker.start()
+
+    running_workers = worker_count
+    while running_workers:
+        result = result_queue.get()
+
+        if result is _DONE:
+            running_workers -= 1
+        else:
+            yield result
@@ -0,0 +1,185 @@
+
+"""
+Multiprocessing engine for discovering spelling errors.
+
+Files are handed out to worker processes in small chunks, so a process that finishes early simply
+picks up the next chunk. Each chunk comes back as a compact batch of (file, [(word, line_number, column)])
+tuples instead of pickled SpellingError objects.
+"""
+
+import time
+import multiprocessing
+
+import common.utils as utils
+import config.config as config
+
+from spelling.spelling_error import SpellingError
+from spelling.spelling_worker import SpellingWorker
+
+
+worker_options = {"fingerprint_files": False, "line_filters": None}  # of the scan, set by initialize_worker
+
+
+def initialize_worker(fingerprint_files, line_filters):
+
+    """
+    Runs in each worker process as it starts, receiving the scan's options explicitly, since a
+    spawned (rather than forked) process doesn't inherit them.
+
+    :param fingerprint_files: bool, see SpellingWorker.fingerprint_files
+    :param line_filters: dict or None, see SpellingWorker.line_filters
+    """
+
+    worker_options["fingerprint_files"] = fingerprint_files
+    worker_options["line_filters"] = line_filters
+
+
+class SpellingBatchWorker(SpellingWorker):
+
+    def __init__(self, files):
+
+        """
+        Takes a list of file paths to check. Instances are run synchronously inside a worker process,
+        with the options given to initialize_worker.
+
+        :param files: [str]
+        """
+
+        SpellingWorker.__init__(self, files, time.time())
+        self.fingerprint_files = worker_options["fingerprint_files"]
+        self.line_filters = worker_options["line_filters"]
+        self.batch = []
+        self.checker_counts = utils.checker_counts()
+
+    def take_counts(self):
+
+        """
+        As SpellingWorker.take_counts, but including verdict cache use, since each process has its own.
+
+        :return: dict
+        """
+
+        counts = SpellingWorker.take_counts(self)
+        checker_counts = utils.checker_counts()
+
+        for name, value in checker_counts.items():
+            counts[name] = value - self.checker_counts[name]
+
+        self.checker_counts = checker_counts
+        return counts
+
+    def record_error(self, file_path, word, line, line_num, column=None):
+        self.batch.append((word, line_num, column))  # line text is read lazily by SpellingError
+
+
+def check_file_chunk(files):
+
+    """
+    Entry point of each worker process. Returns the suspicious words found in each file of the chunk,
+    and the file's fingerprint if the worker was initialized to take them. A file that fails to be
+    checked is counted as skipped, so that it doesn't abort the scan.
+
+    :param files: [str]
+    :return: [(str, [(str, int, int)], dict, tuple or None)]
+    """
+
+    worker = SpellingBatchWorker(files)
+    results = []
+
+    for file in files:
+        worker.batch = []
+
+        try:
+            worker.check_file(file)
+        except Exception:
+            utils.print_error()
+            worker.skipped_file_count += 1
+            worker.fingerprint = None  # the file wasn't checked entirely
+
+        results.append((file, worker.batch, worker.take_counts(), worker.fingerprint))
+
+    return results
+
+
+def check_contents_chunk(contents):
+
+    """
+    Entry point of worker processes fed by the async reader. As check_file_chunk, but for (file, contents,
+    fingerprint) triples, fingerprinted by the reader; contents is None for files that were skipped or could not
+    be read.
+
+    :param contents: [(str, str or None, tuple or None)]
+    :return: [(str, [(str, int, int)], dict, tuple or None)]
+    """
+
+    worker = SpellingBatchWorker([file for file, _, _ in contents])
+    results = []
+
+    for file, file_contents, fingerprint in contents:
+        worker.batch = []
+
+        if file_contents is None:
+            worker.skipped_file_count += 1
+        else:
+            try:
+                worker.check_contents(file, file_contents)
+            except Exception:
+                utils.print_error()
+                fingerprint = None  # the file wasn't checked entirely
+
+        results.append((file, worker.batch, worker.take_counts(), fingerprint))
+
+    return results
+
+
+def chunk_files(files, chunk_size):
+
+    """
+    Yields successive lists of at most chunk_size files.
+
+    :param files: iterable of str
+    :param chunk_size: int
+    :return: generator of [str]
+    """
+
+    chunk = []
+    for file in files:
+        chunk.append(file)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def iter_file_results_in_processes(files, worker_count=None, chunk_size=None, check_chunk=check_file_chunk,
+                                   fingerprint_files=False, line_filters=None):
+
+    """
+    Checks all files using a pool of worker processes, yielding each file with the SpellingErrors found in it,
+    the counts described by SpellingBatchWorker.take_counts and the file's fingerprint (or None).
+
+    :param files: iterable of str
+    :param worker_count: int, defaults to config.WORKER_COUNT (or the number of CPUs)
+    :param chunk_size: int, defaults to config.PROCESS_CHUNK_SIZE
+    :param check_chunk: function, run by the worker processes on each chunk of files
+    :param fingerprint_files: bool, see SpellingWorker.fingerprint_files
+    :param line_filters: dict or None, see SpellingWorker.line_filters
+    :return: generator of (str, [SpellingError], dict, tuple or None)
+    """
+
+    worker_count = worker_count or config.WORKER_COUNT or multiprocessing.cpu_count()
+    chunk_size = chunk_size or config.PROCESS_CHUNK_SIZE
+
+    utils.prepare_checker()  # so that forked workers inherit the word source and Bloom filter
+    pool = multiprocessing.Pool(worker_count, initialize_worker, (fingerprint_files, line_filters))
+
+    try:
+        for results in pool.imap_unordered(check_chunk, chunk_files(files, chunk_size)):
+            for file_path, batch, counts, fingerprint in results:
+                yield file_path, [SpellingError(file_path, word, None, line_num, column)
+                                  for word, line_num, column in batch], counts, fingerprint
+    finally:
+        pool.terminate()
+        pool.join()
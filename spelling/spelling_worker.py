@@ -1,12 +1,17 @@
 
-import time
+import io
 import os.path
 
 import common.utils as utils
 import config.config as config
 
+from common.text_reader import open_text_file
+
+from langs.registry import get_extractor, language_for_path
 from spelling.spelling_error import SpellingError
+from collections import Counter
 from threading import Thread
+from time import perf_counter
 
 
 class SpellingWorker(Thread):
@@ -25,6 +30,21 @@ class SpellingWorker(Thread):
         self.start_time = start_time
         self.__spelling_errors = []
 
+        # owned by this worker only; handed to the consumer through take_counts
+        self.line_count = 0
+        self.word_count = 0
+        self.skipped_file_count = 0
+
+        self.line_filters = None  # file path -> set of line numbers; when set, other lines are skipped (see git_diff)
+        self.allowlist = None  # None uses the project's (utils.allowlist); the daemon checks files of several projects
+
+        # when set, check_file takes the fingerprint of each file before reading it, for ScanIndex.store
+        self.fingerprint_files = False
+        self.fingerprint = None  # of the last file checked, or None if it wasn't read or fingerprinted
+
+        # time spent per stage, only measured if config.PROFILE_STAGES is set (see common/profiling.py)
+        self.stage_seconds = Counter() if config.PROFILE_STAGES else None
+
     @property
     def spelling_errors(self):
         return self.__spelling_errors
@@ -36,125 +56,184 @@ class SpellingWorker(Thread):
         """
 
         for file in self.files:
+            self.check_file(file)
 
-            config.file_counter += 1  # increment file-search count
+    def take_counts(self):
 
-            if file and os.path.isfile(file):
-                self.read_file(open(file, "r"), file)
+        """
+        Returns the lines, words and skipped files read since the last call, the Bloom filter lookups made,
+        and the time spent per stage and compound words split if profiling. Called from the worker's own
+        thread. Threads share the verdict cache, so its use is counted by the caller rather than per worker.
 
-                if self.should_print_status(config.file_counter):
-                    self.print_status()
+        :return: dict
+        """
 
-    def read_file(self, readable_file, file_path):
+        counts = {"lines": self.line_count, "words": self.word_count, "skipped_files": self.skipped_file_count}
+        self.line_count = 0
+        self.word_count = 0
+        self.skipped_file_count = 0
+
+        if utils.bloom_filter:
+            counts["bloom_negatives"], counts["bloom_positives"] = utils.bloom_filter.take_counts()
+
+        if self.stage_seconds is not None:
+            for stage, seconds in self.stage_seconds.items():
+                counts["seconds_" + stage] = seconds
+            self.stage_seconds.clear()
+            counts["compound_splits"] = utils.take_compound_split_count()
+
+        return counts
+
+    def check_file(self, file):
 
         """
-        Loops over each line in file.
+        Checks the spelling of a single file. Returns false if the path is not a readable file,
+        or if the file is skipped for being binary or too large, or for failing to decode under
+        config.DECODE_ERRORS = "strict" (in which case the words found before the error are kept).
+
+        :param file: str
+        :return: bool
+        """
+
+        self.fingerprint = None
+
+        if not (file and os.path.isfile(file)):
+            return False
+
+        text_file = open_text_file(file)
+
+        if text_file is None:
+            self.skipped_file_count += 1
+            return False
+
+        with text_file:
+            if self.fingerprint_files:
+                self.fingerprint = text_file.fingerprint()
+
+            try:
+                self.read_file(text_file, file)
+            except UnicodeDecodeError:
+                self.skipped_file_count += 1
+                self.fingerprint = None  # the rest of the file wasn't checked
+                return False
+
+        return True
+
+    def check_contents(self, file_path, contents):
+
+        """
+        Checks the spelling of a file whose contents have already been read.
 
-        :param readable_file: file
         :param file_path: str
+        :param contents: str
         """
 
-        within_comment = False
+        self.read_file(io.StringIO(contents), file_path)
 
-        line_num = 1
-        for line in readable_file:
+    def read_file(self, readable_file, file_path):
 
-            # TODO - only check comments and string literals
+        """
+        Checks the text that the file's language module extracts (e.g., comments, docstrings and
+        string literals for source code, prose for documentation). Files of unknown languages are
+        checked in their entirety. If line_filters has an entry for the file, only those lines are checked.
 
-            # TODO - use file type to determine comment type, etc
+        :param readable_file: file
+        :param file_path: str
+        """
 
-            # TODO - for .txt; check everything (use utils.should_check_line method)
+        start_time = perf_counter() if self.stage_seconds is not None else None
 
-            # TODO - use each language's specific comment syntax
+        extract_text = get_extractor(language_for_path(file_path))
+        checked_lines = self.line_filters.get(file_path) if self.line_filters is not None else None
+        last_line_num = None
 
-            # line = utils.remove_non_utf8(line)
+        for line_num, column_offset, text in extract_text(readable_file):
 
-            if line:
+            if checked_lines is not None and line_num not in checked_lines:
+                continue
 
-                if ".py" in file_path:
-                    if within_comment:
-                        if "\"\"\"" in line:
-                            within_comment = False
-                        self.read_line(line, file_path, line_num)
-                    elif "#" in line:
-                        self.read_line(line, file_path, line_num)
-                    elif "\"\"\"" in line:
-                        within_comment = True
-                        self.read_line(line, file_path, line_num)
-                else:
-                    self.read_line(line, file_path, line_num)
+            if line_num != last_line_num:
+                self.line_count += 1
+                last_line_num = line_num
 
-            line_num += 1
+            self.read_line(text, file_path, line_num, column_offset)
 
-    def read_line(self, line, file_path, line_num):
+        if start_time is not None:
+            self.stage_seconds["file"] += perf_counter() - start_time
+
+    def read_line(self, line, file_path, line_num, column_offset=0):
 
         """
         Assesses spelling of each word in line.
 
-        :param line: str
+        :param line: str, the whole line or the part of it starting at column_offset
         :param file_path: str
         :param line_num: int
+        :param column_offset: int
         """
 
         # TODO - accept command line args regarding what to split on (e.g., comma, space, semi-colin, etc...)
 
-        words = utils.split_line(line)
+        if self.stage_seconds is not None:
+            self.read_line_timed(line, file_path, line_num, column_offset)
+            return
 
-        for word in words:
-            self.read_word(word, file_path, line, line_num)
+        for word, column in utils.tokenize_line(line):
+            self.word_count += 1
+            self.read_word(word, file_path, line, line_num, column_offset + column)
 
-    def read_word(self, word, file_path, line, line_num):
+    def read_line_timed(self, line, file_path, line_num, column_offset=0):
 
         """
-        Assesses spelling of word.
+        As read_line, timing tokenizing and checking separately.
 
-        :param word: str
-        :param file_path: str
         :param line: str
+        :param file_path: str
         :param line_num: int
+        :param column_offset: int
         """
 
-        # TODO - in future, loop over many possible dictionaries
+        start_time = perf_counter()
+        words = list(utils.tokenize_line(line))
+        tokenized_time = perf_counter()
 
-        try:
-            if utils.is_spelling_error(word):
-                spelling_error = SpellingError(file_path, word, line, line_num)
+        for word, column in words:
+            self.word_count += 1
+            self.read_word(word, file_path, line, line_num, column_offset + column)
 
-                self.__spelling_errors.append(spelling_error)
-                config.spelling_error_counter += 1  # new error, increment count
-        except Exception:
-            utils.print_error()
+        self.stage_seconds["tokenize"] += tokenized_time - start_time
+        self.stage_seconds["check"] += perf_counter() - tokenized_time
 
-    @staticmethod
-    def should_print_status(file_count):
+    def read_word(self, word, file_path, line, line_num, column=None):
 
         """
-        Print search status if file_count is divisible by STATUS_PRINT_INTERVAL
-        or the last file has been read.
+        Assesses spelling of word.
 
-        :param file_count: int
-        :return: bool
+        :param word: str
+        :param file_path: str
+        :param line: str
+        :param line_num: int
+        :param column: int or None
         """
 
-        return file_count % config.STATUS_PRINT_INTERVAL == 0 or file_count == config.total_file_count
-
-    def print_status(self):
+        # TODO - in future, loop over many possible dictionaries
 
-        elapsed_time = time.time() - self.start_time
-        print(self.status(elapsed_time))
+        try:
+            if utils.is_spelling_error(word, self.allowlist):
+                self.record_error(file_path, word, line, line_num, column)
+        except Exception:
+            utils.print_error()
 
-    @staticmethod
-    def status(elapsed_time):
+    def record_error(self, file_path, word, line, line_num, column=None):
 
         """
-        Constructs and returns a status update.
+        Stores a suspicious word found while reading.
 
-        :param elapsed_time: float
-        :return: str
+        :param file_path: str
+        :param word: str
+        :param line: str
+        :param line_num: int
+        :param column: int or None
         """
 
-        spelling_errs = "Suspicious Words: " + str(config.spelling_error_counter)
-        file_progress = "Files Read: " + str(config.file_counter) + " out of " + str(config.total_file_count)
-        time_progress = "In " + str("%.2f" % elapsed_time) + " seconds"
-
-        return spelling_errs + " --- " + file_progress + " --- " + time_progress
+        self.__spelling_errors.append(SpellingError(file_path, word, None, line_num, column))  # line is read lazily
@@ -0,0 +1,64 @@
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from common.allowlist import Allowlist
+
+
+class TestAllowlistMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, ".spellchecker_allowlist")
+        with io.open(self.path, "w") as allowlist_file:
+            allowlist_file.write(u"# project jargon\nKubectl\nre:[a-z]+_?id\nre:(bad\npath:vendor/\npath:*.min.js\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_words_and_patterns(self):
+        allowlist = Allowlist(self.path)
+
+        self.assertTrue(allowlist.allows("kubectl"))
+        self.assertTrue(allowlist.allows("KUBECTL"))
+        self.assertTrue(allowlist.allows("userid"))
+        self.assertTrue(allowlist.allows("UserId"))
+        self.assertFalse(allowlist.allows("identity"))
+        self.assertEqual(allowlist.patterns, ["[a-z]+_?id"])  # the invalid pattern is skipped
+
+    def test_file_rules(self):
+        allowlist = Allowlist(self.path)
+
+        self.assertTrue(allowlist.ignores_file(os.path.join(self.directory, "vendor", "lib.py")))
+        self.assertTrue(allowlist.ignores_file(os.path.join(self.directory, "static", "app.min.js")))
+        self.assertFalse(allowlist.ignores_file(os.path.join(self.directory, "src", "app.py")))
+
+    def test_learn(self):
+        allowlist = Allowlist(self.path)
+        tag = allowlist.tag
+
+        self.assertEqual(allowlist.learn(["Nginx", "kubectl", "nginx", "grpc"]), ["nginx", "grpc"])
+        self.assertNotEqual(allowlist.tag, tag)
+        self.assertTrue(Allowlist(self.path).allows("grpc"))
+        self.assertEqual(Allowlist(self.path).tag, allowlist.tag)
+
+    def test_learn_after_unterminated_line(self):
+        with io.open(self.path, "w") as allowlist_file:
+            allowlist_file.write(u"kubectl")
+
+        Allowlist(self.path).learn(["nginx"])
+
+        allowlist = Allowlist(self.path)
+        self.assertTrue(allowlist.allows("kubectl"))
+        self.assertTrue(allowlist.allows("nginx"))
+
+    def test_missing_file(self):
+        allowlist = Allowlist(os.path.join(self.directory, "missing"))
+        self.assertFalse(allowlist.allows("word"))
+        self.assertFalse(allowlist.ignores_file("file.py"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import config.config as config
+
+from contextlib import redirect_stdout
+from spelling import spelling_async_reader
+from spelling.spelling_async_reader import run_reader, _DONE
+
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
+
+
+class TestAsyncReaderMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.files = []
+        for i in range(20):
+            path = os.path.join(self.directory, "file" + str(i) + ".txt")
+            with open(path, "w") as f:
+                f.write("contents " + str(i) + "\n")
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reads_every_file(self):
+        contents_queue = Queue()
+        run_reader(self.files + [os.path.join(self.directory, "missing.txt")], contents_queue, 4, True)
+
+        results = dict((file, (contents, fingerprint))
+                       for file, contents, fingerprint in iter(contents_queue.get, _DONE))
+        self.assertEqual(len(results), 21)
+        self.assertEqual(results[self.files[3]][0], "contents 3\n")
+        self.assertEqual(results[self.files[3]][1][1], len("contents 3\n"))  # size, after the modification time
+        self.assertEqual(results[os.path.join(self.directory, "missing.txt")], (None, None))
+
+    def test_strict_decoding_skips_file(self):
+        path = os.path.join(self.directory, "latin.txt")
+        with open(path, "wb") as f:
+            f.write(b"caf\xe9\n")
+
+        decode_errors = config.DECODE_ERRORS
+        config.DECODE_ERRORS = "strict"
+        try:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(spelling_async_reader.read_file_contents(path, True), (None, None))
+        finally:
+            config.DECODE_ERRORS = decode_errors
+
+        self.assertEqual(output.getvalue(), "")  # no traceback
+
+    def test_concurrency_is_bounded(self):
+        read_file_contents = spelling_async_reader.read_file_contents
+        in_flight = [0, 0]
+
+        def counting_read(file, fingerprint_files=False):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            try:
+                return read_file_contents(file, fingerprint_files)
+            finally:
+                in_flight[0] -= 1
+
+        spelling_async_reader.read_file_contents = counting_read
+        try:
+            contents_queue = Queue()
+            run_reader(self.files, contents_queue, 3)
+        finally:
+            spelling_async_reader.read_file_contents = read_file_contents
+
+        self.assertEqual(len(list(iter(contents_queue.get, _DONE))), 20)
+        self.assertLessEqual(in_flight[1], 3)
+
+if __name__ == '__main__':
+    unittest.main()
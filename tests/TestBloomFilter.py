@@ -0,0 +1,32 @@
+
+import unittest
+
+from common.bloom_filter import BloomFilter
+
+
+class TestBloomFilterMethods(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        words = ["word" + str(i) for i in range(1000)]
+        bloom_filter = BloomFilter(len(words), 0.01, 1 << 20)
+        for word in words:
+            bloom_filter.add(word)
+
+        self.assertTrue(all(bloom_filter.might_contain(word.upper()) for word in words))
+        self.assertEqual(bloom_filter.take_counts(), (0, 1000))
+        self.assertEqual(bloom_filter.take_counts(), (0, 0))
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(1000, 0.01, 1 << 20)
+        for i in range(1000):
+            bloom_filter.add("word" + str(i))
+
+        false_positives = sum(bloom_filter.might_contain("other" + str(i)) for i in range(10000))
+        self.assertLess(false_positives, 300)
+        self.assertEqual(bloom_filter.take_counts(), (10000 - false_positives, false_positives))
+
+    def test_memory_budget(self):
+        self.assertEqual(BloomFilter(10 ** 6, 0.001, 1024).size, 1024)
+
+if __name__ == '__main__':
+    unittest.main()
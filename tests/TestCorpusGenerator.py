@@ -0,0 +1,46 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.corpus_generator import CorpusGenerator, VOCABULARY, make_typo
+
+import random
+
+
+class TestCorpusGeneratorMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directories = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+
+    def tearDown(self):
+        for directory in self.directories:
+            shutil.rmtree(directory)
+
+    def test_deterministic(self):
+        contents = []
+        for directory in self.directories:
+            paths = CorpusGenerator(seed=7, typo_density=0.05).generate(directory, 30, 20, 10)
+            contents.append([(os.path.relpath(path, directory), open(path).read()) for path in paths])
+
+        self.assertEqual(contents[0], contents[1])
+        self.assertEqual(len(contents[0]), 30)
+        self.assertEqual(set(os.path.splitext(path)[1] for path, _ in contents[0]), {".py", ".md", ".rst", ".markdown"})
+
+    def test_typo_density(self):
+        generator = CorpusGenerator(typo_density=0.0)
+        self.assertTrue(all(generator.word() in VOCABULARY for _ in range(1000)))
+
+        generator = CorpusGenerator(typo_density=1.0)
+        words = [generator.word() for _ in range(1000)]
+        self.assertEqual(generator.typo_count, 1000)
+        self.assertLess(sum(word in VOCABULARY for word in words), 50)
+
+    def test_make_typo(self):
+        rng = random.Random(0)
+        for word in VOCABULARY:
+            self.assertNotEqual(make_typo(word, rng), word)
+
+if __name__ == '__main__':
+    unittest.main()
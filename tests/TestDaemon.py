@@ -0,0 +1,95 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from spelling import spelling_client
+from spelling.spelling_client import DaemonError, check_socket_owner, private_socket_directory
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix sockets")
+class TestDaemonMethods(unittest.TestCase):
+
+    def setUp(self):
+        from spelling.spelling_daemon import SpellcheckDaemon, SpellcheckServer
+
+        self.directory = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.directory, "daemon.sock")
+        self.server = SpellcheckServer(self.socket_path, SpellcheckDaemon())
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def call(self, method, params=None):
+        return spelling_client.call(method, params, self.socket_path, timeout=10)
+
+    def test_check_text(self):
+        occurrences = self.call("check-text", {"text": "the word\nhello wrld\n"})
+        self.assertEqual([(o["line"], o["column"], o["word"]) for o in occurrences], [(2, 6, "wrld")])
+
+    def test_check_files_and_apply_fix(self):
+        path = os.path.join(self.directory, "notes.md")
+        with open(path, "w") as f:
+            f.write("A wrod\n")
+
+        occurrences = self.call("check-files", {"paths": [self.directory]})
+        self.assertEqual([(o["file"], o["line"], o["column"], o["word"]) for o in occurrences], [(path, 1, 2, "wrod")])
+
+        result = self.call("apply-fix", {"path": path, "line": 1, "column": 2, "word": "wrod", "correction": "word"})
+        self.assertEqual(result, {"applied": 1})
+        self.assertEqual(self.call("check-files", {"paths": [path]}), [])
+
+    def test_allowlist_per_project(self):
+        paths = []
+        for project in ("first", "second"):
+            os.makedirs(os.path.join(self.directory, project, ".git"))
+            paths.append(os.path.join(self.directory, project, "notes.md"))
+            with open(paths[-1], "w") as f:
+                f.write("A wrod\n")
+
+        first_allowlist = os.path.join(self.directory, "first", ".spellchecker_allowlist")
+        with open(first_allowlist, "w") as f:
+            f.write("wrod\n")
+
+        occurrences = self.call("check-files", {"paths": paths})
+        self.assertEqual([o["file"] for o in occurrences], [paths[1]])
+
+        with open(first_allowlist, "w") as f:
+            f.write("# none\n")  # reloaded, since it changed
+
+        occurrences = self.call("check-files", {"paths": paths})
+        self.assertEqual(sorted(o["file"] for o in occurrences), paths)
+        self.assertEqual(self.call("stats")["projects"], 2)
+
+    def test_socket_permissions(self):
+        os.chmod(self.directory, 0o755)
+        with self.assertRaises(OSError):
+            private_socket_directory(self.socket_path)
+
+        if os.getuid() == 0:
+            os.chown(self.socket_path, 12345, -1)
+            with self.assertRaises(OSError):
+                check_socket_owner(self.socket_path)
+
+    def test_errors(self):
+        with self.assertRaises(DaemonError):
+            self.call("no-such-method")
+        with self.assertRaises(DaemonError):
+            self.call("check-text", {"txt": "misnamed"})
+        self.assertGreaterEqual(self.call("stats")["requests"], 2)
+
+    def test_shutdown(self):
+        self.assertIsNone(self.call("shutdown"))
+        self.thread.join(10)
+        self.assertFalse(self.thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
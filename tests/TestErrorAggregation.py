@@ -0,0 +1,85 @@
+
+import unittest
+
+import config.config as config
+
+from common.error_aggregation import ErrorAggregator, typo_score
+from spelling.spelling_error import SpellingError
+
+
+def errors(occurrences):
+    return [SpellingError(file, word, "line", 1) for file, word in occurrences]
+
+
+class TestErrorAggregationMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.limits = (config.MIN_WORD_FREQUENCY, config.MAX_WORD_FREQUENCY, config.MAX_DIRECTORY_FREQUENCY,
+                       config.MAX_FILE_SPREAD, config.RANK_BY_TYPO_SCORE)
+
+    def tearDown(self):
+        (config.MIN_WORD_FREQUENCY, config.MAX_WORD_FREQUENCY, config.MAX_DIRECTORY_FREQUENCY,
+         config.MAX_FILE_SPREAD, config.RANK_BY_TYPO_SCORE) = self.limits
+
+    def test_frequency_limits(self):
+        config.MIN_WORD_FREQUENCY, config.MAX_WORD_FREQUENCY = 2, 4
+        aggregator = ErrorAggregator()
+        aggregator.add_all(errors([("a.py", "once")] + [("a.py", "Twice")] * 2 + [("a.py", "often")] * 6))
+
+        self.assertEqual([group.word for group in aggregator.groups()], ["twice"])
+        self.assertEqual(aggregator.error_count, 9)
+        self.assertEqual(dict((s.word, s.errors is None) for s in aggregator.statistics()),
+                         {"once": False, "twice": False, "often": True})
+
+    def test_spread_limits(self):
+        config.MAX_WORD_FREQUENCY = None
+        config.MAX_FILE_SPREAD = 3
+        config.MAX_DIRECTORY_FREQUENCY = 3
+        aggregator = ErrorAggregator()
+        aggregator.add_all(errors([("a/1.py", "spread"), ("a/2.py", "spread"), ("b/3.py", "spread"),
+                                   ("c/1.py", "local"), ("c/2.py", "local"), ("c/2.py", "local"),
+                                   ("d/1.py", "typo"), ("e/1.py", "typo")]))
+
+        self.assertEqual([group.word for group in aggregator.groups()], ["typo"])
+
+    def test_released_words_stop_counting_files(self):
+        config.MAX_WORD_FREQUENCY = 2
+        config.MAX_FILE_SPREAD = config.MAX_DIRECTORY_FREQUENCY = None
+        aggregator = ErrorAggregator()
+        aggregator.add_all(errors([("a/%d.py" % index, "often") for index in range(5)]))
+
+        statistics = list(aggregator.statistics())[0]
+        self.assertEqual((statistics.errors, statistics.file_counts, statistics.file_spread), (None, None, 2))
+        self.assertEqual(statistics.count, 5)
+        self.assertEqual(aggregator.groups(), [])
+
+    def test_released_words_keep_directory_counts(self):
+        config.MAX_WORD_FREQUENCY = None
+        config.MAX_FILE_SPREAD = 2
+        config.MAX_DIRECTORY_FREQUENCY = 3
+        aggregator = ErrorAggregator()
+        aggregator.add_all(errors([("a/1.py", "spread"), ("b/1.py", "spread"), ("a/2.py", "spread"),
+                                   ("a/3.py", "spread")]))
+
+        statistics = list(aggregator.statistics())[0]
+        self.assertIsNone(statistics.file_counts)
+        self.assertEqual(statistics.directory_counts(), {"a": 3, "b": 1})
+        self.assertEqual(aggregator.groups(), [])
+
+    def test_ranking(self):
+        config.RANK_BY_TYPO_SCORE = True
+        aggregator = ErrorAggregator()
+        aggregator.add_all(errors([("a.py", "abc"), ("a.py", "recieve"), ("a.py", "jargonword"),
+                                   ("b.py", "jargonword")]))
+
+        self.assertEqual([group.word for group in aggregator.groups()], ["recieve", "abc", "jargonword"])
+        self.assertEqual(typo_score(list(aggregator.statistics())[1]), 7 / 8.0)
+
+    def test_custom_filters(self):
+        aggregator = ErrorAggregator([lambda statistics: statistics.word.startswith("t")], lambda s: s.count)
+        aggregator.add_all(errors([("a.py", "tpyo")] * 9 + [("a.py", "teh"), ("a.py", "wrod")]))
+
+        self.assertEqual([(group.word, len(group.group)) for group in aggregator.groups()], [("tpyo", 9), ("teh", 1)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from common.file_discovery import iter_files_in_path
+
+
+class TestFileDiscoveryMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        for relative_path in ["a.py", "b.txt", "docs/c.rst", "docs/d.md", "node_modules/e.md",
+                              "env/f.py", "env/pyvenv.cfg", "build/g.py", "docs/h.markdown"]:
+            path = os.path.join(self.directory, relative_path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            open(path, "w").close()
+
+        with open(os.path.join(self.directory, ".gitignore"), "w") as gitignore:
+            gitignore.write("# comment\nbuild/\n*.markdown\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def found(self, **kwargs):
+        return sorted(os.path.relpath(path, self.directory)
+                      for path in iter_files_in_path(self.directory, **kwargs))
+
+    def test_registered_extensions_and_pruning(self):
+        self.assertEqual(self.found(respect_gitignore=False),
+                         ["a.py", "build/g.py", "docs/c.rst", "docs/d.md", "docs/h.markdown"])
+
+    def test_gitignore(self):
+        self.assertEqual(self.found(respect_gitignore=True), ["a.py", "docs/c.rst", "docs/d.md"])
+
+    def test_extensions(self):
+        self.assertEqual(self.found(extensions={".txt"}, respect_gitignore=False), ["b.txt"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from common.fix_queue import FixQueue
+from spelling.spelling_error import SpellingError
+
+
+class TestFixQueueMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "example.md")
+
+        with io.open(self.file_path, "w", newline="") as file:
+            file.write(u"a tpyo and a tpyo\r\nTpyo again\r\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self):
+        with io.open(self.file_path, "r", newline="") as file:
+            return file.read()
+
+    def test_apply_uses_columns(self):
+        fixes = FixQueue()
+        fixes.add(SpellingError(self.file_path, "tpyo", None, 1, 2), "typo")
+        fixes.add(SpellingError(self.file_path, "tpyo", None, 1, 13), "typographical")
+        fixes.add(SpellingError(self.file_path, "Tpyo", None, 2, 0), "Typo")
+        self.assertEqual(len(fixes), 3)
+
+        self.assertEqual(fixes.apply(), 3)
+        self.assertEqual(self.read(), u"a typo and a typographical\r\nTypo again\r\n")
+        self.assertEqual(len(fixes), 0)
+
+    def test_apply_without_column(self):
+        fixes = FixQueue()
+        fixes.add(SpellingError(self.file_path, "again", None, 2), "once more")
+        self.assertEqual(fixes.apply(), 1)
+        self.assertEqual(self.read(), u"a tpyo and a tpyo\r\nTpyo once more\r\n")
+        self.assertEqual(os.listdir(self.directory), ["example.md"])
+
+    def test_failed_file_does_not_reapply(self):
+        with io.open(self.file_path, "w", newline="") as file:
+            file.write(u"teh cat ate teh dog\n")
+
+        fixes = FixQueue()
+        fixes.add(SpellingError(self.file_path, "teh", None, 1, 0), "the")
+        fixes.add(SpellingError(os.path.join(self.directory, "moved.md"), "teh", None, 1, 0), "the")
+
+        self.assertEqual(fixes.apply(), 1)
+        self.assertEqual([file_path for file_path, _ in fixes.failures], [os.path.join(self.directory, "moved.md")])
+        self.assertEqual(len(fixes), 0)
+        self.assertEqual(fixes.apply(), 0)
+        self.assertEqual(self.read(), u"the cat ate teh dog\n")
+
+    def test_stale_column_is_skipped(self):
+        fixes = FixQueue()
+        fixes.add(SpellingError(self.file_path, "tpyo", None, 1, 5), "typo")
+        self.assertEqual(fixes.apply(), 0)
+        self.assertEqual(self.read(), u"a tpyo and a tpyo\r\nTpyo again\r\n")
+
+    def test_lines_are_split_on_newlines_only(self):
+        with io.open(self.file_path, "w", newline="") as file:
+            file.write(u"teh\fcat \u2028teh\rdog\nand teh\x85end\n")
+
+        fixes = FixQueue()
+        fixes.add(SpellingError(self.file_path, "teh", None, 1, 0), "the")
+        fixes.add(SpellingError(self.file_path, "teh", None, 1, 9), "the")
+        fixes.add(SpellingError(self.file_path, "teh", None, 2, 4), "the")
+
+        self.assertEqual(fixes.apply(), 3)
+        self.assertEqual(self.read(), u"the\fcat \u2028the\rdog\nand the\x85end\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from common.git_diff import parse_diff, changed_lines_since, iter_changed_files
+from spelling import spelling_process_pool
+from spelling.spelling_worker import SpellingWorker
+
+DIFF = """diff --git a/src/app.py b/src/app.py
+index 83db48f..bf269f4 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -3 +3,2 @@ def main():
+-# old comment
++# new comment
++# anothr comment
+@@ -10,2 +11,0 @@ def other():
+-removed
+-removed
+@@ -20,0 +19 @@ def last():
++++ an added line that looks like a header
+diff --git a/gone.py b/gone.py
+deleted file mode 100644
+--- a/gone.py
++++ /dev/null
+@@ -1 +0,0 @@
+-print("bye")
+diff --git a/docs/new.md b/docs/new.md
+new file mode 100644
+--- /dev/null
++++ b/docs/new.md
+@@ -0,0 +1,3 @@
++# Title
++
++Text
+"""
+
+
+class RecordingWorker(SpellingWorker):
+
+    def __init__(self):
+        SpellingWorker.__init__(self, [], 0)
+        self.checked = []
+
+    def read_line(self, line, file_path, line_num, column_offset=0):
+        self.checked.append(line_num)
+
+
+class TestGitDiffMethods(unittest.TestCase):
+
+    def test_parse_diff(self):
+        self.assertEqual(parse_diff(DIFF, "/repo"), {os.path.join("/repo", "src/app.py"): {3, 4, 19},
+                                                     os.path.join("/repo", "docs/new.md"): {1, 2, 3}})
+
+    def test_line_filters(self):
+        worker = RecordingWorker()
+        worker.line_filters = {"file.txt": {2, 4}}
+        worker.read_file(["one\n", "two\n", "three\n", "four\n"], "file.txt")
+        worker.read_file(["one\n", "two\n"], "other.txt")
+
+        self.assertEqual(worker.checked, [2, 4, 1, 2])
+
+    def test_worker_process_line_filters(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "notes.txt")
+            with open(path, "w") as f:
+                f.write("a wrod\nanothr wrod\n")
+
+            spelling_process_pool.initialize_worker(False, {path: {2}})  # as the pool does in each process
+            try:
+                results = spelling_process_pool.check_file_chunk([path])
+            finally:
+                spelling_process_pool.initialize_worker(False, None)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(sorted(set(line_num for _, line_num, _ in results[0][1])), [2])
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_changed_lines_since(self):
+        self.assertEqual(self.changed_lines_in_repository("a.py"), {"a.py": {2, 3}})
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_changed_lines_with_diff_prefix_settings(self):
+        path = os.path.join("b", "a.py")  # a top-level b/ directory isn't mistaken for a prefix
+        self.assertEqual(self.changed_lines_in_repository(path, ["diff.mnemonicPrefix", "true"]), {path: {2, 3}})
+        self.assertEqual(self.changed_lines_in_repository(path, ["diff.noprefix", "true"]), {path: {2, 3}})
+
+    def changed_lines_in_repository(self, path, setting=None):
+
+        """
+        Commits a file at path in a new repository (with a git config setting, if given), changes its
+        second line and adds a third, and returns changed_lines_since("HEAD") as run within it.
+        """
+
+        directory = tempfile.mkdtemp()
+        current_directory = os.getcwd()
+
+        def git(*arguments):
+            subprocess.check_output(["git"] + list(arguments), cwd=directory)
+
+        try:
+            git("init", "-q")
+            if setting:
+                git("config", *setting)
+
+            os.makedirs(os.path.dirname(os.path.join(directory, path)), exist_ok=True)
+            with open(os.path.join(directory, path), "w") as file:
+                file.write("# one\n# two\n")
+            git("add", path)
+            git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "base")
+
+            with open(os.path.join(directory, path), "w") as file:
+                file.write("# one\n# twoo\n# three\n")
+
+            os.chdir(directory)
+            return changed_lines_since("HEAD")
+        finally:
+            os.chdir(current_directory)
+            shutil.rmtree(directory)
+
+    def test_iter_changed_files(self):
+        path = os.path.abspath(__file__)
+        changed_lines = {path: {1}, path + ".missing": {1}, os.path.dirname(path) + "/TestUtils.py": set()}
+        self.assertEqual(list(iter_changed_files(changed_lines, {".py"})), [path])
+        self.assertEqual(list(iter_changed_files(changed_lines, {".md"})), [])
+
+if __name__ == '__main__':
+    unittest.main()
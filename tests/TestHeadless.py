@@ -0,0 +1,98 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+import config.config as config
+import spellchecker
+
+from contextlib import redirect_stderr, redirect_stdout
+
+
+class TestHeadlessMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.settings = (config.WORKER_COUNT, config.SCAN_INDEX_FILE)
+        self.current_directory = os.getcwd()
+
+    def tearDown(self):
+        os.chdir(self.current_directory)
+        config.WORKER_COUNT, config.SCAN_INDEX_FILE = self.settings
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def run_headless(self, *arguments):
+
+        """
+        Runs headless with arguments, returning the exit status and the JSON Lines written to stdout.
+        """
+
+        output = io.StringIO()
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):
+            try:
+                status = spellchecker.run_headless(spellchecker.parse_arguments(list(arguments)))
+            except SystemExit as error:  # invalid arguments
+                status = error.code
+
+        return status, output.getvalue().splitlines()
+
+    def test_exit_status(self):
+        self.write("clean.md", "the word\n")
+        self.assertEqual(self.run_headless(self.directory, "--engine", "thread"), (0, []))
+
+        self.write("typo.md", "hello wrld\n")
+        status, lines = self.run_headless(self.directory, "--engine", "thread")
+        self.assertEqual(status, 1)
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"word": "wrld"', lines[0])
+
+    def test_baseline(self):
+        self.write("typo.md", "hello wrld\n")
+        baseline = os.path.join(self.directory, "known.jsonl")
+
+        status, lines = self.run_headless(self.directory, "--engine", "thread")
+        with open(baseline, "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+        self.assertEqual(self.run_headless(self.directory, "--baseline", baseline), (0, []))
+
+        self.write("typo.md", "hello wrld\nthe wrod\n")
+        status, lines = self.run_headless(self.directory, "--baseline", baseline)
+        self.assertEqual(status, 1)
+        self.assertEqual([('"word": "wrod"' in line) for line in lines], [True])
+
+    def test_argument_validation(self):
+        self.assertEqual(self.run_headless(), (2, []))
+        self.assertEqual(self.run_headless(os.path.join(self.directory, "missing")), (2, []))
+        self.assertEqual(self.run_headless(self.directory, "--engine", "fibers"), (2, []))
+
+    @unittest.skipUnless(shutil.which("git"), "git is not installed")
+    def test_diff(self):
+        def git(*arguments):
+            subprocess.check_output(["git"] + list(arguments), cwd=self.directory)
+
+        git("init", "-q")
+        self.write("notes.md", "hello wrld\n")
+        git("add", "notes.md")
+        git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "base")
+        self.write("notes.md", "hello wrld\nthe wrod\n")
+        os.chdir(self.directory)
+
+        status, lines = self.run_headless("--diff", "HEAD", "--engine", "thread")
+        self.assertEqual(status, 1)
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"line": 2', lines[0])
+
+        self.assertEqual(self.run_headless("--diff", "HEAD", "deleted.md"), (0, []))  # paths limit the diff
+        self.assertEqual(self.run_headless("--diff", "no-such-revision")[0], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+
+import io
+import unittest
+
+from langs.registry import get_extractor, language_for_path
+
+
+def extract(path, source):
+    return list(get_extractor(language_for_path(path))(io.StringIO(source)))
+
+
+class TestLangsMethods(unittest.TestCase):
+
+    def test_language_for_path(self):
+        self.assertEqual(language_for_path("docs/index.markdown"), "markdown")
+        self.assertIsNone(language_for_path("notes.txt"))
+
+    def test_python(self):
+        source = u'def f(x):\n    """Doc\n    more"""\n    return "text"  # note\n'
+        self.assertEqual(extract("a.py", source),
+                         [(2, 4, '"""Doc'), (3, 0, '    more"""'), (4, 11, '"text"'), (4, 19, "# note")])
+
+    def test_markdown(self):
+        source = u"Prose `code`\n```\nskipped\n```\nend\n"
+        self.assertEqual(extract("a.md", source), [(1, 0, u"Prose       \n"), (5, 0, u"end\n")])
+
+    def test_urls(self):
+        self.assertEqual(extract("a.md", u"[a](http://x.io/y) <https://x.io> b\n")[0][2].split(), ["[a]", "b"])
+        self.assertEqual(extract("a.rst", u"`a <https://x.io/b>`_ c\n")[0][2].split(), ["`a", "c"])
+
+    def test_rst(self):
+        source = u"Intro::\n\n    skipped\n\n.. code-block:: python\n\n    skipped\n\nOutro\n"
+        self.assertEqual(extract("a.rst", source), [(1, 0, u"Intro::\n"), (9, 0, u"Outro\n")])
+
+    def test_ruby(self):
+        source = u"x = \"a #{b} c\" # note\n=begin\nblock\n=end\n"
+        self.assertEqual(extract("a.rb", source), [(1, 5, u"a      c"), (1, 16, u" note\n"), (3, 0, u"block\n")])
+
+    def test_plain_text(self):
+        self.assertEqual(extract("notes.txt", u"one\ntwo\n"), [(1, 0, u"one\n"), (2, 0, u"two\n")])
+
+if __name__ == '__main__':
+    unittest.main()
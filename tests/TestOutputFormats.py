@@ -0,0 +1,44 @@
+
+import io
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+from common.output_formats import artifact_uri, write_json_lines, write_sarif, read_baseline
+from spelling.spelling_error import SpellingError
+from spelling.spelling_error_group import SpellingErrorGroup
+
+
+class TestOutputFormatsMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.groups = [SpellingErrorGroup("tpyo", [SpellingError("a.md", "Tpyo", "Tpyo\n", 3, 0)])]
+
+    def test_json_lines_round_trip(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "baseline.jsonl")
+
+        try:
+            with io.open(path, "w") as stream:
+                write_json_lines(self.groups, stream)
+            self.assertEqual(read_baseline(path), {("a.md", "tpyo")})
+        finally:
+            shutil.rmtree(directory)
+
+    def test_sarif(self):
+        stream = io.StringIO()
+        write_sarif(self.groups, stream)
+        result = json.loads(stream.getvalue())["runs"][0]["results"][0]
+        self.assertEqual(result["locations"][0]["physicalLocation"]["region"], {"startLine": 3, "startColumn": 1})
+        self.assertEqual(result["locations"][0]["physicalLocation"]["artifactLocation"], {"uri": "a.md"})
+
+    def test_artifact_uri(self):
+        self.assertEqual(artifact_uri(os.path.join(".", "docs", "read me#1.md")), "docs/read%20me%231.md")
+        self.assertEqual(artifact_uri(os.path.abspath("a b.md")), pathlib.Path(os.path.abspath("a b.md")).as_uri())
+        self.assertTrue(artifact_uri(os.path.abspath("a b.md")).endswith("/a%20b.md"))
+
+if __name__ == '__main__':
+    unittest.main()
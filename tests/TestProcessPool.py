@@ -0,0 +1,66 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import config.config as config
+
+from contextlib import redirect_stdout
+from spelling import spelling_process_pool
+from spelling.spelling_process_pool import SpellingBatchWorker, check_file_chunk
+
+
+class TestProcessPoolMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.files = []
+
+        for name in ["first.md", "failing.md", "last.md"]:
+            self.files.append(os.path.join(self.directory, name))
+            with open(self.files[-1], "w") as f:
+                f.write("a wrod\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_failing_file_is_skipped(self):
+        read_file = SpellingBatchWorker.read_file
+
+        def failing_read(worker, readable_file, file_path):
+            if file_path == self.files[1]:
+                raise OSError("vanished")
+            read_file(worker, readable_file, file_path)
+
+        SpellingBatchWorker.read_file = failing_read
+        spelling_process_pool.initialize_worker(True, None)
+        try:
+            with redirect_stdout(io.StringIO()):
+                results = check_file_chunk(self.files)
+        finally:
+            SpellingBatchWorker.read_file = read_file
+            spelling_process_pool.initialize_worker(False, None)
+
+        self.assertEqual([file for file, _, _, _ in results], self.files)
+        self.assertEqual([counts["skipped_files"] for _, _, counts, _ in results], [0, 1, 0])
+        self.assertEqual([fingerprint is None for _, _, _, fingerprint in results], [False, True, False])
+        self.assertEqual([word for word, _, _ in results[2][1]], ["wrod"])
+    def test_strict_decoding_skips_file(self):
+        with open(self.files[1], "wb") as f:
+            f.write(b"a wrod\ncaf\xe9\n")
+
+        decode_errors = config.DECODE_ERRORS
+        config.DECODE_ERRORS = "strict"
+        try:
+            output = io.StringIO()
+            with redirect_stdout(output):
+                results = check_file_chunk(self.files)
+        finally:
+            config.DECODE_ERRORS = decode_errors
+
+        self.assertEqual(output.getvalue(), "")  # no traceback
+        self.assertEqual([counts["skipped_files"] for _, _, counts, _ in results], [0, 1, 0])
+
+if __name__ == '__main__':
+    unittest.main()
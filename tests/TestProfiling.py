@@ -0,0 +1,57 @@
+
+import unittest
+
+import common.utils as utils
+import config.config as config
+
+from collections import Counter
+from common.profiling import ScanProfile
+from spelling.spelling_worker import SpellingWorker
+
+
+class TestProfilingMethods(unittest.TestCase):
+
+    def test_slowest_files(self):
+        profile = ScanProfile(2)
+        for i, seconds in enumerate([0.5, 0.1, 0.9, 0.3]):
+            profile.add_file("file" + str(i), {"words": 1, "seconds_file": seconds, "seconds_check": seconds / 2})
+
+        self.assertEqual(sorted(profile.slowest_files, reverse=True), [(0.9, "file2"), (0.5, "file0")])
+        self.assertAlmostEqual(profile.stage_seconds["check"], 0.9)
+        self.assertAlmostEqual(profile.stage_seconds["file"], 1.8)
+
+    def test_report(self):
+        profile = ScanProfile()
+        profile.add_file("slow.py", {"seconds_file": 1.0, "seconds_tokenize": 0.25, "seconds_check": 0.5})
+        list(profile.timed_iter(["a.py", "b.py"], "discovery"))
+
+        report = profile.report(Counter({"words": 10, "cache_hits": 4, "compound_splits": 2}))
+        self.assertIn("read and extract    0.250 s", report)
+        self.assertIn("discovery", report)
+        self.assertIn("Words checked: 10 --- Cache hits: 4 --- Compound splits attempted: 2", report)
+        self.assertIn("1.000 s  slow.py", report)
+
+    def test_worker_stage_seconds(self):
+        profile_stages = config.PROFILE_STAGES
+        try:
+            config.PROFILE_STAGES = False
+            worker = SpellingWorker([], 0)
+            worker.read_line("some words", "file.py", 1)
+            self.assertEqual(sorted(worker.take_counts()), ["lines", "skipped_files", "words"])
+
+            config.PROFILE_STAGES = True
+            worker = SpellingWorker([], 0)
+            worker.read_line("some words", "file.py", 1)
+            counts = worker.take_counts()
+            self.assertEqual(counts["words"], 2)
+            self.assertIn("seconds_tokenize", counts)
+            self.assertIn("seconds_check", counts)
+            self.assertIn("compound_splits", counts)
+
+            utils.is_n_part_word("readfilename")
+            self.assertEqual(worker.take_counts()["compound_splits"], 1)
+        finally:
+            config.PROFILE_STAGES = profile_stages
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from common.review_session import ReviewSession, load_position, save_position
+from spelling.spelling_error import SpellingError
+from spelling.spelling_error_group import SpellingErrorGroup
+
+
+def make_groups(words):
+    return [SpellingErrorGroup(word, [SpellingError("a.py", word, "", 1)]) for word in words]
+
+
+class TestReviewSessionMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.words = ["wrod", "teh", "recieve", "adress", "seperate", "occured", "untill"]
+        self.session = ReviewSession(make_groups(self.words), 3)
+
+    def test_paging(self):
+        self.assertEqual(self.session.page_count, 3)
+        self.assertEqual([group.word for group in self.session.page_groups()], ["wrod", "teh", "recieve"])
+
+        self.assertTrue(self.session.next_page())
+        self.assertTrue(self.session.next_page())
+        self.assertEqual([group.word for group in self.session.page_groups()], ["untill"])
+        self.assertEqual(self.session.page_end, 7)
+        self.assertFalse(self.session.next_page())
+
+        self.session.previous_page()
+        self.assertEqual(self.session.page_start, 3)
+        self.session.go_to_page(-5)
+        self.assertEqual(self.session.page, 0)
+        self.session.previous_page()
+        self.assertEqual(self.session.page, 0)
+
+    def test_find(self):
+        self.assertEqual(self.session.find("Teh"), 1)
+        self.assertEqual(self.session.find("occ"), 5)
+        self.assertEqual(self.session.find("se"), 4)
+        self.assertIsNone(self.session.find("zz"))
+
+        self.session.jump_to(self.session.find("untill"))
+        self.assertEqual(self.session.page, 2)
+
+    def test_empty(self):
+        session = ReviewSession([], 15)
+        self.assertEqual(session.page_count, 1)
+        self.assertEqual(session.page_groups(), [])
+        self.assertFalse(session.next_page())
+        self.assertIsNone(session.find("a"))
+
+    def test_position(self):
+        self.session.next_page()
+        self.session.mark_investigated(1)
+        self.session.mark_investigated(4)
+        position = self.session.position()
+        self.assertEqual(position, {"word": "adress", "investigated": ["seperate", "teh"]})
+
+        # a later scan finds a different list
+        session = ReviewSession(make_groups(["new"] + self.words), 3)
+        self.assertTrue(session.restore(position))
+        self.assertEqual(session.page, 1)
+        self.assertTrue(session.is_investigated(2))
+        self.assertTrue(session.is_investigated(5))
+        self.assertFalse(session.is_investigated(1))
+
+        self.assertFalse(ReviewSession(make_groups(["other"]), 3).restore(position))
+
+    def test_saved_positions(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "review.json")
+            self.assertIsNone(load_position(path, directory))
+
+            save_position(path, directory, {"word": "teh", "investigated": []})
+            save_position(path, "elsewhere", {"word": "wrod", "investigated": []})
+            self.assertEqual(load_position(path, directory)["word"], "teh")
+
+            save_position(path, directory, None)
+            self.assertIsNone(load_position(path, directory))
+            self.assertEqual(load_position(path, "elsewhere")["word"], "wrod")
+
+            with open(path, "w") as f:
+                f.write("not json")
+            self.assertIsNone(load_position(path, directory))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
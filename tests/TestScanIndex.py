@@ -0,0 +1,77 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from collections import deque
+
+from common.scan_index import ScanIndex
+from common.text_reader import open_text_file
+from spelling.spelling_error import SpellingError
+
+
+class TestScanIndexMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.directory, "index.sqlite")
+        self.file_path = os.path.join(self.directory, "example.md")
+
+        with open(self.file_path, "w") as file:
+            file.write("a tpyo\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fingerprint(self):
+        with open_text_file(self.file_path) as text_file:
+            return text_file.fingerprint()
+
+    def test_reuses_unchanged_files(self):
+        reused_errors = deque()
+
+        index = ScanIndex(self.index_path, "en_US")
+        self.assertEqual(list(index.iter_changed_files([self.file_path], reused_errors)), [self.file_path])
+        index.store(self.file_path, [SpellingError(self.file_path, "tpyo", "a tpyo\n", 1)], self.fingerprint())
+        index.close()
+
+        index = ScanIndex(self.index_path, "en_US")
+        self.assertEqual(list(index.iter_changed_files([self.file_path], reused_errors)), [])
+        self.assertEqual([(e.word, e.line_number) for e in reused_errors], [("tpyo", 1)])
+        self.assertEqual(index.reused_file_count, 1)
+        index.close()
+
+    def test_rescans_modified_files(self):
+        index = ScanIndex(self.index_path, "en_US")
+        index.store(self.file_path, [], self.fingerprint())
+
+        with open(self.file_path, "w") as file:
+            file.write("a tpyo and more\n")
+
+        self.assertIsNone(index.lookup(self.file_path))
+        index.close()
+
+    def test_file_changed_after_reading(self):
+        fingerprint = self.fingerprint()  # taken when the file was read
+
+        with open(self.file_path, "w") as file:
+            file.write("a typo\n")  # same size
+        os.utime(self.file_path, ns=(fingerprint[0] + 10 ** 9, fingerprint[0] + 10 ** 9))
+
+        index = ScanIndex(self.index_path, "en_US")
+        index.store(self.file_path, [SpellingError(self.file_path, "tpyo", "a tpyo\n", 1)], fingerprint)
+        self.assertIsNone(index.lookup(self.file_path))
+        index.close()
+
+    def test_signature_change_empties_index(self):
+        index = ScanIndex(self.index_path, "en_US")
+        index.store(self.file_path, [], self.fingerprint())
+        index.close()
+
+        index = ScanIndex(self.index_path, "en_GB")
+        self.assertIsNone(index.lookup(self.file_path))
+        index.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+
+import unittest
+
+from common.scan_metrics import ScanMetrics
+
+
+class TestScanMetricsMethods(unittest.TestCase):
+
+    def test_add_file(self):
+        metrics = ScanMetrics()
+        metrics.discovered_file_count = 3
+        metrics.add_file(2, {"lines": 10, "words": 40, "cache_hits": 30, "cache_misses": 10})
+        metrics.add_file(0, {"lines": 5, "words": 20})
+
+        self.assertEqual(metrics.file_count, 2)
+        self.assertEqual(metrics.counts["lines"], 15)
+        self.assertEqual(metrics.counts["words"], 60)
+        self.assertEqual(metrics.cache_hit_rate(), 0.75)
+        self.assertTrue(metrics.status().startswith("Suspicious Words: 2 --- Files Read: 2 out of 3"))
+
+    def test_status_is_rate_limited(self):
+        metrics = ScanMetrics()
+        self.assertTrue(metrics.should_print_status())
+        self.assertFalse(metrics.should_print_status())
+
+if __name__ == '__main__':
+    unittest.main()
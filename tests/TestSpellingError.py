@@ -0,0 +1,45 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from spelling.spelling_error import SpellingError
+
+
+class TestSpellingErrorMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "example.md")
+
+        with open(self.file_path, "w") as file:
+            file.write("first line\nsecond tpyo line\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_line_is_read_lazily(self):
+        error = SpellingError(self.file_path, "tpyo", None, 2)
+        self.assertEqual(error.line, "second tpyo line\n")
+
+        error.line = "second typo line\n"
+        self.assertEqual(error.line, "second typo line\n")
+
+    def test_line_uses_configured_decoding(self):
+        with open(self.file_path, "wb") as file:
+            file.write(b"caf\xe9 au lait\nsecond tpyo line\n")
+
+        self.assertEqual(SpellingError(self.file_path, "tpyo", None, 2).line, "second tpyo line\n")
+        self.assertEqual(SpellingError(self.file_path, "caf", None, 1).line, u"caf\udce9 au lait\n")
+        self.assertEqual(SpellingError(self.file_path, "tpyo", None, 3).line, "")
+
+    def test_file_paths_are_interned(self):
+        first = SpellingError(self.file_path, "tpyo", None, 2)
+        second = SpellingError(self.file_path, "tpyo", None, 2)
+        self.assertIs(first.file, second.file)
+        self.assertEqual(first.file, self.file_path)
+        self.assertFalse(hasattr(first, "__dict__"))
+
+if __name__ == '__main__':
+    unittest.main()
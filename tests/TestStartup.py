@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import unittest
+import subprocess
+import importlib.util
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TIME_BUDGET_MS = 100  # cumulative time to import spellchecker, as reported by python -X importtime
+HEADLESS_RUN_BUDGET_MS = 100  # from importing spellchecker to the end of a headless run on one file
+
+# runs spellchecker headless with the config assignments in argv[1], reporting its duration on the last line
+HEADLESS_RUN = """
+import sys, json, time
+start_time = time.perf_counter()
+import config.config as config
+for name, value in json.loads(sys.argv[1]).items():
+    setattr(config, name, value)
+import spellchecker
+status = spellchecker.run_headless(spellchecker.parse_arguments(sys.argv[2:]))
+print(status, (time.perf_counter() - start_time) * 1000)
+"""
+
+# only imported once a run needs them (dictionary lookups, other engines, the scan index, profiling, --diff)
+DEFERRED_MODULES = ["enchant", "asyncio", "multiprocessing", "sqlite3", "cProfile", "pstats", "tracemalloc",
+                    "subprocess", "hashlib", "langs.python_lang"]
+
+
+def run_python(arguments):
+    return subprocess.run([sys.executable] + arguments, cwd=REPOSITORY, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True, check=True)
+
+
+class TestStartupMethods(unittest.TestCase):
+
+    def test_deferred_modules_are_not_imported(self):
+        output = run_python(["-c", "import sys, spellchecker; print(spellchecker.utils.dictionary); "
+                                   "print(' '.join(sorted(sys.modules)))"]).stdout
+        dictionary, modules = output.splitlines()
+
+        self.assertEqual(dictionary, "None")
+        self.assertEqual([module for module in DEFERRED_MODULES if module in modules.split()], [])
+
+    def test_import_time_budget(self):
+        import_times = []
+
+        for _ in range(3):  # the fastest run is the least disturbed by other processes
+            report = run_python(["-X", "importtime", "-c", "import spellchecker"]).stderr
+            for line in report.splitlines():
+                if line.endswith("| spellchecker"):
+                    import_times.append(int(line.split("|")[1]) / 1000.0)
+
+        self.assertLess(min(import_times), IMPORT_TIME_BUDGET_MS)
+
+
+class TestHeadlessStartupMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.word_path = os.path.join(self.directory, "words.txt")
+        self.file_path = os.path.join(self.directory, "one.py")
+
+        random_words = random.Random(0)
+        words = set(["hello", "world", "file", "name", "read"])
+        while len(words) < 50000:
+            length = random_words.randint(6, 12)  # too long to be a suggestion for the typo below
+            words.add("".join(random_words.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length)))
+
+        with open(self.word_path, "w") as f:
+            f.write("\n".join(sorted(words)) + "\n")
+        with open(self.file_path, "w") as f:
+            f.write("# hello wrld, readFileName\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def headless_run_time(self, settings):
+
+        """
+        Runs headless once to fill the cache directory, then returns the fastest of three more runs in ms.
+        """
+
+        settings = dict(settings, CACHE_DIRECTORY=os.path.join(self.directory, "cache"), SCAN_INDEX_FILE=None,
+                        ALLOWLIST_FILE=os.path.join(self.directory, "allowlist"))
+        run_times = []
+
+        for _ in range(4):
+            output = run_python(["-c", HEADLESS_RUN, json.dumps(settings), self.file_path]).stdout.splitlines()
+            self.assertIn('"word": "wrld"', output[0])
+            self.assertIn("world", output[0])  # suggested
+            run_times.append(float(output[-1].split()[1]))
+
+        return min(run_times[1:])
+
+    def test_snapshot_run_budget(self):
+        snapshot_path = os.path.join(self.directory, "words.snapshot")
+        run_python(["-m", "common.wordlist_snapshot", snapshot_path, "--words", self.word_path])
+
+        self.assertLess(self.headless_run_time({"WORDLIST_SNAPSHOT_FILE": snapshot_path}), HEADLESS_RUN_BUDGET_MS)
+
+    @unittest.skipUnless(importlib.util.find_spec("enchant"), "requires enchant")
+    def test_word_list_run_budget(self):
+        settings = {"WORDLIST_SNAPSHOT_FILE": None, "WORD_LIST_FILE": self.word_path}
+        self.assertLess(self.headless_run_time(settings), HEADLESS_RUN_BUDGET_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from common.suggestion_index import SuggestionIndex, SuggestionFile, edit_distance, load_suggestion_file, match_case
+from common.wordlist_snapshot import WordlistSnapshot, build_snapshot
+
+WORDS = ["receive", "recipe", "the", "then", "tea", "otherwise", "a", "Separate", "desperate"]
+
+
+class TestSuggestionIndexMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SuggestionIndex(WORDS, 2)
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("recieve", "receive", 2), 1)  # transposition
+        self.assertEqual(edit_distance("seperate", "separate", 2), 1)
+        self.assertEqual(edit_distance("kitten", "sitting", 3), 3)
+        self.assertEqual(edit_distance("kitten", "sitting", 1), 2)
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup("recieve"), ["receive", "recipe"])
+        self.assertEqual(self.index.lookup("otheriwse"), ["otherwise"])
+        self.assertEqual(self.index.lookup("seperate", 1), ["separate"])
+        self.assertEqual(self.index.lookup("xyzzy"), [])
+        self.assertEqual(self.index.lookup("the"), ["then", "tea"])  # the word itself is not suggested
+
+    def test_case(self):
+        self.assertEqual(self.index.lookup("Teh", 1), ["The"])
+        self.assertEqual(match_case("RECIEVE", "receive"), "RECEIVE")
+        self.assertEqual(match_case("recieve", "receive"), "receive")
+
+    def test_suggestion_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            snapshot_path = os.path.join(directory, "words.snapshot")
+            build_snapshot(snapshot_path, WORDS)
+            snapshot = WordlistSnapshot(snapshot_path)
+            cache_directory = os.path.join(directory, "cache")
+
+            index = load_suggestion_file(snapshot, cache_directory, 2)
+            self.assertIsInstance(index, SuggestionFile)
+            for word in ["recieve", "otheriwse", "seperate", "xyzzy", "the", "Teh", "zzzzzzzzzz"]:
+                self.assertEqual(index.lookup(word), self.index.lookup(word), word)
+
+            index_path = os.path.join(cache_directory, os.listdir(cache_directory)[0])
+            modified_time = os.stat(index_path).st_mtime_ns
+            load_suggestion_file(snapshot, cache_directory, 2).close()  # mapped, not rebuilt
+            self.assertEqual(os.stat(index_path).st_mtime_ns, modified_time)
+            self.assertEqual(len(os.listdir(cache_directory)), 1)
+
+            index.close()
+            snapshot.close()
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import config.config as config
+
+from common.text_reader import MappedTextFile, open_text_file, read_text
+
+
+class TestTextReaderMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_lines(self):
+        text_file = MappedTextFile(b"first line\n\nsecond\xc3\xa9\nlast")
+        self.assertEqual(list(text_file), ["first line\n", "\n", u"secondé\n", "last"])
+        self.assertEqual(text_file.readline(), "")
+
+    def test_undecodable_bytes(self):
+        path = self.write("latin.txt", b"caf\xe9 ol\xe9\nnext\n")
+        with open_text_file(path) as text_file:
+            lines = list(text_file)
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0].encode("utf-8", "surrogateescape"), b"caf\xe9 ol\xe9\n")
+
+    def test_skipped_files(self):
+        self.assertIsNone(open_text_file(self.write("binary.dat", b"\x89PNG\r\n\x00\x00text")))
+        self.assertEqual(read_text(self.write("empty.txt", b"")), "")
+
+        max_file_bytes = config.MAX_FILE_BYTES
+        config.MAX_FILE_BYTES = 10
+        try:
+            self.assertIsNone(read_text(self.write("large.txt", b"more than ten bytes")))
+        finally:
+            config.MAX_FILE_BYTES = max_file_bytes
+
+if __name__ == '__main__':
+    unittest.main()
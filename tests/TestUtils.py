@@ -1,7 +1,12 @@
 
 import unittest
+import importlib.util
 
 import common.utils as utils
+import config.config as config
+
+from common.allowlist import Allowlist
+from spelling.spelling_error import SpellingError
 
 # TODO - add more tests
 
@@ -11,32 +16,63 @@ class TestUtilsMethods(unittest.TestCase):
         self.assertEqual(utils.strip_string("^&#*#*#*#   foo   &#&#&#&#&#").strip(" "), "foo")
 
     def test_consolidate_spelling_errors(self):
-        pass
-
-    def test_spelling_group_list_from_hash(self):
-        pass
+        errors = (SpellingError("file.py", word, "line", 1) for word in ["Tpyo", "tpyo"] + ["often"] * 5)
+        groups = utils.consolidate_spelling_errors(errors)
+        self.assertEqual([(group.word, len(group.group)) for group in groups], [("tpyo", 2)])
 
     def test_split_line(self):
-        pass
+        self.assertEqual(utils.split_line("getHTTPResponse = snake_case2word - don't"),
+                         ["get", "HTTP", "Response", "snake", "case", "word", "don't"])
+        self.assertEqual(utils.split_line("  ''  "), [])
+
+    def test_tokenize_line(self):
+        self.assertEqual(list(utils.tokenize_line("# fooBar 'baz'")), [("foo", 2), ("Bar", 5), ("baz", 10)])
 
     def test_convert(self):
-        pass
+        self.assertEqual(utils.convert_camel_case_to_underscore("camelCaseHTTPServer"), "camel_Case_HTTP_Server")
 
     def test_update_file(self):
         pass
 
+    @unittest.skipUnless(importlib.util.find_spec("enchant"), "requires enchant")
+    def test_bloom_filter_needs_a_shortcut(self):
+        settings = (config.BLOOM_FILTER_ENABLED, config.BLOOM_FILTER_TRUST_POSITIVES, config.WORDLIST_SNAPSHOT_FILE)
+        config.BLOOM_FILTER_ENABLED, config.BLOOM_FILTER_TRUST_POSITIVES, config.WORDLIST_SNAPSHOT_FILE = \
+            True, False, None
+        try:
+            self.assertIsNone(utils.get_bloom_filter())  # enchant would be asked about every word anyway
+            self.assertIs(utils.bloom_filter, False)
+        finally:
+            config.BLOOM_FILTER_ENABLED, config.BLOOM_FILTER_TRUST_POSITIVES, config.WORDLIST_SNAPSHOT_FILE = settings
+            utils.bloom_filter = None
+
     def test_remove_non_utf8(self):
-        pass
+        line = b"caf\xe9 word".decode("utf-8", "surrogateescape")
+        self.assertEqual(utils.remove_non_utf8(line), "caf word")
+        self.assertEqual(utils.remove_non_utf8(u"caf\ufffd word"), "caf word")
 
     def test_is_two_part_word(self):
         self.assertTrue(utils.is_two_part_word("twopart"))
         self.assertTrue(utils.is_two_part_word("morewords"))
         self.assertFalse(utils.is_two_part_word("word"))
 
+    def test_is_n_part_word(self):
+        self.assertTrue(utils.is_n_part_word("morewords"))
+        self.assertFalse(utils.is_n_part_word("word"))
+
     def test_is_spelling_error(self):
         self.assertFalse(utils.is_spelling_error("word"))
         self.assertTrue(utils.is_spelling_error("wo23io234as;dfjd"))
 
+    def test_allowlist_is_consulted_first(self):
+        word_allowlist = Allowlist()
+        word_allowlist.add_rule("qwxzvk")
+        misses = utils.verdict_cache.misses
+
+        self.assertFalse(utils.is_spelling_error("Qwxzvk", word_allowlist))
+        self.assertEqual(utils.verdict_cache.misses, misses)  # neither the cache nor the dictionary was asked
+        self.assertTrue(utils.is_spelling_error("Qwxzvk"))
+
 if __name__ == '__main__':
     unittest.main()
 
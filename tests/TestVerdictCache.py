@@ -0,0 +1,34 @@
+
+import unittest
+
+from common.verdict_cache import VerdictCache
+
+
+class TestVerdictCacheMethods(unittest.TestCase):
+
+    def test_get_put(self):
+        cache = VerdictCache(10)
+        self.assertIsNone(cache.get("word"))
+        cache.put("word", False)
+        self.assertFalse(cache.get("word"))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hit_rate(), 0.5)
+
+    def test_lru_eviction(self):
+        cache = VerdictCache(2)
+        cache.put("one", True)
+        cache.put("two", True)
+        cache.get("one")  # "two" is now least recently used
+        cache.put("three", False)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("two"))
+        self.assertTrue(cache.get("one"))
+
+    def test_disabled(self):
+        cache = VerdictCache(0)
+        cache.put("word", True)
+        self.assertEqual(len(cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+
+import unittest
+
+from common.word_trie import WordTrie, DictionaryWordSource, is_compound_word
+
+
+class CountingDictionary:
+
+    def __init__(self, words):
+        self.words = set(words)
+        self.probes = 0
+
+    def check(self, word):
+        self.probes += 1
+        return word.lower() in self.words
+
+
+class TestWordTrieMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = WordTrie(["a", "l", "read", "file", "name", "filename", "word", "words", "more"])
+
+    def test_contains(self):
+        self.assertIn("File", self.trie)
+        self.assertNotIn("fil", self.trie)
+        self.assertEqual(len(self.trie), 9)
+
+    def test_word_ends(self):
+        self.assertEqual(list(self.trie.word_ends("filename", 0)), [4, 8])
+        self.assertEqual(list(self.trie.word_ends("wordsmore", 0)), [4, 5])
+
+    def test_is_compound_word(self):
+        self.assertTrue(is_compound_word("morewords", self.trie, 2))
+        self.assertTrue(is_compound_word("readFileName", self.trie, 3))
+        self.assertFalse(is_compound_word("readfilenamemorewords", self.trie, 3))
+        self.assertTrue(is_compound_word("readfilenamemorewords", self.trie, 4))
+        self.assertFalse(is_compound_word("word", self.trie, 3))
+
+    def test_single_letter_parts(self):
+        self.assertTrue(is_compound_word("aword", self.trie, 2))
+        self.assertFalse(is_compound_word("lword", self.trie, 2))
+
+    def test_dictionary_word_source(self):
+        dictionary = CountingDictionary(["a", "l", "read", "file", "name", "filename", "word", "words", "more"])
+        source = DictionaryWordSource(dictionary)
+
+        for word, max_parts in [("morewords", 2), ("readfilename", 3), ("readfilenamemorewords", 3),
+                                ("readfilenamemorewords", 4), ("word", 3), ("aword", 2), ("lword", 2),
+                                ("wordmorel", 3), ("readxfile", 3)]:
+            self.assertEqual(is_compound_word(word, source, max_parts), is_compound_word(word, self.trie, max_parts),
+                             word)
+
+    def test_dictionary_word_source_probes(self):
+        dictionary = CountingDictionary(["read", "file", "name"])
+        word = "qwertyuiopasdfghjklzxcvbnm"
+
+        self.assertFalse(is_compound_word(word, DictionaryWordSource(dictionary), 3))
+        self.assertLessEqual(dictionary.probes, len(word) - 1)
+
+        dictionary.probes = 0
+        self.assertTrue(is_compound_word("readfilename", DictionaryWordSource(dictionary), 3))
+        self.assertLessEqual(dictionary.probes, 2 * (len("readfilename") - 1))
+
+if __name__ == '__main__':
+    unittest.main()
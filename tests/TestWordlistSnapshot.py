@@ -0,0 +1,66 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from common.word_trie import is_compound_word
+from common.wordlist_snapshot import WordlistSnapshot, build_snapshot, load_word_file, read_allowlist_words
+
+
+class TestWordlistSnapshotMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "words.snapshot")
+        build_snapshot(self.path, ["read", "File", "file", "filename", "name", "a", "def", "naïve"])
+        self.snapshot = WordlistSnapshot(self.path)
+
+    def tearDown(self):
+        self.snapshot.close()
+        shutil.rmtree(self.directory)
+
+    def test_check(self):
+        self.assertEqual(len(self.snapshot), 7)
+        self.assertTrue(self.snapshot.check("FILE"))
+        self.assertTrue(self.snapshot.check(u"Naïve"))
+        self.assertFalse(self.snapshot.check("fil"))
+        self.assertFalse(self.snapshot.check("zzz"))
+
+    def test_word_ends(self):
+        self.assertEqual(list(self.snapshot.word_ends("filename", 0)), [4, 8])
+        self.assertTrue(is_compound_word("readfilename", self.snapshot, 3))
+
+    def test_tag_depends_on_words(self):
+        other_path = os.path.join(self.directory, "other.snapshot")
+        build_snapshot(other_path, ["other"])
+        other = WordlistSnapshot(other_path)
+        self.assertNotEqual(other.tag, self.snapshot.tag)
+        other.close()
+
+    def test_load_word_file(self):
+        word_path = os.path.join(self.directory, "words.txt")
+        cache_directory = os.path.join(self.directory, "cache")
+        with open(word_path, "w") as f:
+            f.write("read\nfile\n")
+
+        compiled = load_word_file(word_path, cache_directory)
+        self.assertTrue(compiled.check("File"))
+        self.assertEqual(load_word_file(word_path, cache_directory).tag, compiled.tag)
+        self.assertEqual(len(os.listdir(cache_directory)), 1)
+
+        with open(word_path, "w") as f:
+            f.write("read\nfile\nname\n")
+        self.assertTrue(load_word_file(word_path, cache_directory).check("name"))
+        compiled.close()
+
+    def test_read_allowlist_words(self):
+        allowlist_path = os.path.join(self.directory, "allowlist")
+        with open(allowlist_path, "w") as f:
+            f.write("# jargon\nKubectl\nre:[a-z]+_id\npath:vendor/\n")
+
+        self.assertEqual(read_allowlist_words(allowlist_path), {"kubectl"})
+
+
+if __name__ == '__main__':
+    unittest.main()